@@ -1,13 +1,16 @@
 """API client for fetching launch and satellite data"""
 import requests
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from functools import lru_cache
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from sgp4.api import jday
 from config.settings import Config
-from skyfield.api import load, EarthSatellite
-from skyfield.api import wgs84
+from utils.tle_cache import get_satrec
+from utils.frames import teme_to_geodetic
 
 logging.basicConfig(level=logging.WARNING)
 # Suppress urllib3 connection warnings
@@ -17,17 +20,47 @@ logging.getLogger('urllib3').setLevel(logging.ERROR)
 _satellite_cache = {'data': None, 'timestamp': None}
 CACHE_DURATION = timedelta(minutes=10)
 
+# World outlines from API.geo(), set only once a fetch returned features
+_geo_cache = None
+
+# One pooled session shared by every request (connection reuse across calls)
+_session = None
+_session_lock = threading.Lock()
+
+CELESTRAK_GP = "https://celestrak.org/NORAD/elements/gp.php"
+
+
+def parse_tle_text(text):
+    """Parse 3-line TLE text into {norad_id: (name, line1, line2)}"""
+    lines = [l.rstrip() for l in text.strip().splitlines() if l.strip()]
+    tles = {}
+    for i in range(len(lines) - 2):
+        name, l1, l2 = lines[i], lines[i + 1], lines[i + 2]
+        if l1.startswith('1 ') and l2.startswith('2 ') and not name.startswith(('1 ', '2 ')):
+            try:
+                tles[int(l1[2:7])] = (name.strip(), l1, l2)
+            except ValueError:
+                continue
+    return tles
+
 class API:
     """API client for external data sources"""
     
     @staticmethod
     def get_session():
-        """Create requests session with retry logic"""
-        s = requests.Session()
-        retry = Retry(total=2, backoff_factor=0.3)  # Reduced retries
-        s.mount("http://", HTTPAdapter(max_retries=retry))
-        s.mount("https://", HTTPAdapter(max_retries=retry))
-        return s
+        """Shared requests session with retry logic and a connection pool"""
+        global _session
+        if _session is None:
+            with _session_lock:
+                if _session is None:
+                    s = requests.Session()
+                    retry = Retry(total=2, backoff_factor=0.3)  # Reduced retries
+                    adapter = HTTPAdapter(max_retries=retry, pool_connections=4,
+                                          pool_maxsize=Config.TLE_FETCH_WORKERS)
+                    s.mount("http://", adapter)
+                    s.mount("https://", adapter)
+                    _session = s
+        return _session
     
     @classmethod
     def fetch(cls, upcoming=False):
@@ -39,51 +72,113 @@ class API:
             return []
     
     @classmethod
-    @lru_cache(maxsize=1)
     def geo(cls):
-        """Fetch and cache GeoJSON data"""
-        try:
-            return cls.get_session().get(Config.GEOJSON, timeout=3).json()
-        except:
-            return {'features': []}
+        """Fetch and cache GeoJSON data; failed or empty fetches are not cached, so they are retried"""
+        global _geo_cache
+        if _geo_cache is None:
+            try:
+                geo = cls.get_session().get(Config.GEOJSON, timeout=3).json()
+            except Exception as e:
+                logging.debug(f"GeoJSON fetch failed: {e}")
+                return {'features': []}
+            if not geo.get('features'):
+                return geo
+            _geo_cache = geo
+        return _geo_cache
     
     @classmethod
     def fetch_tle(cls, norad_id):
         """Fetch TLE data for a satellite from CelesTrak"""
         try:
-            url = f"https://celestrak.org/NORAD/elements/gp.php?CATNR={norad_id}&FORMAT=TLE"
-            response = cls.get_session().get(url, timeout=2)  # Shorter timeout
+            response = cls.get_session().get(
+                CELESTRAK_GP, params={'CATNR': norad_id, 'FORMAT': 'TLE'}, timeout=2)  # Shorter timeout
             if response.status_code == 200:
                 lines = response.text.strip().split('\n')
                 if len(lines) >= 3:
-                    return lines[0], lines[1], lines[2]
+                    return lines[0].strip(), lines[1].strip(), lines[2].strip()
         except Exception as e:
             logging.debug(f"TLE fetch failed for {norad_id}: {e}")
         return None
     
     @classmethod
-    def calculate_satellite_position(cls, name, sat_data):
+    def fetch_tle_group(cls, group):
+        """Fetch every TLE in a CelesTrak group (e.g. 'stations') in one request"""
+        try:
+            response = cls.get_session().get(
+                CELESTRAK_GP, params={'GROUP': group, 'FORMAT': 'TLE'}, timeout=5)
+            if response.status_code == 200:
+                return parse_tle_text(response.text)
+        except Exception as e:
+            logging.debug(f"TLE group fetch failed for {group}: {e}")
+        return {}
+    
+    @classmethod
+    def fetch_tles(cls, norad_ids, groups=None, max_fallback=None):
+        """
+        Fetch TLEs for many satellites concurrently.
+        
+        IDs with a known CelesTrak group are fetched through one query per
+        group (many TLEs per request); the rest use per-CATNR queries. All of
+        them run at once on a capped thread pool, so the batch costs roughly
+        one round-trip instead of one per satellite.
+        
+        Args:
+            norad_ids: NORAD catalog numbers to fetch
+            groups: Optional {norad_id: group} map; defaults to the 'group'
+                entries in Config.SATELLITES
+            max_fallback: Most per-CATNR queries for grouped IDs their group
+                did not return (default Config.TLE_FALLBACK_MAX; 0 disables)
+        
+        Returns:
+            Dict of {norad_id: (name, line1, line2)} for every ID found
+        """
+        wanted = set(int(n) for n in norad_ids)
+        if groups is None:
+            groups = {d['norad']: d['group'] for d in Config.SATELLITES.values() if d.get('group')}
+        grouped = {n for n in wanted if n in groups}
+        
+        with ThreadPoolExecutor(max_workers=Config.TLE_FETCH_WORKERS) as pool:
+            group_jobs = [pool.submit(cls.fetch_tle_group, g) for g in sorted({groups[n] for n in grouped})]
+            single_jobs = {n: pool.submit(cls.fetch_tle, n) for n in sorted(wanted - grouped)}
+            
+            found = {}
+            for job in group_jobs:
+                found.update({n: t for n, t in job.result().items() if n in wanted})
+            for n, job in single_jobs.items():
+                if job.result():
+                    found[n] = job.result()
+            
+            # Objects that have left their group fall back to single queries, up to a cap
+            # (a whole-catalog group refresh can miss thousands of decayed objects)
+            limit = Config.TLE_FALLBACK_MAX if max_fallback is None else max_fallback
+            missing = sorted(grouped - set(found))
+            if len(missing) > limit:
+                logging.debug(f"{len(missing)} TLEs missing from their groups; querying {limit} singly")
+                missing = missing[:limit]
+            for n, tle in zip(missing, pool.map(cls.fetch_tle, missing)):
+                if tle:
+                    found[n] = tle
+        return found
+    
+    @classmethod
+    def calculate_satellite_position(cls, name, sat_data, tle_data=None):
         """Calculate current satellite position using TLE data"""
         try:
-            # Try to fetch TLE
-            tle_data = cls.fetch_tle(sat_data['norad'])
+            # Fetch the TLE unless the caller already bulk-fetched it
+            if tle_data is None:
+                tle_data = cls.fetch_tle(sat_data['norad'])
             
             if tle_data:
-                # Use Skyfield to calculate position
-                ts = load.timescale()
-                satellite = EarthSatellite(tle_data[1], tle_data[2], tle_data[0], ts)
-                
-                # Get current time
-                t = ts.now()
-                
-                # Calculate position
-                geocentric = satellite.at(t)
-                subpoint = wgs84.subpoint(geocentric)
+                # Same SGP4 + WGS84 path as the globe/map position code
+                satellite = get_satrec(tle_data[1], tle_data[2])
+                now = datetime.now(timezone.utc)
+                jd, fr = jday(now.year, now.month, now.day, now.hour, now.minute,
+                              now.second + now.microsecond * 1e-6)
+                e, r, v = satellite.sgp4(jd, fr)
+                if e != 0:
+                    raise ValueError(f"SGP4 error code {e}")
                 
-                # Get latitude, longitude, altitude
-                lat = subpoint.latitude.degrees
-                lon = subpoint.longitude.degrees
-                alt = subpoint.elevation.km
+                lat, lon, alt = (float(c) for c in teme_to_geodetic(np.array(r), jd, fr))
                 
                 logging.debug(f"✓ Live position for {name}")  # Changed to debug
                 
@@ -111,8 +206,12 @@ class API:
         }
     
     @classmethod
-    def get_satellites(cls):
-        """Get satellite data with live positions (CACHED for 10 minutes)"""
+    def get_satellites(cls, store=None):
+        """
+        Get satellite data with live positions (CACHED for 10 minutes).
+        With a TLEStore, only objects not fetched within TLE_MAX_AGE_H are
+        refetched and everything else is read from disk.
+        """
         global _satellite_cache
         
         # Check if cache is valid
@@ -125,9 +224,16 @@ class API:
         
         # Cache expired or empty, fetch new data
         logging.debug("🔄 Fetching fresh satellite positions...")  # Changed to debug
+        norad_ids = [data['norad'] for data in Config.SATELLITES.values()]
+        if store is not None:
+            store.refresh(norad_ids, cls.fetch_tles, max_age_h=Config.TLE_MAX_AGE_H)
+            tles = store.get(norad_ids)
+        else:
+            tles = cls.fetch_tles(norad_ids)
         satellites = []
         for name, data in Config.SATELLITES.items():
-            sat_info = cls.calculate_satellite_position(name, data)
+            # False (not None) marks a TLE the bulk fetch could not find, so no refetch
+            sat_info = cls.calculate_satellite_position(name, data, tles.get(data['norad'], False))
             satellites.append(sat_info)
         
         live_count = sum(1 for s in satellites if s.get('live', False))
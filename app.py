@@ -2,6 +2,8 @@
 from dash import Dash
 from ui.layout import create_layout
 from data.database import DB
+from data.backfill import start_backfill
+from config.settings import Config
 from callbacks import register_callbacks
 
 external_scripts = [
@@ -14,13 +16,13 @@ server = app.server
 
 db = DB()
 
-# Load satellite df and compute orbits safely
-df = db.get_data()
-if df is not None and not df.empty:
-    orbit_col = next((c for c in df.columns if "orb" in c.lower() or "class" in c.lower()), None)
-    orbits = sorted(df[orbit_col].dropna().astype(str).unique().tolist()) if orbit_col else []
-else:
-    orbits = []
+# Optional full launch-history backfill; resumes from its checkpoint on every start
+if Config.BACKFILL_ON_START:
+    start_backfill(db)
+
+# Orbit classes come straight from the catalog's factorized label table
+catalog = db.get_catalog()
+orbits = sorted(catalog.orbits) if catalog is not None else []
 
 # Your DB class defines stats(), not get_stats()
 stats = db.stats() if hasattr(db, "stats") else {"total": 0, "upcoming": 0, "agencies": 0}
@@ -0,0 +1,35 @@
+// Exposes the globe.gl instance as window.globeInstance, so clientside
+// callbacks (the LOD camera reporter) can read its pointOfView(). The
+// renderer creates the globe through the global Globe factory; wrapping that
+// factory records every instance no matter where it is created.
+(function() {
+    var Original = window.Globe;
+    if (!Original || Original.__exposesInstance || typeof Proxy === "undefined") { return; }
+
+    function record(globe) {
+        if (globe && typeof globe.pointOfView === "function") { window.globeInstance = globe; }
+        return globe;
+    }
+
+    var Wrapped = new Proxy(Original, {
+        // new Globe(element, options)
+        construct: function(target, args, newTarget) {
+            return record(Reflect.construct(target, args));
+        },
+        // Globe(options)(element): the factory returns the component, which
+        // returns itself once attached to an element
+        apply: function(target, self, args) {
+            var component = Reflect.apply(target, self, args);
+            if (typeof component !== "function") { return record(component); }
+            return new Proxy(component, {
+                apply: function(comp, compSelf, compArgs) {
+                    return record(Reflect.apply(comp, compSelf, compArgs));
+                }
+            });
+        },
+        get: function(target, prop) {
+            return prop === "__exposesInstance" ? true : Reflect.get(target, prop);
+        }
+    });
+    window.Globe = Wrapped;
+})();
@@ -0,0 +1,184 @@
+"""Resumable, paginated launch-history backfill from the Launch Library API"""
+import argparse
+import logging
+import threading
+import time
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+from config.settings import Config
+from data.api_client import API
+
+
+class BackfillError(Exception):
+    """Raised when a page cannot be fetched after all retries"""
+
+
+def _init_state(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS backfill_state (
+        name TEXT PRIMARY KEY, next_url TEXT, pages INT, launches INT, done INT, updated REAL)""")
+    conn.commit()
+
+
+def load_checkpoint(conn, name='launches'):
+    """Saved cursor as a dict, or None if no backfill has started"""
+    _init_state(conn)
+    row = conn.execute("SELECT next_url, pages, launches, done FROM backfill_state WHERE name = ?",
+                       (name,)).fetchone()
+    if row is None:
+        return None
+    return {'next_url': row[0], 'pages': row[1], 'launches': row[2], 'done': bool(row[3])}
+
+
+def save_checkpoint(conn, next_url, pages, launches, name='launches'):
+    conn.execute("INSERT OR REPLACE INTO backfill_state VALUES (?, ?, ?, ?, ?, ?)",
+                 (name, next_url, pages, launches, 0 if next_url else 1, time.time()))
+    conn.commit()
+
+
+def newest_launch(conn):
+    """NET of the most recent stored past launch (ISO string), or None"""
+    row = conn.execute("SELECT MAX(date) FROM launches WHERE upcoming = 0 AND date GLOB '[0-9]*'").fetchone()
+    return row[0] if row else None
+
+
+def since_url(url, net):
+    """url with an LL2 net__gte filter, so a walk only covers launches from net on"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != 'net__gte'] + [('net__gte', net)]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def fetch_page(session, url, max_retries=None, sleep=time.sleep):
+    """
+    GET one page, backing off on 429/5xx and on 200s that are not JSON.
+    Honors Retry-After when present, otherwise waits
+    BACKFILL_BACKOFF_S * 2**attempt.
+    """
+    max_retries = Config.BACKFILL_MAX_RETRIES if max_retries is None else max_retries
+    for attempt in range(max_retries + 1):
+        try:
+            response = session.get(url, timeout=10)
+        except Exception as e:
+            status, wait = None, Config.BACKFILL_BACKOFF_S * 2 ** attempt
+            logging.debug(f"Backfill request failed ({e}), retrying in {wait:.0f}s")
+        else:
+            status = response.status_code
+            if status == 200:
+                try:
+                    return response.json()
+                except ValueError as e:
+                    # e.g. an HTML error page from a proxy in front of the API
+                    wait = Config.BACKFILL_BACKOFF_S * 2 ** attempt
+                    logging.warning(f"Backfill got a non-JSON page ({e}), retrying in {wait:.0f}s")
+            elif status != 429 and status < 500:
+                raise BackfillError(f"HTTP {status} for {url}")
+            else:
+                retry_after = response.headers.get('Retry-After', '')
+                wait = float(retry_after) if retry_after.isdigit() else Config.BACKFILL_BACKOFF_S * 2 ** attempt
+                logging.warning(f"Backfill throttled (HTTP {status}), retrying in {wait:.0f}s")
+        if attempt < max_retries:
+            sleep(wait)
+    raise BackfillError(f"Giving up on {url} after {max_retries + 1} attempts (last status {status})")
+
+
+def backfill(db, url=None, session=None, max_pages=None, restart=False, interval=None, sleep=time.sleep):
+    """
+    Walk the LL2 `next` cursor across the launch history, writing each page
+    through the batched ingestion path as it arrives. Progress is
+    checkpointed after every page, so an interrupted run resumes where it
+    stopped.
+
+    Args:
+        db: DB instance (pages are written through DB.insert)
+        url: First page URL; defaults to Config.BACKFILL_API
+        session: requests-like session; defaults to the shared API session
+        max_pages: Stop after this many pages in this run
+        restart: Ignore any saved checkpoint and start from url
+        interval: Seconds between pages; defaults to Config.BACKFILL_MIN_INTERVAL_S
+
+    Once a walk has finished, the next run starts a new one from the newest
+    stored launch (net__gte), so launches added since are picked up.
+
+    Returns:
+        Dict with pages, inserted, updated, rejected counts for this run
+        and done (True once the cursor is exhausted)
+    """
+    url = url or Config.BACKFILL_API
+    interval = Config.BACKFILL_MIN_INTERVAL_S if interval is None else interval
+    with db.pool.write() as conn:
+        _init_state(conn)
+        checkpoint = None if restart else load_checkpoint(conn)
+        newest = newest_launch(conn)
+    session = session or API.get_session()
+
+    if checkpoint and not checkpoint['done']:
+        next_url = checkpoint['next_url']
+    elif checkpoint and newest:
+        next_url = since_url(url, newest)  # Finished before: only catch up on newer launches
+    else:
+        next_url = url
+    total_pages = checkpoint['pages'] if checkpoint else 0
+    total_launches = checkpoint['launches'] if checkpoint else 0
+    run = {'pages': 0, 'inserted': 0, 'updated': 0, 'rejected': 0, 'done': False}
+
+    while next_url and (max_pages is None or run['pages'] < max_pages):
+        if run['pages'] and interval:
+            sleep(interval)
+
+        page = fetch_page(session, next_url, sleep=sleep)
+        counts = db.insert(page.get('results', []))
+        next_url = page.get('next')
+
+        run['pages'] += 1
+        for key in ('inserted', 'updated', 'rejected'):
+            run[key] += counts[key]
+        total_pages += 1
+        total_launches += counts['inserted'] + counts['updated']
+        with db.pool.write() as conn:
+            save_checkpoint(conn, next_url, total_pages, total_launches)
+        logging.debug(f"Backfill page {total_pages}: {counts}")
+
+    run['done'] = not next_url
+    return run
+
+
+def start_backfill(db, **kwargs):
+    """Run backfill(db, **kwargs) in a daemon thread (used by the app when BACKFILL_ON_START is set)"""
+    def run():
+        try:
+            result = backfill(db, **kwargs)
+            logging.info(f"Backfill finished this run: {result}")
+        except BackfillError as e:
+            logging.warning(f"Backfill stopped: {e} (resumes from the checkpoint next time)")
+
+    thread = threading.Thread(target=run, name="launch-backfill", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    """Command line: python -m data.backfill [--db launches.db] [--max-pages N] [--restart]"""
+    from data.database import DB
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db', default='launches.db', help="SQLite database to fill")
+    parser.add_argument('--url', default=None, help="First page URL (default: Config.BACKFILL_API)")
+    parser.add_argument('--max-pages', type=int, default=None, help="Stop after this many pages")
+    parser.add_argument('--restart', action='store_true', help="Ignore the saved checkpoint")
+    parser.add_argument('--interval', type=float, default=None,
+                        help="Seconds between pages (default: Config.BACKFILL_MIN_INTERVAL_S)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        result = backfill(DB(args.db), url=args.url, max_pages=args.max_pages, restart=args.restart,
+                          interval=args.interval)
+    except BackfillError as e:
+        logging.error(f"{e}; rerun to resume from the checkpoint")
+        return 1
+    print(f"pages={result['pages']} inserted={result['inserted']} updated={result['updated']} "
+          f"rejected={result['rejected']} done={result['done']}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,307 @@
+"""Columnar, typed satellite catalog built once from the satellite DataFrame or a binary export"""
+import copy
+import threading
+import numpy as np
+import pandas as pd
+from utils.propagation import BatchPropagator
+from data.tle_store import tle_norad
+
+NAME_COL = 'Name of Satellite, Alternate Names'
+
+
+def _find_col(df, *keys):
+    return next((c for c in df.columns if any(k in c.lower() for k in keys)), None)
+
+
+def _readonly(a):
+    a = np.asarray(a)
+    a.flags.writeable = False
+    return a
+
+
+class FixedWidthLines:
+    """
+    Read-only TLE line column over fixed-width ASCII bytes (e.g. a memmap
+    field of a binary export). Nothing is copied or decoded up front; rows
+    become str as they are read, so the column behaves like a str array.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __iter__(self):
+        for line in self.raw:
+            yield line.decode('ascii')
+
+    def __getitem__(self, idx):
+        lines = self.raw[idx]
+        if isinstance(lines, bytes):
+            return lines.decode('ascii')
+        return np.char.decode(lines, 'ascii').astype(object)
+
+    def astype(self, dtype):
+        return np.char.decode(self.raw, 'ascii').astype(dtype)
+
+
+def _lines(a):
+    """Read-only line column; fixed-width bytes stay undecoded behind FixedWidthLines"""
+    if isinstance(a, np.ndarray) and a.dtype.kind == 'S':
+        return FixedWidthLines(a)
+    return _readonly(a)
+
+
+def _postings(codes, n_labels):
+    """Inverted index: for each label code, the sorted row indices carrying it"""
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(n_labels + 1))
+    return tuple(_readonly(order[bounds[c]:bounds[c + 1]]) for c in range(n_labels))
+
+
+def _norad_id(line1, fallback):
+    """NORAD number from TLE line 1 as an ID string, fallback when the line is malformed"""
+    try:
+        return str(tle_norad(line1))
+    except (TypeError, ValueError):
+        return fallback
+
+
+def _union(postings, codes):
+    if len(codes) == 1:
+        return postings[codes[0]]
+    return np.sort(np.concatenate([postings[c] for c in codes]))
+
+
+class SatelliteCatalog:
+    """
+    Read-only column arrays for the satellite catalog.
+
+    Owner, purpose and orbit class are factorized once into integer codes
+    plus a label table; TLEs are parsed once into a BatchPropagator. Callers
+    select rows as index arrays and read only the columns they need,
+    instead of copying and re-filtering the whole DataFrame per request.
+
+    Build it with from_dataframe(), or load a memory-mapped binary export
+    with data.catalog_store.load_catalog().
+    """
+
+    def __init__(self, names, ids, owner, orbit, purpose, line1=None, line2=None, columns=None, df=None,
+                 norads=None):
+        """
+        Args:
+            names, ids: per-row string arrays
+            owner, orbit, purpose: (codes, labels) pairs; code -1 is missing
+            line1, line2: TLE line arrays (str, or fixed-width bytes decoded on
+                access), or None when the catalog has no TLEs
+            columns: source column names {'name', 'owner', 'orbit', 'purpose'}
+            df: the source DataFrame, if there is one (rebuilt on demand otherwise)
+            norads: NORAD number per row (-1 unknown), if already parsed
+        """
+        columns = columns or {}
+        self.name_col = columns.get('name')
+        self.owner_col = columns.get('owner')
+        self.orbit_col = columns.get('orbit')
+        self.purpose_col = columns.get('purpose')
+        self._df = df
+
+        self.names = _readonly(names)
+        self.ids = _readonly(ids)
+        n = len(self.names)
+
+        self.owner_codes, self.owners = _readonly(owner[0]), tuple(owner[1])
+        self.orbit_codes, self.orbits = _readonly(orbit[0]), tuple(orbit[1])
+        self.purpose_codes, self.purposes = _readonly(purpose[0]), tuple(purpose[1])
+        self.owner_index = _postings(self.owner_codes, len(self.owners))
+        self.orbit_index = _postings(self.orbit_codes, len(self.orbits))
+        self.purpose_index = _postings(self.purpose_codes, len(self.purposes))
+        self._all = _readonly(np.arange(n))
+        self._match_cache = {}
+
+        self.line1 = None if line1 is None else _lines(line1)
+        self.line2 = None if line2 is None else _lines(line2)
+        self._propagator = None
+        self._propagator_lock = threading.Lock()
+        self._norads = None if norads is None else _readonly(np.asarray(norads, dtype=np.int64))
+        self.records = None  # RECORD_DTYPE element records when loaded from a binary export
+
+    @classmethod
+    def from_dataframe(cls, df):
+        name_col = NAME_COL if NAME_COL in df.columns else _find_col(df, 'name')
+        columns = {
+            'name': name_col,
+            'owner': _find_col(df, 'own', 'oper'),
+            'orbit': _find_col(df, 'orb', 'class'),
+            'purpose': _find_col(df, 'purp'),
+        }
+
+        n = len(df)
+        names = (df[name_col].fillna('Unknown').astype(str).to_numpy()
+                 if name_col else np.full(n, 'Unknown', dtype=object))
+        has_tle = 'TLE_LINE1' in df.columns and 'TLE_LINE2' in df.columns
+        if 'NORAD_CAT_ID' in df.columns:
+            ids = df['NORAD_CAT_ID'].astype(str).to_numpy()
+        elif has_tle:
+            # Names repeat across a large catalog; the NORAD number in line 1 does not
+            ids = np.array([_norad_id(l1, name) for l1, name in zip(df['TLE_LINE1'].astype(str), names)],
+                           dtype=object)
+        else:
+            ids = names if name_col else np.arange(n).astype(str)
+
+        def factorize(col):
+            """Integer codes (-1 for missing) and the label table for a column"""
+            if col is None:
+                return np.full(n, -1, dtype=np.int32), ()
+            codes, labels = pd.factorize(df[col])
+            return codes.astype(np.int32), tuple(str(l) for l in labels)
+
+        return cls(names, ids, factorize(columns['owner']), factorize(columns['orbit']),
+                   factorize(columns['purpose']),
+                   line1=df['TLE_LINE1'].astype(str).to_numpy() if has_tle else None,
+                   line2=df['TLE_LINE2'].astype(str).to_numpy() if has_tle else None,
+                   columns=columns, df=df)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def propagator(self):
+        """BatchPropagator over every row, parsed on first use"""
+        if self._propagator is None and self.line1 is not None:
+            with self._propagator_lock:
+                if self._propagator is None:
+                    self._propagator = BatchPropagator(self.line1, self.line2, ids=self.ids.tolist())
+        return self._propagator
+
+    @property
+    def norads(self):
+        """NORAD catalog number per row from TLE line 1 (-1 where unknown)"""
+        if self._norads is None:
+            norads = np.full(len(self), -1, dtype=np.int64)
+            for i, line1 in enumerate(self.line1 if self.line1 is not None else ()):
+                try:
+                    norads[i] = tle_norad(line1)
+                except (TypeError, ValueError):
+                    continue
+            self._norads = _readonly(norads)
+        return self._norads
+
+    def with_tles(self, tles):
+        """
+        Catalog whose TLE lines are replaced by tles {norad: (name, line1,
+        line2)} where those differ; every other column is shared. Returns
+        self when nothing changes.
+        """
+        if not self.has_tles or not tles:
+            return self
+        changed = {}
+        for i, norad in enumerate(self.norads.tolist()):
+            tle = tles.get(norad)
+            if tle is not None and tle[1] != self.line1[i]:
+                changed[i] = tle
+        if not changed:
+            return self
+
+        line1, line2 = self.line1.astype(object), self.line2.astype(object)
+        for i, tle in changed.items():
+            line1[i], line2[i] = tle[1], tle[2]
+        catalog = copy.copy(self)
+        catalog.line1, catalog.line2 = _readonly(line1), _readonly(line2)
+        catalog._propagator = None
+        catalog._propagator_lock = threading.Lock()
+        catalog._df = None  # Rebuilt from the columns with the new lines
+        catalog.records = None  # Element records describe the exported lines
+        return catalog
+
+    @property
+    def df(self):
+        """The catalog as a DataFrame (rebuilt from the columns for binary-loaded catalogs)"""
+        if self._df is None:
+            data = {}
+            if self.name_col:
+                data[self.name_col] = self.names
+            for field in ('owner', 'orbit', 'purpose'):
+                col = getattr(self, f'{field}_col')
+                if col:
+                    codes = getattr(self, f'{field}_codes')
+                    labels = np.array(getattr(self, f'{field}s') + (None,), dtype=object)
+                    data[col] = labels[codes]  # code -1 picks the trailing None
+            if self.line1 is not None:
+                data['TLE_LINE1'] = self.line1.astype(object)
+                data['TLE_LINE2'] = self.line2.astype(object)
+            self._df = pd.DataFrame(data)
+        return self._df
+
+    @property
+    def has_tles(self):
+        return self.line1 is not None
+
+    def label(self, field, idx):
+        """Labels of a categorical field ('owner', 'orbit', 'purpose') for the given rows"""
+        codes = getattr(self, f'{field}_codes')[idx]
+        table = np.array(getattr(self, f'{field}s') + ('Unknown',), dtype=object)
+        return table[np.where(codes < 0, len(table) - 1, codes)]
+
+    def _codes_matching(self, field, kind, key, predicate):
+        """Label codes satisfying predicate, memoized per (field, kind, key)"""
+        cache_key = (field, kind, key)
+        codes = self._match_cache.get(cache_key)
+        if codes is None:
+            if len(self._match_cache) > 1024:
+                self._match_cache.clear()
+            labels = getattr(self, f'{field}s')
+            codes = [i for i, label in enumerate(labels) if predicate(label)]
+            self._match_cache[cache_key] = codes
+        return codes
+
+    def select(self, agency=None, orbit=None, types=None, fuzzy_types=False):
+        """
+        Row indices matching the globe filters (same semantics as the old
+        DataFrame filters): agency is a case-insensitive substring of the
+        owner, orbit an exact class, types a list of exact purposes (or of
+        case-insensitive substrings with fuzzy_types=True).
+
+        Each filter resolves to a union of posting lists from the inverted
+        indexes and the filters are intersected, so no column is scanned.
+        """
+        postings = []
+        if agency and agency != 'All' and self.owner_col:
+            needle = agency.lower()
+            codes = self._codes_matching('owner', 'contains', needle, lambda l: needle in l.lower())
+            postings.append(('owner', codes))
+        if orbit and orbit != 'All' and self.orbit_col:
+            codes = self._codes_matching('orbit', 'exact', orbit, lambda l: l == orbit)
+            postings.append(('orbit', codes))
+        if types and self.purpose_col:
+            wanted = frozenset([types] if isinstance(types, str) else types)
+            if fuzzy_types:
+                needles = [t.lower() for t in wanted]
+                codes = self._codes_matching('purpose', 'contains', frozenset(needles),
+                                             lambda l: any(t in l.lower() for t in needles))
+            else:
+                codes = self._codes_matching('purpose', 'exact', wanted, lambda l: l in wanted)
+            postings.append(('purpose', codes))
+
+        if not postings:
+            return self._all
+        if any(not codes for _, codes in postings):
+            return np.array([], dtype=np.intp)
+
+        # Start from the smallest candidate set, then keep only rows whose
+        # code is in each remaining filter (a label lookup table per filter)
+        def size(f):
+            index = getattr(self, f'{f[0]}_index')
+            return sum(len(index[c]) for c in f[1])
+        postings.sort(key=size)
+        field, codes = postings[0]
+        idx = _union(getattr(self, f'{field}_index'), codes)
+        for field, codes in postings[1:]:
+            hit = np.zeros(len(getattr(self, f'{field}s')) + 1, dtype=bool)  # last slot: missing (-1)
+            hit[codes] = True
+            idx = idx[hit[getattr(self, f'{field}_codes')[idx]]]
+        return idx
+
+    def view(self, idx):
+        """DataFrame rows for an index array (pandas takes only those rows)"""
+        return self.df.iloc[idx]
@@ -0,0 +1,178 @@
+"""Compact binary satellite catalog: fixed-width records plus a string table, loaded with np.memmap"""
+import json
+import logging
+import os
+import struct
+import numpy as np
+from data.catalog import SatelliteCatalog
+from data.tle_store import tle_epoch
+
+MAGIC = b'SATCAT\x00\x02'  # Bumped when exports must be rebuilt (v2: NORAD-based IDs)
+ALIGN = 64
+
+# One fixed-width record per satellite. Elements are the TLE mean elements
+# (degrees, rev/day); epoch is unix seconds UTC; -1 marks a missing code/ID.
+RECORD_DTYPE = np.dtype([
+    ('norad', '<i4'),
+    ('owner', '<i4'),
+    ('orbit', '<i4'),
+    ('purpose', '<i4'),
+    ('epoch', '<f8'),
+    ('inclination', '<f8'),
+    ('raan', '<f8'),
+    ('eccentricity', '<f8'),
+    ('arg_perigee', '<f8'),
+    ('mean_anomaly', '<f8'),
+    ('mean_motion', '<f8'),
+    ('bstar', '<f8'),
+    ('line1', 'S69'),
+    ('line2', 'S69'),
+])
+
+
+def _align(n):
+    return -(-n // ALIGN) * ALIGN
+
+
+def _tle_exp(field):
+    """TLE 'assumed decimal point' exponent field, e.g. ' 12345-3' -> 0.12345e-3"""
+    field = field.strip()
+    if not field:
+        return 0.0
+    sign = -1.0 if field[0] == '-' else 1.0
+    field = field.lstrip('+-')
+    return sign * float(f"0.{field[:-2]}e{field[-2:]}")
+
+
+def _elements(line1, line2):
+    """(norad, epoch, incl, raan, ecc, argp, M, n, bstar) parsed from a TLE; NaNs if malformed"""
+    try:
+        return (int(line1[2:7]), tle_epoch(line1),
+                float(line2[8:16]), float(line2[17:25]), float('0.' + line2[26:33].strip()),
+                float(line2[34:42]), float(line2[43:51]), float(line2[52:63]), _tle_exp(line1[53:61]))
+    except (ValueError, IndexError):
+        return (-1,) + (np.nan,) * 8
+
+
+def _source_stamp(source):
+    if not source or not os.path.exists(source):
+        return None
+    st = os.stat(source)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _string_blob(values):
+    return '\x00'.join(str(v).replace('\x00', '') for v in values).encode('utf-8')
+
+
+def export_catalog(catalog, path, source=None):
+    """
+    Write a SatelliteCatalog to path (atomically, via a temp file).
+
+    Layout: magic, uint64 header length, JSON header, then 64-byte aligned
+    sections for the record array and the NUL-separated name/ID strings.
+    source (e.g. the CSV the catalog came from) is stamped into the header
+    so load_catalog() can tell when the export is stale.
+    """
+    n = len(catalog)
+    records = np.zeros(n, dtype=RECORD_DTYPE)
+    records['owner'] = catalog.owner_codes
+    records['orbit'] = catalog.orbit_codes
+    records['purpose'] = catalog.purpose_codes
+    if catalog.has_tles:
+        elements = np.array([_elements(l1, l2) for l1, l2 in zip(catalog.line1, catalog.line2)],
+                            dtype=np.float64).reshape(n, 9)
+        records['norad'] = elements[:, 0]
+        for i, field in enumerate(RECORD_DTYPE.names[4:12], start=1):
+            records[field] = elements[:, i]
+        records['line1'] = np.char.encode(catalog.line1.astype(str), 'ascii', 'replace')
+        records['line2'] = np.char.encode(catalog.line2.astype(str), 'ascii', 'replace')
+    else:
+        records['norad'] = -1
+
+    sections = [('records', records.tobytes()),
+                ('names', _string_blob(catalog.names)),
+                ('ids', _string_blob(catalog.ids))]
+    layout, offset = {}, 0
+    for name, blob in sections:
+        layout[name] = [offset, len(blob)]
+        offset = _align(offset + len(blob))
+
+    header = json.dumps({
+        'count': n,
+        'dtype': RECORD_DTYPE.descr,
+        'sections': layout,
+        'labels': {'owner': list(catalog.owners), 'orbit': list(catalog.orbits),
+                   'purpose': list(catalog.purposes)},
+        'columns': {'name': catalog.name_col, 'owner': catalog.owner_col,
+                    'orbit': catalog.orbit_col, 'purpose': catalog.purpose_col},
+        'has_tles': catalog.has_tles,
+        'source': _source_stamp(source),
+    }).encode('utf-8')
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC + struct.pack('<Q', len(header)) + header)
+        for name, blob in sections:
+            f.seek(data_start + layout[name][0])
+            f.write(blob)
+    os.replace(tmp, path)
+    return path
+
+
+def _read_header(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a satellite catalog export")
+        (length,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(length))
+    return header, _align(len(MAGIC) + 8 + length)
+
+
+def load_catalog(path, source=None):
+    """
+    Map an export back into a SatelliteCatalog. The record array stays a
+    read-only np.memmap, so worker processes share the page cache and
+    nothing is parsed until used: TLE lines stay fixed-width views of the
+    map, decoded as they are read (at the latest on first propagation).
+
+    Returns None when the file is missing, unreadable, or out of date with
+    source (a missing source keeps the export usable on its own).
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        header, data_start = _read_header(path)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring catalog export {path}: {e}")
+        return None
+    if source and os.path.exists(source) and header['source'] != _source_stamp(source):
+        return None
+
+    n = header['count']
+    offset, _ = header['sections']['records']
+    records = (np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=data_start + offset, shape=(n,))
+               if n else np.zeros(0, dtype=RECORD_DTYPE))
+
+    def strings(section):
+        offset, size = header['sections'][section]
+        if not n:
+            return np.array([], dtype=object)
+        blob = np.memmap(path, dtype=np.uint8, mode='r', offset=data_start + offset, shape=(size,))
+        return np.array(bytes(blob).decode('utf-8').split('\x00'), dtype=object)
+
+    labels = header['labels']
+    has_tles = header['has_tles']
+    catalog = SatelliteCatalog(
+        strings('names'), strings('ids'),
+        (records['owner'], labels['owner']),
+        (records['orbit'], labels['orbit']),
+        (records['purpose'], labels['purpose']),
+        line1=records['line1'] if has_tles else None,
+        line2=records['line2'] if has_tles else None,
+        columns=header['columns'],
+        norads=records['norad'] if has_tles else None,
+    )
+    catalog.records = records
+    return catalog
@@ -1,33 +1,36 @@
-from dash import Input, Output, clientside_callback
-from datetime import datetime, timedelta
+from dash import Input, Output, State, clientside_callback
+import numpy as np
 
-from visualization.deck_map import get_current_position
+from config.settings import Config
+from utils.position_service import get_position_service
+from utils.timeline import interpolate_timeline
+from utils.response_cache import get_response_cache, normalize_filters
+from utils.lod import normalize_camera, select_visible, track_stride
+from utils.globe_protocol import VARINT_ALPHABET, build_manifest, manifest_key, get_delta_encoder
+from utils.pass_predictor import get_pass_predictor
+from ui.telemetry_panel import create_pass_rows
 
-_position_cache = {}
-_cache_time = None
-_cache_duration = timedelta(seconds=60)
 
+def _viz_alt(alt_km):
+    """Globe altitude (fraction of Earth radius) from altitude in km"""
+    return np.clip((np.asarray(alt_km, dtype=float) / 40000.0) * 2.0, 0.02, 0.5)
 
-def get_cached_positions(df):
-    global _position_cache, _cache_time
 
-    now = datetime.now()
-    if _cache_time is None or (now - _cache_time) > _cache_duration:
-        _position_cache = {}
+def _purpose_color(sat_type):
+    if "Space Station" in sat_type:
+        return "#ffcc00"
+    if "Telescope" in sat_type:
+        return "#ff2a6d"
+    if "Communication" in sat_type:
+        return "#00ff88"
+    if "Navigation" in sat_type:
+        return "#8800ff"
+    return "#00f3ff"
 
-        for _, row in df.iterrows():
-            if "TLE_LINE1" in row and "TLE_LINE2" in row:
-                sat_id = str(row.get("NORAD_CAT_ID", row.get("Name of Satellite, Alternate Names", "")))
-                try:
-                    lat, lon, alt_km = get_current_position(row["TLE_LINE1"], row["TLE_LINE2"])
-                    if lat is not None and lon is not None and alt_km is not None:
-                        _position_cache[sat_id] = {"lat": lat, "lon": lon, "alt_km": alt_km}
-                except Exception:
-                    continue
 
-        _cache_time = now
-
-    return _position_cache
+def _purpose_colors(catalog):
+    """Color per purpose code; the trailing entry covers missing purposes (code -1)"""
+    return np.array([_purpose_color(p) for p in catalog.purposes] + ["#00f3ff"], dtype=object)
 
 
 def register(app, db):
@@ -36,241 +39,289 @@ def register(app, db):
         return
     app._satellite_store_registered = True
 
+    position_service = get_position_service(db)
+    position_service.start()
+
+    def selection(selected_types, selected_agency, selected_orbit):
+        """Catalog rows of the current filter selection (manifest order)"""
+        catalog = db.get_catalog()
+        if catalog is None or not catalog.has_tles:
+            return catalog, None
+        idx = catalog.select(selected_agency, selected_orbit, selected_types)
+        if Config.GLOBE_MAX_SATELLITES:
+            idx = idx[:Config.GLOBE_MAX_SATELLITES]
+        return catalog, idx
+
     @app.callback(
-        Output("satellite-store", "data"),
-        Input("refresh", "n_clicks"),
+        Output("globe-manifest", "data"),
         Input("satellite-types", "value"),
         Input("agency", "value"),
         Input("orbit", "value"),
     )
-    def update_satellite_positions(n_clicks, selected_types, selected_agency, selected_orbit):
-        df = db.get_data()
-        if df is None or df.empty or "TLE_LINE1" not in df.columns or "TLE_LINE2" not in df.columns:
-            return []
-
-        filtered_df = df.copy()
-
-        owner_col = next((c for c in filtered_df.columns if ("own" in c.lower() or "oper" in c.lower())), None)
-        if selected_agency and selected_agency != "All" and owner_col:
-            filtered_df = filtered_df[
-                filtered_df[owner_col].astype(str).str.contains(selected_agency, case=False, na=False)
-            ]
-
-        orbit_col = next((c for c in filtered_df.columns if ("orb" in c.lower() or "class" in c.lower())), None)
-        if selected_orbit and selected_orbit != "All" and orbit_col:
-            filtered_df = filtered_df[filtered_df[orbit_col] == selected_orbit]
-
-        type_col = next((c for c in filtered_df.columns if ("purp" in c.lower() or "purpose" in c.lower())), None)
-        if selected_types and type_col:
-            if isinstance(selected_types, str):
-                selected_types = [selected_types]
-            filtered_df = filtered_df[filtered_df[type_col].isin(selected_types)]
-
-        MAX_SATELLITES = 300
-        if len(filtered_df) > MAX_SATELLITES:
-            filtered_df = filtered_df.head(MAX_SATELLITES)
-
-        position_cache = get_cached_positions(df)
+    def update_manifest(selected_types, selected_agency, selected_orbit):
+        # Static per-satellite fields, sent once per selection instead of with every update
+        filters = normalize_filters(selected_types, selected_agency, selected_orbit)
+        return get_response_cache().get_or_compute(
+            "update_manifest", filters, lambda: manifest_payload(filters, selected_types, selected_agency, selected_orbit))
+
+    def manifest_payload(filters, selected_types, selected_agency, selected_orbit):
+        catalog, idx = selection(selected_types, selected_agency, selected_orbit)
+        if idx is None:
+            return None
+        ids = catalog.ids[idx]
+        return build_manifest(
+            manifest_key(filters, ids), ids, catalog.names[idx], catalog.label("owner", idx),
+            catalog.label("purpose", idx), _purpose_colors(catalog)[catalog.purpose_codes[idx]],
+            columnar=Config.GLOBE_TRANSPORT == "columnar")
 
-        satellites = []
-        for _, row in filtered_df.iterrows():
-            sat_id = str(row.get("NORAD_CAT_ID", row.get("Name of Satellite, Alternate Names", "")))
-
-            if sat_id in position_cache:
-                lat = position_cache[sat_id]["lat"]
-                lon = position_cache[sat_id]["lon"]
-                alt_km = position_cache[sat_id]["alt_km"]
-            else:
-                try:
-                    lat, lon, alt_km = get_current_position(row["TLE_LINE1"], row["TLE_LINE2"])
-                except Exception:
-                    continue
-
-            if lat is None or lon is None or alt_km is None:
-                continue
-
-            viz_alt = max(0.02, min((float(alt_km) / 40000.0) * 2.0, 0.5))
-
-            sat_type = row.get(type_col, row.get("Purpose", "Unknown")) if type_col else row.get("Purpose", "Unknown")
-            owner_val = row.get(owner_col, row.get("Owner", "Unknown")) if owner_col else row.get("Owner", "Unknown")
+    @app.callback(
+        Output("chat-store", "data"),
+        Input("refresh", "n_clicks"),
+        Input("satellite-types", "value"),
+        Input("agency", "value"),
+        Input("orbit", "value"),
+        Input("timeline-refresh", "n_intervals"),
+        Input("globe-camera", "data"),
+        State("globe-sync", "data"),
+    )
+    def update_satellite_positions(n_clicks, selected_types, selected_agency, selected_orbit, n_refresh, camera, synced):
+        snapshot = position_service.snapshot()
+        filters = normalize_filters(selected_types, selected_agency, selected_orbit)
+        camera = normalize_camera(camera) if Config.LOD_ENABLED else None
+        # Same filters, camera and snapshot share one frame; only the delta
+        # against what this client last applied is encoded per request
+        frame = get_response_cache().get_or_compute(
+            "update_satellite_positions", filters + (camera, snapshot.computed_at),
+            lambda: satellite_frame(filters, snapshot, camera, selected_types, selected_agency, selected_orbit))
+        if frame is None:
+            return None
+        return get_delta_encoder().encode(**frame, since=synced, transport=Config.GLOBE_TRANSPORT,
+                                          dtype=Config.GLOBE_COLUMNAR_DTYPE)
+
+    def satellite_frame(filters, snapshot, camera, selected_types, selected_agency, selected_orbit):
+        catalog, idx = selection(selected_types, selected_agency, selected_orbit)
+        if idx is None:
+            return None
+
+        # Snapshot rows follow catalog rows; rows past an older, shorter snapshot are skipped
+        timeline = snapshot.timeline
+        rows = np.asarray(idx, dtype=np.int64)
+        found = np.flatnonzero(rows < len(snapshot.ids))
+
+        # LOD: only satellites facing the camera, thinned to the zoom's density
+        now_lat, now_lng, now_alt = interpolate_timeline(timeline)
+        live = np.isfinite(now_lat[rows[found]]) & np.isfinite(now_alt[rows[found]])
+        found = found[live]
+        found = found[select_visible(now_lat[rows[found]], now_lng[rows[found]], now_alt[rows[found]], camera)]
+
+        if Config.TIMELINE_ENABLED:
+            # Samples the clientside ticker interpolates between, coarser when zoomed out
+            stride = track_stride(camera, Config.TIMELINE_STEP_S, Config.TIMELINE_HORIZON_MIN)
+            lat, lng = timeline["lat"][rows[found], ::stride], timeline["lng"][rows[found], ::stride]
+            alt = _viz_alt(timeline["alt_km"][rows[found], ::stride])
+            t0, step_ms = timeline["t0"], timeline["step_ms"] * stride
+        else:
+            lat, lng = now_lat[rows[found]][:, None], now_lng[rows[found]][:, None]
+            alt = _viz_alt(now_alt[rows[found]])[:, None]
+            t0, step_ms = None, None
+
+        ok = np.isfinite(lat).all(axis=1) & np.isfinite(lng).all(axis=1) & np.isfinite(alt).all(axis=1)
+        return {
+            "key": manifest_key(filters, catalog.ids[idx]),
+            "view": camera,
+            "computed_at": snapshot.computed_at,
+            "rows": found[ok],
+            "lat": lat[ok], "lng": lng[ok], "alt": alt[ok],
+            "t0": t0, "step_ms": step_ms,
+        }
 
-            color = "#00f3ff"
-            if isinstance(sat_type, str) and "Space Station" in sat_type:
-                color = "#ffcc00"
-            elif isinstance(sat_type, str) and "Telescope" in sat_type:
-                color = "#ff2a6d"
-            elif isinstance(sat_type, str) and "Communication" in sat_type:
-                color = "#00ff88"
-            elif isinstance(sat_type, str) and "Navigation" in sat_type:
-                color = "#8800ff"
+    # Applies the manifest and position updates to the satellite objects held in the
+    # browser, then reports what was applied so the next update can be a delta
+    clientside_callback(
+        """
+        function(manifest, update) {
+            var dc = window.dash_clientside;
+            if (!manifest || !update || update.key !== manifest.key) { return dc.no_update; }
+            var g = window.globeState = window.globeState || {key: null, slots: [], live: {}, sats: []};
+            // Columnar payloads: base64 little-endian buffers viewed as typed arrays
+            var TYPES = {int16: Int16Array, int32: Int32Array, float32: Float32Array};
+            function typed(b64, dtype) {
+                var bin = atob(b64), bytes = new Uint8Array(bin.length);
+                for (var b = 0; b < bin.length; b++) { bytes[b] = bin.charCodeAt(b); }
+                return new TYPES[dtype](bytes.buffer);
+            }
+            function column(field) {
+                if (manifest.format !== "columnar") { return function(k) { return manifest[field][k]; }; }
+                var codes = typed(manifest[field].codes, manifest[field].dtype), labels = manifest[field].labels;
+                return function(k) { return labels[codes[k]]; };
+            }
+            if (g.key !== manifest.key) {
+                var owner = column("owners"), type = column("types"), color = column("colors");
+                g.key = manifest.key;
+                g.live = {};
+                g.slots = manifest.ids.map(function(id, k) {
+                    return {id: id, name: manifest.names[k], owner: owner(k), type: type(k), color: color(k)};
+                });
+            }
+            if (update.full) { g.live = {}; }
 
-            satellites.append(
-                {
-                    "name": row.get("Name of Satellite, Alternate Names", "Unknown"),
-                    "owner": owner_val,
-                    "lat": float(lat),
-                    "lng": float(lon),
-                    "alt": float(viz_alt),
-                    "type": sat_type if sat_type is not None else "Unknown",
-                    "color": color,
+            // Delta payloads: lat/lng/alt are varint strings of second-order deltas, T values per row
+            var A = "%s";
+            if (!window.globeVarint) {
+                window.globeVarint = {};
+                for (var a = 0; a < A.length; a++) { window.globeVarint[A[a]] = a; }
+            }
+            function unpack(text) {
+                var out = [], z = 0, mul = 1;
+                for (var p = 0; p < text.length; p++) {
+                    var c = window.globeVarint[text[p]];
+                    z += (c & 31) * mul;
+                    if (c & 32) { mul *= 32; continue; }
+                    out.push(z %% 2 ? -(z + 1) / 2 : z / 2);
+                    z = 0; mul = 1;
                 }
-            )
+                return out;
+            }
+            var T = update.T, rows, track;
+            if (update.format === "columnar") {
+                rows = typed(update.i, "int32");
+                var cols = {};
+                [["lat", 0], ["lng", 0], ["alt", 1]].forEach(function(f) {
+                    var raw = typed(update[f[0]], update.dtype), scale = update.scale[f[1]];
+                    if (scale === 1) { cols[f[0]] = raw; return; }
+                    var out = new Float32Array(raw.length);
+                    for (var q = 0; q < raw.length; q++) { out[q] = raw[q] / scale; }
+                    cols[f[0]] = out;
+                });
+                // Zero-copy per-satellite views into the column buffers
+                track = function(field, r) { return cols[field].subarray(r * T, (r + 1) * T); };
+            } else {
+                rows = update.i;
+                var deltas = {lat: unpack(update.lat), lng: unpack(update.lng), alt: unpack(update.alt)};
+                track = function(field, r) {
+                    var arr = deltas[field], scale = update.scale[field === "alt" ? 1 : 0];
+                    var out = new Array(T), v = 0, dv = 0;
+                    for (var k = 0; k < T; k++) {
+                        var d = arr[r * T + k];
+                        if (k === 0) { v = d; } else { dv = (k === 1) ? d : dv + d; v += dv; }
+                        out[k] = v / scale;
+                    }
+                    if (field === "lng") { out = out.map(function(x) { return ((x %% 360) + 540) %% 360 - 180; }); }
+                    return out;
+                };
+            }
+            for (var r = 0; r < rows.length; r++) {
+                var s = g.slots[rows[r]];
+                var lat = track("lat", r), lng = track("lng", r), alt = track("alt", r);
+                s.lat = lat[0]; s.lng = lng[0]; s.alt = alt[0];
+                if (T > 1) {
+                    s.t0 = update.t0; s.step_ms = update.step_ms;
+                    s.track = {lat: lat, lng: lng, alt: alt};
+                }
+                g.live[rows[r]] = true;
+            }
+            g.sats = g.slots.filter(function(s, k) { return g.live[k]; });
 
-        return satellites
+            if (dc.clientside && dc.clientside.render_globe) {
+                dc.clientside.render_globe(null, g.sats);
+            }
+            return {key: update.key, view: update.view, computed_at: update.computed_at, count: g.sats.length};
+        }
+        """ % VARINT_ALPHABET,
+        Output("globe-sync", "data"),
+        Input("globe-manifest", "data"),
+        Input("chat-store", "data"),
+    )
 
+    # Reports the globe camera (globe.gl pointOfView) when it has moved enough
+    # to change the LOD frame, so panning doesn't flood the server.
+    # window.globeInstance is set by assets/globe_instance.js
     clientside_callback(
         """
-        function(data) {
-            if (window.dash_clientside && window.dash_clientside.clientside) {
-                window.dash_clientside.clientside.render_globe(null, data || []);
+        function(n, current) {
+            var dc = window.dash_clientside;
+            var globe = window.globeInstance;
+            if (!globe || !globe.pointOfView) { return dc.no_update; }
+            var pov = globe.pointOfView();
+            var cam = {lat: Math.round(pov.lat / %(snap)s) * %(snap)s,
+                       lng: Math.round(pov.lng / %(snap)s) * %(snap)s,
+                       altitude: Math.round(pov.altitude * 10) / 10};
+            if (current && current.lat === cam.lat && current.lng === cam.lng && current.altitude === cam.altitude) {
+                return dc.no_update;
             }
+            return cam;
+        }
+        """ % {"snap": Config.LOD_CAMERA_SNAP_DEG},
+        Output("globe-camera", "data"),
+        Input("timeline-tick", "n_intervals"),
+        State("globe-camera", "data"),
+    )
+
+    # Moves every satellite along its precomputed track without a server round-trip
+    clientside_callback(
+        """
+        function(n) {
+            var data = window.globeState && window.globeState.sats;
+            if (!data || !data.length || !(window.dash_clientside && window.dash_clientside.clientside)) {
+                return "";
+            }
+            var now = Date.now();
+            var frame = data.map(function(s) {
+                var tl = s.track;
+                if (!tl || !tl.lat || !tl.lat.length) { return s; }
+                var last = tl.lat.length - 1;
+                var f = Math.min(Math.max((now - s.t0) / s.step_ms, 0), last);
+                var i = Math.floor(f), j = Math.min(i + 1, last), w = f - i;
+                var dLng = ((tl.lng[j] - tl.lng[i] + 540) % 360) - 180;
+                var lng = ((tl.lng[i] + w * dLng + 540) % 360) - 180;
+                return Object.assign({}, s, {
+                    lat: tl.lat[i] + w * (tl.lat[j] - tl.lat[i]),
+                    lng: lng,
+                    alt: tl.alt[i] + w * (tl.alt[j] - tl.alt[i])
+                });
+            });
+            window.dash_clientside.clientside.render_globe(null, frame);
             return "";
         }
         """,
-        Output("globe-render-signal", "children"),
-        Input("chat-store", "data"),
+        Output("timeline-render-signal", "children"),
+        Input("timeline-tick", "n_intervals"),
     )
 
-    @app.callback(Output("satellite-count", "children"), Input("chat-store", "data"))
-    def update_count(data):
-        if not data:
-            return "[ SEARCHING... ]"
-        return f"[ TRACKING {len(data)} ASSETS ]"
-from dash import Input, Output, clientside_callback
-from datetime import datetime, timedelta
-
-from visualization.deck_map import get_current_position
-
-_position_cache = {}
-_cache_time = None
-_cache_duration = timedelta(seconds=60)
-
-
-def get_cached_positions(df):
-    global _position_cache, _cache_time
-
-    now = datetime.now()
-    if _cache_time is None or (now - _cache_time) > _cache_duration:
-        _position_cache = {}
-
-        for _, row in df.iterrows():
-            if "TLE_LINE1" in row and "TLE_LINE2" in row:
-                sat_id = str(row.get("NORAD_CAT_ID", row.get("Name of Satellite, Alternate Names", "")))
-                try:
-                    lat, lon, alt_km = get_current_position(row["TLE_LINE1"], row["TLE_LINE2"])
-                    if lat is not None and lon is not None and alt_km is not None:
-                        _position_cache[sat_id] = {"lat": lat, "lon": lon, "alt_km": alt_km}
-                except Exception:
-                    continue
-
-        _cache_time = now
-
-    return _position_cache
-
-
-def register(app, db):
-    # Prevent double-registration (the same callback added twice still triggers the same error) [web:2]
-    if getattr(app, "_satellite_store_registered", False):
-        return
-    app._satellite_store_registered = True
-
     @app.callback(
-        Output("chat-store", "data"),
-        Input("refresh", "n_clicks"),
+        Output("pass-satellite", "options"),
         Input("satellite-types", "value"),
         Input("agency", "value"),
         Input("orbit", "value"),
     )
-    def update_satellite_positions(n_clicks, selected_types, selected_agency, selected_orbit):
-        df = db.get_data()
-        if df is None or df.empty or "TLE_LINE1" not in df.columns or "TLE_LINE2" not in df.columns:
+    def update_pass_targets(selected_types, selected_agency, selected_orbit):
+        # Same satellites the globe shows
+        catalog, idx = selection(selected_types, selected_agency, selected_orbit)
+        if idx is None:
             return []
+        return [{"label": name, "value": sat_id}
+                for name, sat_id in zip(catalog.names[idx].tolist(), catalog.ids[idx].tolist())]
 
-        filtered_df = df.copy()
-
-        owner_col = next((c for c in filtered_df.columns if ("own" in c.lower() or "oper" in c.lower())), None)
-        if selected_agency and selected_agency != "All" and owner_col:
-            filtered_df = filtered_df[
-                filtered_df[owner_col].astype(str).str.contains(selected_agency, case=False, na=False)
-            ]
-
-        orbit_col = next((c for c in filtered_df.columns if ("orb" in c.lower() or "class" in c.lower())), None)
-        if selected_orbit and selected_orbit != "All" and orbit_col:
-            filtered_df = filtered_df[filtered_df[orbit_col] == selected_orbit]
-
-        type_col = next((c for c in filtered_df.columns if ("purp" in c.lower() or "purpose" in c.lower())), None)
-        if selected_types and type_col:
-            if isinstance(selected_types, str):
-                selected_types = [selected_types]
-            filtered_df = filtered_df[filtered_df[type_col].isin(selected_types)]
-
-        MAX_SATELLITES = 300
-        if len(filtered_df) > MAX_SATELLITES:
-            filtered_df = filtered_df.head(MAX_SATELLITES)
-
-        position_cache = get_cached_positions(df)
-
-        satellites = []
-        for _, row in filtered_df.iterrows():
-            sat_id = str(row.get("NORAD_CAT_ID", row.get("Name of Satellite, Alternate Names", "")))
-
-            if sat_id in position_cache:
-                lat = position_cache[sat_id]["lat"]
-                lon = position_cache[sat_id]["lon"]
-                alt_km = position_cache[sat_id]["alt_km"]
-            else:
-                try:
-                    lat, lon, alt_km = get_current_position(row["TLE_LINE1"], row["TLE_LINE2"])
-                except Exception:
-                    continue
-
-            if lat is None or lon is None or alt_km is None:
-                continue
-
-            viz_alt = max(0.02, min((float(alt_km) / 40000.0) * 2.0, 0.5))
-
-            sat_type = row.get(type_col, row.get("Purpose", "Unknown")) if type_col else row.get("Purpose", "Unknown")
-            owner_val = row.get(owner_col, row.get("Owner", "Unknown")) if owner_col else row.get("Owner", "Unknown")
-
-            color = "#00f3ff"
-            if isinstance(sat_type, str) and "Space Station" in sat_type:
-                color = "#ffcc00"
-            elif isinstance(sat_type, str) and "Telescope" in sat_type:
-                color = "#ff2a6d"
-            elif isinstance(sat_type, str) and "Communication" in sat_type:
-                color = "#00ff88"
-            elif isinstance(sat_type, str) and "Navigation" in sat_type:
-                color = "#8800ff"
-
-            satellites.append(
-                {
-                    "name": row.get("Name of Satellite, Alternate Names", "Unknown"),
-                    "owner": owner_val,
-                    "lat": float(lat),
-                    "lng": float(lon),
-                    "alt": float(viz_alt),
-                    "type": sat_type if sat_type is not None else "Unknown",
-                    "color": color,
-                }
-            )
-
-        return satellites
-
-    clientside_callback(
-        """
-        function(data) {
-            if (window.dash_clientside && window.dash_clientside.clientside) {
-                window.dash_clientside.clientside.render_globe(null, data || []);
-            }
-            return "";
-        }
-        """,
-        Output("globe-render-signal", "children"),
-        Input("chat-store", "data"),
+    @app.callback(
+        Output("next-pass-info", "children"),
+        Input("pass-satellite", "value"),
+        Input("observer-lat", "value"),
+        Input("observer-lng", "value"),
+        Input("timeline-refresh", "n_intervals"),
     )
-
-    @app.callback(Output("satellite-count", "children"), Input("chat-store", "data"))
-    def update_count(data):
-        if not data:
+    def update_next_pass(sat_id, lat, lng, n_refresh):
+        # The refresh tick moves on once a pass has set; repeats are served from the predictor cache
+        catalog = db.get_catalog()
+        if sat_id is None or lat is None or lng is None or catalog is None or not catalog.has_tles:
+            return create_pass_rows()
+        rows = np.flatnonzero(catalog.ids == sat_id)
+        if not len(rows):
+            return create_pass_rows()
+        observer = (lat, lng, Config.OBSERVER_ALT_KM)
+        return create_pass_rows(get_pass_predictor().next_pass(catalog.propagator, int(rows[0]), observer))
+
+    @app.callback(Output("satellite-count", "children"), Input("globe-sync", "data"))
+    def update_count(synced):
+        if not synced or not synced.get("count"):
             return "[ SEARCHING... ]"
-        return f"[ TRACKING {len(data)} ASSETS ]"
\ No newline at end of file
+        return f"[ TRACKING {synced['count']} ASSETS ]"
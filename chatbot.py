@@ -1,6 +1,11 @@
 """Advanced chatbot with natural language understanding and commands"""
 import re
 from datetime import datetime, timedelta
+from config.settings import Config
+from utils.position_service import get_position_service
+
+# "40.7, -74.0" / "40.7,-74.0" / "40.7 -74.0" in free text
+COORDS_RE = re.compile(r'(-?\d+(?:\.\d+)?)(?:\s*,\s*|\s+)(-?\d+(?:\.\d+)?)')
 
 class SpaceChatbot:
     """Intelligent chatbot for space mission control"""
@@ -35,7 +40,9 @@ class SpaceChatbot:
             '/search': self.cmd_search,
             '/clear': self.cmd_clear,
             '/upcoming': self.cmd_upcoming,
-            '/compare': self.cmd_compare
+            '/compare': self.cmd_compare,
+            '/near': self.cmd_near,
+            '/over': self.cmd_over
         }
         
         handler = commands.get(command)
@@ -75,6 +82,11 @@ class SpaceChatbot:
         if any(agency in msg for agency in ['spacex', 'nasa', 'russia', 'china', 'europe', 'india', 'japan']):
             return self.handle_agency_query(msg)
         
+        # What is over / near a coordinate
+        coords = self.parse_coords(msg)
+        if coords and any(word in msg for word in ['over', 'near', 'above', 'around']):
+            return self.satellites_near(*coords)
+        
         # Satellite queries
         if any(word in msg for word in ['satellite', 'iss', 'hubble', 'starlink', 'gps']):
             return self.handle_satellite_query(msg)
@@ -119,12 +131,15 @@ class SpaceChatbot:
 - `/search [term]` - Search launches
 - `/upcoming` - Next launches
 - `/compare [a] vs [b]` - Compare agencies
+- `/near [lat] [lng] [km]` - Satellites whose ground point is within km of a point
+- `/over [lat1] [lat2] [lng1] [lng2]` - Satellites over a region
 - `/clear` - Clear filters
 
 **📊 Data Questions:**
 - "Which orbit is most common?"
 - "What's the busiest launch site?"
 - "Launches this year?"
+- "What's over 28.5, -80.6?"
 
 Just ask me anything! 🚀"""
     
@@ -161,7 +176,11 @@ Just ask me anything! 🚀"""
         if not args:
             return "Usage: /search [term] (e.g., /search starlink)"
         term = ' '.join(args)
-        return f"🔍 Searching for: **{term}**\n(Use the search box to apply)"
+        hits = self.db.search_launches(term, limit=5) if hasattr(self.db, 'search_launches') else []
+        if not hits:
+            return f"🔍 No launches found for: **{term}**"
+        lines = [f"• {snippet} — {agency or 'Unknown'} ({str(date)[:10]})" for _, _, agency, date, snippet in hits]
+        return f"🔍 Top matches for **{term}**:\n" + "\n".join(lines)
     
     def cmd_clear(self, args):
         """Clear all filters"""
@@ -178,6 +197,32 @@ Just ask me anything! 🚀"""
             return "Usage: /compare [agency1] vs [agency2]\nExample: /compare spacex vs nasa"
         return self.handle_comparison_query(' '.join(args))
     
+    def cmd_near(self, args):
+        """Satellites whose ground point is within a radius (along the surface) of a point"""
+        try:
+            lat, lng = float(args[0]), float(args[1])
+            radius_km = float(args[2]) if len(args) > 2 else Config.CHAT_NEAR_RADIUS_KM
+        except (IndexError, ValueError):
+            return ("Usage: /near [lat] [lng] [radius_km] (e.g., /near 28.5 -80.6 2000)\n"
+                    "Lists satellites at any altitude whose ground point is within radius_km of "
+                    "(lat, lng), measured along the Earth's surface")
+        return self.satellites_near(lat, lng, radius_km)
+    
+    def cmd_over(self, args):
+        """Satellites whose ground point is inside a lat/lng box"""
+        try:
+            lat1, lat2, lng1, lng2 = (float(a) for a in args[:4])
+        except ValueError:
+            return "Usage: /over [lat1] [lat2] [lng1] [lng2] (e.g., /over 24 50 -125 -66)"
+        spatial = get_position_service(self.db).snapshot().spatial
+        idx = spatial.bbox(min(lat1, lat2), max(lat1, lat2), lng1, lng2)
+        if not len(idx):
+            return f"🛰️ No tracked satellites over ({lat1:g}..{lat2:g}, {lng1:g}..{lng2:g}) right now."
+        lines = [f"• {name} — {alt:.0f} km" for name, alt in
+                 zip(self.satellite_names(spatial, idx[:10]), spatial.alt_km[idx[:10]])]
+        return (f"🛰️ **{len(idx)} satellites** over ({lat1:g}..{lat2:g}, {lng1:g}..{lng2:g}):\n"
+                + "\n".join(lines))
+    
     # ========== Natural Language Handlers ==========
     
     def handle_count_query(self, msg):
@@ -327,10 +372,51 @@ Just ask me anything! 🚀"""
     
     def handle_location_query(self, msg):
         """Handle location questions"""
+        coords = self.parse_coords(msg)
+        if coords:
+            return self.satellites_near(*coords)
         return "🗺️ **Major Launch Sites:**\n• Kennedy Space Center (USA)\n• Cape Canaveral (USA)\n• Baikonur (Kazakhstan)\n• Jiuquan (China)\n• Guiana Space Centre (France)\n\nClick launches on the map to see their exact pad!"
     
     # ========== Helper Methods ==========
     
+    def parse_coords(self, msg):
+        """(lat, lng) from free text, or None"""
+        match = COORDS_RE.search(msg)
+        if not match:
+            return None
+        lat, lng = float(match.group(1)), float(match.group(2))
+        if abs(lat) > 90 or abs(lng) > 180:
+            return None
+        return lat, lng
+    
+    def satellite_names(self, spatial, idx):
+        """Display names for spatial index hits (snapshot rows follow catalog rows)"""
+        catalog = self.db.get_catalog()
+        rows = spatial.rows[idx]
+        if catalog is None or len(catalog) <= (rows.max() if len(rows) else -1):
+            return [str(sat_id) for sat_id in spatial.ids[idx]]
+        return catalog.names[rows].tolist()
+    
+    def satellites_near(self, lat, lng, radius_km=None):
+        """
+        Satellites whose ground point (sub-satellite point) is within
+        radius_km of (lat, lng) along the Earth's surface, at any altitude;
+        the closest ones if none are
+        """
+        radius_km = radius_km or Config.CHAT_NEAR_RADIUS_KM
+        spatial = get_position_service(self.db).snapshot().spatial
+        idx, dist = spatial.ground_radius(lat, lng, radius_km)
+        if len(idx):
+            header = f"🛰️ **{len(idx)} satellites** overhead within {radius_km:g} km of ({lat:g}, {lng:g}):"
+        else:
+            idx, dist = spatial.ground_nearest(lat, lng, k=5)
+            if not len(idx):
+                return "🛰️ No satellite positions available yet."
+            header = f"🛰️ Nothing overhead within {radius_km:g} km of ({lat:g}, {lng:g}). Closest:"
+        lines = [f"• {name} — ground point {d:.0f} km away, {alt:.0f} km up" for name, d, alt in
+                 zip(self.satellite_names(spatial, idx[:10]), dist[:10], spatial.alt_km[idx[:10]])]
+        return header + "\n" + "\n".join(lines)
+    
     def get_agency_launch_count(self, agency_name):
         """Get launch count for specific agency"""
         launches = [l for l in self.db.get_launches() if agency_name.lower() in l[2].lower()]
@@ -1,20 +1,41 @@
-import sqlite3
+import re
+import logging
 import pandas as pd
 import os
+from config.settings import Config
+from data.tle_store import TLEStore, tle_norad
+from data.ingest import ingest
+from data.migrations import apply_migrations
+from data.db_pool import ConnectionPool
+from data.catalog import SatelliteCatalog
+from data.catalog_store import load_catalog, export_catalog
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    terms = re.findall(r"\w+", text or "")
+    return " ".join(f'"{t}"*' for t in terms)
 
 class DB:
     """Database manager for both Launch data (SQLite) and Satellite data (CSV)"""
     
     def __init__(self, path="launches.db"):
         # 1. SETUP SQLITE (For Launches)
-        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.path = path
+        self._stats_cache = None  # (stats_version, stats dict)
+        # Per-thread readers plus one serialized writer; self.conn is the writer
+        self.pool = ConnectionPool(path)
+        self.conn = self.pool.writer
         self._init_sqlite()
+        self.tles = TLEStore(self.conn, lock=self.pool.write_lock)
 
         # 2. SETUP CSV (For Satellites)
         # We assume satellites.csv is in the same folder as this script, or one level up
         base_path = os.path.dirname(os.path.abspath(__file__))
         self.csv_path = os.path.join(base_path, 'satellites.csv') 
-        self.satellite_df = None
+        # Memory-mapped binary export of the CSV, rebuilt whenever the CSV changes
+        self.catalog_path = os.path.join(base_path, 'satellites.cat')
+        self.catalog = None
+        self._tles_applied = None  # TLEStore.last_updated() the catalog's lines reflect
         self._load_csv_data()
 
     def _init_sqlite(self):
@@ -28,67 +49,115 @@ class DB:
         self.conn.execute("""CREATE TABLE IF NOT EXISTS pads (
             id INT PRIMARY KEY, name TEXT, lat REAL, lon REAL, loc TEXT, cnt INT)""")
         self.conn.commit()
+        apply_migrations(self.conn)
 
     def _load_csv_data(self):
-        """Load Satellite CSV data into a Pandas DataFrame"""
+        """Load the satellite catalog: the binary export if current, else the CSV"""
+        catalog = load_catalog(self.catalog_path, source=self.csv_path)
+        if catalog is not None:
+            self.catalog = catalog
+            self._seed_tles()
+            return
+
         try:
             if os.path.exists(self.csv_path):
-                self.satellite_df = pd.read_csv(self.csv_path)
+                df = pd.read_csv(self.csv_path)
             else:
                 # If file missing, create empty structure to prevent crashes
                 print(f"WARNING: Satellite CSV not found at {self.csv_path}")
-                self.satellite_df = pd.DataFrame(columns=[
+                df = pd.DataFrame(columns=[
                     'Name of Satellite, Alternate Names', 'Owner', 
                     'Purpose', 'Class of Orbit', 'TLE_LINE1', 'TLE_LINE2'
                 ])
         except Exception as e:
             print(f"Error loading satellite CSV: {e}")
-            self.satellite_df = pd.DataFrame()
+            df = pd.DataFrame()
+        self.catalog = SatelliteCatalog.from_dataframe(df)
+        if len(self.catalog):
+            self._seed_tles()
+            try:
+                export_catalog(self.catalog, self.catalog_path, source=self.csv_path)
+            except OSError as e:
+                logging.debug(f"Could not write catalog export {self.catalog_path}: {e}")
+
+    def _seed_tles(self):
+        """Copy catalog TLEs into the persistent store (newer stored epochs win)"""
+        catalog = self.catalog
+        if not catalog.has_tles:
+            return
+        tles = {}
+        for name, line1, line2 in zip(catalog.names, catalog.line1, catalog.line2):
+            try:
+                tles[tle_norad(line1)] = (name, line1, line2)
+            except (TypeError, ValueError):
+                continue
+        self.tles.upsert(tles)
+        self._apply_stored_tles()
+
+    def _apply_stored_tles(self):
+        """Propagate from the newest element sets in the store rather than the CSV's"""
+        norads = self.catalog.norads
+        self._tles_applied = self.tles.last_updated()
+        self.catalog = self.catalog.with_tles(self.tles.get(norads[norads >= 0].tolist()))
+
+    def reload_tles(self):
+        """
+        Apply element sets another process wrote to the store since this
+        catalog was built.
+
+        Returns:
+            True when the catalog was swapped
+        """
+        if self.catalog is None or not self.catalog.has_tles:
+            return False
+        if self.tles.last_updated() == self._tles_applied:
+            return False
+        self._apply_stored_tles()
+        return True
+
+    def refresh_tles(self, fetch, max_age_h=None):
+        """
+        Refetch catalog TLEs not seen within max_age_h through
+        fetch(ids) -> {norad: (name, line1, line2)}; when any epoch moved
+        forward, the catalog is swapped for one carrying the new lines.
+
+        Returns:
+            (fetched, written) counts
+        """
+        catalog = self.get_catalog()
+        if catalog is None or not catalog.has_tles:
+            return 0, 0
+        norads = catalog.norads
+        fetched, written = self.tles.refresh(norads[norads >= 0].tolist(), fetch,
+                                             max_age_h=max_age_h or Config.TLE_MAX_AGE_H)
+        if written:
+            self._apply_stored_tles()
+        return fetched, written
 
     # =========================================================================
     # SATELLITE METHODS (Used by 3D Map)
     # =========================================================================
     
-    def get_data(self):
+    def get_catalog(self):
         """
-        Returns the Satellite DataFrame.
-        called by: visualization/map.py
+        Returns the shared, read-only SatelliteCatalog (no copy).
+        called by: callbacks/chat_callbacks.py, callbacks/map_callbacks.py, visualization/map.py
         """
-        if self.satellite_df is None or self.satellite_df.empty:
+        if self.catalog is None or len(self.catalog) == 0:
             self._load_csv_data()
-        return self.satellite_df.copy()
+        return self.catalog
 
     # =========================================================================
     # LAUNCH METHODS (Used by Launch Dashboard)
     # =========================================================================
 
     def insert(self, data, upcoming=False):
-        """Insert launch data into database"""
-        for l in data:
-            try:
-                a = l.get('launch_service_provider', {})
-                p = l.get('pad', {})
-                m = l.get('mission', {})
-                r = l.get('rocket', {})
-                
-                self.conn.execute("INSERT OR IGNORE INTO agencies VALUES (?, ?, ?, ?)",
-                    (a.get('id'), a.get('name', 'Unk'), a.get('type', 'Unk'), a.get('country_code', 'UN')))
-                
-                self.conn.execute("""INSERT OR REPLACE INTO pads VALUES (?, ?, ?, ?, ?, 
-                    COALESCE((SELECT cnt FROM pads WHERE id = ?) + 1, 1))""",
-                    (p.get('id'), p.get('name', 'Unk'), p.get('latitude', 0), p.get('longitude', 0),
-                     p.get('location', {}).get('name', 'Unk'), p.get('id')))
-                
-                orbit = m.get('orbit', {}).get('abbrev', 'LEO') if m else 'LEO'
-                
-                self.conn.execute("""INSERT OR REPLACE INTO launches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (l.get('id'), l.get('name', 'Unk'), orbit, a.get('id'), p.get('id'), l.get('net', 'Unk'),
-                     l.get('status', {}).get('name', 'Unk'), r.get('configuration', {}).get('name', 'Unk'),
-                     m.get('description', 'No desc') if m else 'No desc', l.get('image', ''),
-                     l.get('vidURLs', [{}])[0].get('url', '') if l.get('vidURLs') else '', 1 if upcoming else 0))
-            except:
-                pass
-        self.conn.commit()
+        """
+        Insert launch data into database (single batched transaction).
+        Returns counts of inserted, updated and rejected launches.
+        """
+        with self.pool.write() as conn:
+            return ingest(conn, data, upcoming)
     
     def get_launches(self, search=None, orbit=None, upcoming=False):
         """Retrieve launches with optional filtering"""
@@ -101,36 +170,74 @@ class DB:
             q += " AND l.orbit = ?"
             params.append(orbit)
         if search:
-            q += " AND (l.name LIKE ? OR l.rocket LIKE ? OR a.name LIKE ?)"
-            s = f"%{search}%"
-            params.extend([s, s, s])
-        return self.conn.execute(q, params).fetchall()
+            match = fts_query(search)
+            if not match:
+                return []
+            q += " AND l.rowid IN (SELECT rowid FROM launches_fts WHERE launches_fts MATCH ?)"
+            params.append(match)
+        with self.pool.read() as conn:
+            return conn.execute(q, params).fetchall()
+    
+    def search_launches(self, query, limit=20):
+        """
+        Ranked prefix search over launch name, rocket, agency, description
+        and pad location.
+        Returns (id, name, agency, date, snippet) rows, best match first;
+        matched terms in the snippet are wrapped in ** for the chat markdown.
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        with self.pool.read() as conn:
+            return conn.execute("""SELECT l.id, l.name, a.name, l.date,
+                    snippet(launches_fts, -1, '**', '**', '…', 12)
+                FROM launches_fts f JOIN launches l ON l.rowid = f.rowid
+                LEFT JOIN agencies a ON l.agency_id = a.id
+                WHERE launches_fts MATCH ? ORDER BY f.rank LIMIT ?""", (match, limit)).fetchall()
     
     def get_launch_by_id(self, lid):
         """Get specific launch details"""
-        return self.conn.execute("""SELECT l.*, a.name, p.name, p.loc 
-            FROM launches l JOIN agencies a ON l.agency_id = a.id
-            JOIN pads p ON l.pad_id = p.id WHERE l.id = ?""", (lid,)).fetchone()
+        with self.pool.read() as conn:
+            return conn.execute("""SELECT l.*, a.name, p.name, p.loc 
+                FROM launches l JOIN agencies a ON l.agency_id = a.id
+                JOIN pads p ON l.pad_id = p.id WHERE l.id = ?""", (lid,)).fetchone()
+    
+    def stats_version(self):
+        """Counter bumped by every write that can change stats(); cheap to poll"""
+        try:
+            with self.pool.read() as conn:
+                return conn.execute("SELECT value FROM stats_meta WHERE key = 'version'").fetchone()[0]
+        except Exception:
+            return -1
     
     def stats(self):
-        """Get launch statistics"""
+        """
+        Get launch statistics.
+        Read from the trigger-maintained summary tables and memoized per
+        stats_version, so repeated calls between writes cost one lookup.
+        """
+        version = self.stats_version()
+        if self._stats_cache is not None and self._stats_cache[0] == version:
+            return self._stats_cache[1]
         try:
-            total = self.conn.execute("SELECT COUNT(*) FROM launches WHERE upcoming = 0").fetchone()[0]
-            upcoming = self.conn.execute("SELECT COUNT(*) FROM launches WHERE upcoming = 1").fetchone()[0]
-            agencies = self.conn.execute("SELECT COUNT(DISTINCT agency_id) FROM launches").fetchone()[0]
-            orbits = dict(self.conn.execute("SELECT orbit, COUNT(*) FROM launches WHERE upcoming = 0 GROUP BY orbit").fetchall())
-            agency_stats = self.conn.execute("""SELECT a.name, COUNT(*) as t, 
-                SUM(CASE WHEN l.status LIKE '%Success%' THEN 1 ELSE 0 END) as s
-                FROM launches l JOIN agencies a ON l.agency_id = a.id WHERE l.upcoming = 0 
-                GROUP BY a.name ORDER BY t DESC LIMIT 8""").fetchall()
-            return {
+            with self.pool.read() as conn:
+                total = conn.execute("SELECT COALESCE(SUM(n), 0) FROM stats_orbit WHERE upcoming = 0").fetchone()[0]
+                upcoming = conn.execute("SELECT COALESCE(SUM(n), 0) FROM stats_orbit WHERE upcoming = 1").fetchone()[0]
+                agencies = conn.execute("SELECT COUNT(DISTINCT agency_id) FROM stats_agency WHERE n > 0").fetchone()[0]
+                orbits = dict(conn.execute("SELECT orbit, n FROM stats_orbit WHERE upcoming = 0 AND n > 0").fetchall())
+                agency_stats = conn.execute("""SELECT a.name, SUM(sa.n) as t, SUM(sa.s) as s
+                    FROM stats_agency sa JOIN agencies a ON sa.agency_id = a.id
+                    WHERE sa.upcoming = 0 AND sa.n > 0
+                    GROUP BY a.name ORDER BY t DESC LIMIT 8""").fetchall()
+            stats = {
                 'total': total,
                 'upcoming': upcoming,
                 'agencies': agencies,
                 'orbits': orbits,
-                'agency_stats': agency_stats
+                'agency_stats': agency_stats,
+                'version': version,
             }
         except:
-             return {'total': 0, 'upcoming': 0, 'agencies': 0, 'orbits': {}, 'agency_stats': []}
-        
-
+            return {'total': 0, 'upcoming': 0, 'agencies': 0, 'orbits': {}, 'agency_stats': [], 'version': -1}
+        self._stats_cache = (version, stats)
+        return stats
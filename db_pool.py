@@ -0,0 +1,86 @@
+"""SQLite connection pool: one read connection per thread, one serialized writer"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from data.migrations import configure_connection
+
+
+class ConnectionPool:
+    """
+    Readers get a thread-local read-only connection, so concurrent Dash
+    callbacks read in parallel (WAL keeps them from blocking the writer).
+    All writes go through a single connection guarded by a lock.
+    In-memory databases cannot be shared across connections, so there every
+    reader falls back to the writer connection under the same lock.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.shared = path == ":memory:"
+        self.writer = sqlite3.connect(path, check_same_thread=False)
+        configure_connection(self.writer, path)
+        self.write_lock = threading.RLock()
+
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+
+        self._metrics_lock = threading.Lock()
+        self.reads = 0
+        self.writes = 0
+        self.write_wait_s = 0.0
+        self.write_wait_max_s = 0.0
+
+    def _reader(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            uri = Path(self.path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            configure_connection(conn, self.path, readonly=True)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def read(self):
+        """Connection for queries on the calling thread"""
+        with self._metrics_lock:
+            self.reads += 1
+        if self.shared:
+            with self.write_lock:
+                yield self.writer
+        else:
+            yield self._reader()
+
+    @contextmanager
+    def write(self):
+        """The single writer connection, held exclusively for the block"""
+        started = time.perf_counter()
+        with self.write_lock:
+            waited = time.perf_counter() - started
+            with self._metrics_lock:
+                self.writes += 1
+                self.write_wait_s += waited
+                self.write_wait_max_s = max(self.write_wait_max_s, waited)
+            yield self.writer
+
+    def metrics(self):
+        """Usage counters and writer lock wait times"""
+        return {
+            'reads': self.reads,
+            'writes': self.writes,
+            'reader_connections': len(self._readers),
+            'write_wait_total_s': self.write_wait_s,
+            'write_wait_max_s': self.write_wait_max_s,
+            'write_wait_avg_s': self.write_wait_s / self.writes if self.writes else 0.0,
+        }
+
+    def close(self):
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self.writer.close()
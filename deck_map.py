@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
-from sgp4.api import Satrec
+from utils.tle_cache import get_satrec
 from sgp4.conveniences import jday
-import math
+import numpy as np
+from utils.frames import teme_to_geodetic
 
 def get_current_position(line1, line2):
     """Calculates Lat/Lon/Alt from TLE - OPTIMIZED"""
     try:
-        satellite = Satrec.twoline2rv(line1, line2)
+        satellite = get_satrec(line1, line2)
         now = datetime.now(timezone.utc)
         jd, fr = jday(now.year, now.month, now.day, now.hour, now.minute, now.second)
         e, r, v = satellite.sgp4(jd, fr)
@@ -14,23 +15,10 @@ def get_current_position(line1, line2):
         if e != 0: 
             return None, None, None
         
-        x, y, z = r
-        r_mag = math.sqrt(x*x + y*y + z*z)
+        lat, lon, alt_km = teme_to_geodetic(np.array(r), jd, fr)
+        alt = float(alt_km) * 1000  # km to meters
         
-        # Fast math
-        lat = math.degrees(math.asin(z / r_mag))
-        
-        t_diff = (now - datetime(2000, 1, 1, 12, 0, 0, tzinfo=timezone.utc)).total_seconds()
-        gmst_deg = (280.46061837 + 360.98564736629 * (t_diff / 86400.0)) % 360
-        ra = math.degrees(math.atan2(y, x))
-        lon = (ra - gmst_deg) % 360
-        
-        if lon > 180: 
-            lon -= 360
-            
-        alt = (r_mag - 6371) * 1000  # km to meters
-        
-        return lat, lon, alt
+        return float(lat), float(lon), alt
         
     except:
         return None, None, None
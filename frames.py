@@ -0,0 +1,80 @@
+"""Vectorized reference-frame conversions: TEME -> ECEF -> WGS84 geodetic"""
+import numpy as np
+
+J2000_JD = 2451545.0
+R_EARTH_KM = 6371.0  # Mean radius used by the spherical mode
+
+# WGS84 ellipsoid
+WGS84_A = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+WGS84_EP2 = WGS84_E2 / (1 - WGS84_E2)
+
+
+def gmst(jd, fr=0.0):
+    """Greenwich mean sidereal time in radians (IAU-82, as used by SGP4)"""
+    tut1 = ((np.asarray(jd, dtype=np.float64) - J2000_JD) + fr) / 36525.0
+    seconds = (-6.2e-6 * tut1 ** 3 + 0.093104 * tut1 ** 2
+               + (876600.0 * 3600 + 8640184.812866) * tut1 + 67310.54841)
+    return np.radians(seconds / 240.0) % (2 * np.pi)
+
+
+def teme_to_ecef(r, jd, fr=0.0):
+    """
+    Rotate TEME position vectors into the Earth-fixed frame.
+
+    Args:
+        r: (..., T, 3) positions in km; the last time axis lines up with jd/fr
+        jd, fr: (T,) Julian date split, or scalars
+    """
+    r = np.asarray(r, dtype=np.float64)
+    theta = gmst(jd, fr)
+    c, s = np.cos(theta), np.sin(theta)
+    x, y, z = r[..., 0], r[..., 1], r[..., 2]
+    return np.stack((c * x + s * y, -s * x + c * y, z), axis=-1)
+
+
+def ecef_to_geodetic(r_ecef, ellipsoid=True):
+    """
+    Earth-fixed positions (km) to lat/lon in degrees and altitude in km.
+
+    ellipsoid=True solves for WGS84 geodetic latitude with two Bowring
+    iterations (sub-metre for LEO through GEO). ellipsoid=False uses a
+    sphere of radius R_EARTH_KM, which is cheaper but off by up to ~0.2 deg
+    in latitude and ~20 km in altitude.
+    """
+    x, y, z = r_ecef[..., 0], r_ecef[..., 1], r_ecef[..., 2]
+    p = np.hypot(x, y)
+    lon = np.degrees(np.arctan2(y, x))
+
+    if not ellipsoid:
+        r_mag = np.sqrt(p * p + z * z)
+        return np.degrees(np.arctan2(z, p)), lon, r_mag - R_EARTH_KM
+
+    beta = np.arctan2(z * WGS84_A, p * WGS84_B)
+    for _ in range(2):
+        lat = np.arctan2(z + WGS84_EP2 * WGS84_B * np.sin(beta) ** 3,
+                         p - WGS84_E2 * WGS84_A * np.cos(beta) ** 3)
+        beta = np.arctan2((1 - WGS84_F) * np.sin(lat), np.cos(lat))
+
+    sin_lat = np.sin(lat)
+    alt = p * np.cos(lat) + z * sin_lat - WGS84_A * np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+    return np.degrees(lat), lon, alt
+
+
+def teme_to_geodetic(r, jd, fr=0.0, ellipsoid=True):
+    """TEME positions (km) at the given times to lat/lon (degrees) and altitude (km)"""
+    return ecef_to_geodetic(teme_to_ecef(r, jd, fr), ellipsoid=ellipsoid)
+
+
+def geodetic_to_ecef(lat, lon, alt_km=0.0):
+    """WGS84 lat/lon (degrees) and altitude (km) to Earth-fixed positions in km"""
+    lat_r, lon_r = np.radians(lat), np.radians(lon)
+    sin_lat = np.sin(lat_r)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+    return np.stack((
+        (n + alt_km) * np.cos(lat_r) * np.cos(lon_r),
+        (n + alt_km) * np.cos(lat_r) * np.sin(lon_r),
+        (n * (1 - WGS84_E2) + alt_km) * sin_lat,
+    ), axis=-1)
@@ -0,0 +1,244 @@
+"""Manifest + position update encodings for the globe: quantized varint deltas or columnar base64 buffers"""
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Quantization steps: 0.01 deg (~1 km) for lat/lng, 1e-4 globe radii for altitude
+LATLNG_SCALE = 100
+ALT_SCALE = 10000
+
+# Varint alphabet: each char carries 5 value bits plus a continuation bit (32)
+VARINT_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+_ALPHABET_BYTES = np.frombuffer(VARINT_ALPHABET.encode(), dtype=np.uint8)
+
+
+def manifest_key(filters, ids):
+    """Deterministic key (identical across worker processes) for a selection"""
+    h = hashlib.sha1(repr(filters).encode())
+    h.update('\x00'.join(ids).encode())
+    return h.hexdigest()[:16]
+
+
+def b64_array(values, dtype):
+    """Little-endian typed buffer as base64, for zero-copy JS typed array views"""
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode('ascii')
+
+
+def _categorical(values):
+    """Index-coded categorical column: {'labels': [...], 'codes': base64 Int16/Int32, 'dtype'}"""
+    labels, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    dtype = 'int16' if len(labels) < 2 ** 15 else 'int32'
+    return {'labels': labels.tolist(), 'codes': b64_array(codes, '<i2' if dtype == 'int16' else '<i4'), 'dtype': dtype}
+
+
+def build_manifest(key, ids, names, owners, types, colors, columnar=False):
+    """
+    Static per-selection data, sent only when the selection changes.
+    columnar=True index-codes owners/types/colors against label tables.
+    """
+    if columnar:
+        return {
+            'key': key,
+            'format': 'columnar',
+            'ids': list(ids),
+            'names': list(names),
+            'owners': _categorical(owners),
+            'types': _categorical(types),
+            'colors': _categorical(colors),
+        }
+    return {
+        'key': key,
+        'ids': list(ids),
+        'names': list(names),
+        'owners': list(owners),
+        'types': list(types),
+        'colors': list(colors),
+    }
+
+
+def delta2(q):
+    """
+    Second-order delta along the time axis: first value, first difference,
+    then differences of differences. Smooth orbital tracks collapse to
+    small integers, which keeps the JSON short. Undone by two running sums.
+    """
+    out = q.copy()
+    if q.shape[-1] > 1:
+        out[..., 1:] = np.diff(q, axis=-1)
+    if q.shape[-1] > 2:
+        out[..., 2:] = np.diff(out[..., 1:], axis=-1)
+    return out
+
+
+def pack_varints(values):
+    """
+    Signed ints -> compact ASCII: zigzag-encoded, then 5 bits per char,
+    least significant group first, with bit 32 set on all but the last
+    char of a number. Small deltas take one char and need no separator.
+    """
+    v = np.asarray(values, dtype=np.int64).ravel()
+    if not len(v):
+        return ''
+    z = ((v << 1) ^ (v >> 63)).astype(np.uint64)
+    n_groups = 13  # ceil(64 / 5)
+    shifts = np.arange(n_groups, dtype=np.uint64) * np.uint64(5)
+    chunks = (z[:, None] >> shifts) & np.uint64(31)
+    used = np.ones(len(z), dtype=np.int64)
+    for k in range(1, n_groups):
+        used += (z >> shifts[k]) > 0
+    k = np.arange(n_groups)
+    codes = chunks.astype(np.uint8) | np.where(k < (used[:, None] - 1), 32, 0).astype(np.uint8)
+    return _ALPHABET_BYTES[codes[k < used[:, None]]].tobytes().decode('ascii')
+
+
+def unpack_varints(text):
+    """Inverse of pack_varints (reference for the clientside decoder)"""
+    out, z, shift = [], 0, 0
+    for ch in text:
+        c = VARINT_ALPHABET.index(ch)
+        z |= (c & 31) << shift
+        if c & 32:
+            shift += 5
+            continue
+        out.append((z >> 1) ^ -(z & 1))
+        z, shift = 0, 0
+    return out
+
+
+def quantize_tracks(lat, lng, alt):
+    """
+    (N, T) float tracks -> (N, 3, T) int64 quantized tracks. Longitude is
+    unwrapped first so antimeridian crossings don't produce 360-degree jumps
+    (the client wraps it back into [-180, 180)).
+    """
+    lng = np.rad2deg(np.unwrap(np.deg2rad(lng), axis=-1))
+    return np.stack([
+        np.rint(lat * LATLNG_SCALE),
+        np.rint(lng * LATLNG_SCALE),
+        np.rint(alt * ALT_SCALE),
+    ], axis=1).astype(np.int64)
+
+
+def row_digests(q):
+    """One int64 checksum per satellite row of quantized tracks, to detect changes"""
+    flat = q.reshape(len(q), -1)
+    weights = np.random.default_rng(0x5a7).integers(1, 2 ** 31, flat.shape[1], dtype=np.int64)
+    return (flat * weights).sum(axis=1)
+
+
+class DeltaEncoder:
+    """
+    Encodes position updates against a manifest. Remembers the row digests
+    of recent (manifest key, view, snapshot) frames, so a client reporting
+    what it last applied only receives the satellites whose quantized track
+    changed. The view (the LOD camera) is part of the key because the same
+    snapshot yields different rows per camera.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._digests = OrderedDict()  # (key, view, computed_at) -> {manifest row: digest}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _view_key(view):
+        # Views arrive as tuples from the server and as JSON lists from the client
+        return tuple(view) if view is not None else None
+
+    def _remember(self, key, view, computed_at, rows, digests):
+        state = (key, self._view_key(view), computed_at)
+        with self._lock:
+            self._digests[state] = dict(zip(rows.tolist(), digests.tolist()))
+            self._digests.move_to_end(state)
+            while len(self._digests) > self.maxsize:
+                self._digests.popitem(last=False)
+
+    def _previous(self, key, view, computed_at):
+        with self._lock:
+            return self._digests.get((key, self._view_key(view), computed_at))
+
+    def encode(self, key, computed_at, rows, lat, lng, alt, t0=None, step_ms=None, since=None,
+               transport='delta', dtype='int16', view=None):
+        """
+        Args:
+            key: manifest key the rows refer to
+            computed_at: snapshot time the positions come from
+            rows: (N,) indices into the manifest
+            lat, lng, alt: (N, T) tracks (T=1 for a single position)
+            since: the client's last applied {'key', 'view', 'computed_at'}, if any
+            transport: 'delta' (varint strings) or 'columnar' (typed buffers)
+            dtype: columnar sample type, 'int16' (quantized) or 'float32'
+            view: what selected the rows (the LOD camera), echoed back by the client
+
+        Returns:
+            Update dict: i (manifest rows) and lat/lng/alt with T samples per
+            row, row after row, plus full=True when the client must drop rows
+            it holds that are not in i. With transport='delta' the samples are
+            second-order deltas packed with pack_varints; with 'columnar' they
+            are base64 little-endian buffers (see encode_columnar).
+        """
+        lat, lng, alt = (np.asarray(a, dtype=float) for a in (lat, lng, alt))
+        q = quantize_tracks(lat, lng, alt)
+        digests = row_digests(q)
+
+        # Compare against the client's state before this frame is remembered
+        full = True
+        previous = None
+        if since and since.get('key') == key:
+            previous = self._previous(key, since.get('view'), since.get('computed_at'))
+        self._remember(key, view, computed_at, rows, digests)
+        if previous is not None and set(previous) == set(rows.tolist()):
+            full = False
+            changed = np.array([previous.get(r) != d for r, d in zip(rows.tolist(), digests.tolist())], dtype=bool)
+            rows, q = rows[changed], q[changed]
+            lat, lng, alt = lat[changed], lng[changed], alt[changed]
+
+        if transport == 'columnar':
+            return dict(encode_columnar(rows, lat, lng, alt, dtype), key=key, view=self._view_key(view),
+                        computed_at=computed_at, full=full, t0=t0, step_ms=step_ms)
+
+        d = delta2(q)
+        return {
+            'key': key,
+            'view': self._view_key(view),
+            'computed_at': computed_at,
+            'full': full,
+            't0': t0,
+            'step_ms': step_ms,
+            'T': int(q.shape[-1]),
+            'scale': [LATLNG_SCALE, ALT_SCALE],
+            'i': rows.tolist(),
+            'lat': pack_varints(d[:, 0]),
+            'lng': pack_varints(d[:, 1]),
+            'alt': pack_varints(d[:, 2]),
+        }
+
+
+def encode_columnar(rows, lat, lng, alt, dtype='int16'):
+    """
+    Columnar update body: i as a base64 Int32 buffer and lat/lng/alt as
+    base64 (N*T) buffers of Int16 samples (multiplied by scale; lng stays in
+    [-180, 180)) or raw Float32. The client views them as typed arrays.
+    """
+    if dtype == 'float32':
+        fields = {'lat': b64_array(lat, '<f4'), 'lng': b64_array(lng, '<f4'), 'alt': b64_array(alt, '<f4')}
+        scale = [1, 1]
+    else:
+        fields = {
+            'lat': b64_array(np.rint(lat * LATLNG_SCALE), '<i2'),
+            'lng': b64_array(np.rint(((lng + 180.0) % 360.0 - 180.0) * LATLNG_SCALE), '<i2'),
+            'alt': b64_array(np.rint(alt * ALT_SCALE), '<i2'),
+        }
+        scale = [LATLNG_SCALE, ALT_SCALE]
+    return dict(fields, format='columnar', dtype=dtype, scale=scale, T=int(np.shape(lat)[-1]),
+                i=b64_array(rows, '<i4'))
+
+
+# Process-wide encoder shared by the globe store callback
+_delta_encoder = DeltaEncoder()
+
+
+def get_delta_encoder():
+    return _delta_encoder
@@ -0,0 +1,74 @@
+"""Ground-track generation over a (satellites x timesteps) propagation grid"""
+import numpy as np
+from datetime import datetime, timezone
+from utils.propagation import BatchPropagator, epochs_from_now
+
+
+def split_antimeridian(lats, lons):
+    """
+    Split one track into segments that never jump across lon = +/-180.
+    A point is interpolated on the meridian at each crossing so the pieces
+    meet at the map edge. NaN samples (propagation errors) also break the line.
+
+    Returns:
+        List of (lats, lons) array pairs
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    ok = np.isfinite(lats) & np.isfinite(lons)
+
+    segments = []
+    for run in np.split(np.arange(len(lats)), np.flatnonzero(np.diff(ok.astype(np.int8))) + 1):
+        if len(run) < 2 or not ok[run[0]]:
+            continue
+        la, lo = lats[run], lons[run]
+        jumps = np.flatnonzero(np.abs(np.diff(lo)) > 180.0)
+        start = 0
+        head_lat, head_lon = [], []
+        for j in jumps:
+            edge = 180.0 if lo[j] > 0 else -180.0
+            unwrapped = lo[j + 1] + 2 * edge
+            t = (edge - lo[j]) / (unwrapped - lo[j])
+            cross_lat = la[j] + t * (la[j + 1] - la[j])
+            segments.append((np.r_[head_lat, la[start:j + 1], cross_lat],
+                             np.r_[head_lon, lo[start:j + 1], edge]))
+            head_lat, head_lon = [cross_lat], [-edge]
+            start = j + 1
+        segments.append((np.r_[head_lat, la[start:]], np.r_[head_lon, lo[start:]]))
+    return segments
+
+
+def ground_tracks(propagator, duration_min=90, step_min=5, start=None):
+    """
+    Propagate every satellite in one vectorized pass over a time grid and
+    return its ground track.
+
+    Args:
+        propagator: BatchPropagator, or a catalog DataFrame with TLE columns
+        duration_min: Length of the window in minutes
+        step_min: Spacing between samples in minutes
+        start: UTC datetime for the start of the window (defaults to now)
+
+    Returns:
+        List (one entry per satellite, in input order) of segment lists as
+        produced by split_antimeridian
+    """
+    if not isinstance(propagator, BatchPropagator):
+        propagator = BatchPropagator.from_dataframe(propagator)
+
+    offsets = np.arange(0, duration_min + step_min / 2, step_min)
+    jd, fr = epochs_from_now(offsets, now=start or datetime.now(timezone.utc))
+    lats, lons, _ = propagator.positions(jd, fr)
+    return [split_antimeridian(la, lo) for la, lo in zip(lats, lons)]
+
+
+def flatten_tracks(tracks):
+    """Join track segments into flat lat/lon lists with None separators for a single Plotly trace"""
+    flat_lats, flat_lons = [], []
+    for segments in tracks:
+        for la, lo in segments:
+            flat_lats.extend(la.tolist())
+            flat_lats.append(None)
+            flat_lons.extend(lo.tolist())
+            flat_lons.append(None)
+    return flat_lats, flat_lons
@@ -0,0 +1,92 @@
+"""Batched ingestion of Launch Library 2 payloads into the launches DB"""
+import logging
+
+CHUNK = 500  # Stay well under SQLite's bound-parameter limit
+
+
+def normalize_launch(l, upcoming=False):
+    """
+    Flatten one LL2 launch record into (agency, pad, launch) row tuples.
+    Raises ValueError if the record cannot be keyed.
+    """
+    a = l.get('launch_service_provider') or {}
+    p = l.get('pad') or {}
+    m = l.get('mission') or {}
+    r = l.get('rocket') or {}
+
+    if not l.get('id') or a.get('id') is None or p.get('id') is None:
+        raise ValueError("launch, agency and pad ids are required")
+
+    agency = (a.get('id'), a.get('name', 'Unk'), a.get('type', 'Unk'), a.get('country_code', 'UN'))
+    pad = (p.get('id'), p.get('name', 'Unk'), p.get('latitude', 0), p.get('longitude', 0),
+           (p.get('location') or {}).get('name', 'Unk'))
+    orbit = (m.get('orbit') or {}).get('abbrev', 'LEO') if m else 'LEO'
+    vids = l.get('vidURLs') or []
+    launch = (l.get('id'), l.get('name', 'Unk'), orbit, a.get('id'), p.get('id'), l.get('net', 'Unk'),
+              (l.get('status') or {}).get('name', 'Unk'), (r.get('configuration') or {}).get('name', 'Unk'),
+              m.get('description', 'No desc') if m else 'No desc', l.get('image', ''),
+              vids[0].get('url', '') if vids else '', 1 if upcoming else 0)
+    return agency, pad, launch
+
+
+def normalize(data, upcoming=False):
+    """Normalize a list of LL2 records; returns (agencies, pads, launches, rejected)"""
+    agencies, pads, launches = {}, {}, {}
+    rejected = 0
+    for l in data:
+        try:
+            agency, pad, launch = normalize_launch(l, upcoming)
+        except (ValueError, AttributeError, TypeError, IndexError) as e:
+            logging.debug(f"Rejected launch record {l.get('id') if isinstance(l, dict) else l!r}: {e}")
+            rejected += 1
+            continue
+        agencies[agency[0]] = agency
+        pads[pad[0]] = pad
+        launches[launch[0]] = launch
+    return list(agencies.values()), list(pads.values()), list(launches.values()), rejected
+
+
+def _existing_ids(conn, table, ids):
+    found = set()
+    for i in range(0, len(ids), CHUNK):
+        chunk = ids[i:i + CHUNK]
+        found.update(r[0] for r in conn.execute(
+            f"SELECT id FROM {table} WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+    return found
+
+
+def ingest(conn, data, upcoming=False):
+    """
+    Write a batch of LL2 launches with executemany UPSERTs in one transaction.
+    Pad launch counters are recomputed for the pads touched by the batch.
+
+    Returns:
+        Dict with inserted, updated and rejected launch counts
+    """
+    agencies, pads, launches, rejected = normalize(data, upcoming)
+
+    with conn:
+        existing = _existing_ids(conn, 'launches', [row[0] for row in launches])
+
+        conn.executemany("""INSERT INTO agencies VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET name = excluded.name, type = excluded.type,
+                country = excluded.country""", agencies)
+
+        conn.executemany("""INSERT INTO pads VALUES (?, ?, ?, ?, ?, 0)
+            ON CONFLICT(id) DO UPDATE SET name = excluded.name, lat = excluded.lat,
+                lon = excluded.lon, loc = excluded.loc""", pads)
+
+        conn.executemany("""INSERT INTO launches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET name = excluded.name, orbit = excluded.orbit,
+                agency_id = excluded.agency_id, pad_id = excluded.pad_id, date = excluded.date,
+                status = excluded.status, rocket = excluded.rocket, desc = excluded.desc,
+                img = excluded.img, vid = excluded.vid, upcoming = excluded.upcoming""", launches)
+
+        conn.executemany("""UPDATE pads SET cnt = (SELECT COUNT(*) FROM launches WHERE pad_id = pads.id)
+            WHERE id = ?""", [(row[0],) for row in pads])
+
+    return {
+        'inserted': len(launches) - len(existing),
+        'updated': len(existing),
+        'rejected': rejected,
+    }
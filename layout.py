@@ -1,6 +1,7 @@
 """Main dashboard layout - Deep Space Mission Control"""
 
 from dash import dcc, html
+from config.settings import Config
 from ui.styles import (
     GLASS,
     COLORS,
@@ -13,7 +14,9 @@ from ui.styles import (
     DATA_VALUE_STYLE,
     DATA_LABEL_STYLE,
     DIVIDER_STYLE,
+    INPUT_FIELD,
 )
+from ui.telemetry_panel import create_pass_prediction_panel
 
 def create_layout(db, stats, orbits):
     """Create the main Dash layout with Deep Space theme and Dual Panels"""
@@ -27,8 +30,16 @@ def create_layout(db, stats, orbits):
             "fontFamily": "'Inter', 'Segoe UI', system-ui, sans-serif",
         },
         children=[
-            # Storage for satellite data - used by callbacks
-            dcc.Store(id="satellite-store", data=[]),
+            # Globe protocol: static manifest per selection, position deltas, and what the browser has applied
+            dcc.Store(id="globe-manifest"),
+            dcc.Store(id="chat-store"),
+            dcc.Store(id="globe-sync"),
+            dcc.Store(id="globe-camera"),  # Camera reported by the browser, drives LOD
+
+            # Globe timeline: browser-side interpolation tick and server resampling before the horizon runs out
+            dcc.Interval(id="timeline-tick", interval=1000, n_intervals=0),
+            dcc.Interval(id="timeline-refresh", interval=Config.TIMELINE_HORIZON_MIN * 60 * 1000 // 2, n_intervals=0),
+            html.Div(id="timeline-render-signal", style={"display": "none"}),
 
             # --- CENTRAL MAP CONTAINER ---
             # This Div receives the Plotly Graph from map_callbacks.py
@@ -145,5 +156,48 @@ def create_layout(db, stats, orbits):
                     ),
                 ],
             ),
+
+            # ============================================================================
+            # PASS PREDICTION PANEL - Bottom Left
+            # ============================================================================
+            html.Div(
+                id="telemetry-panel-container",
+                style={**GLASS, "bottom": "20px", "left": "20px", "width": "300px", "zIndex": 10},
+                children=[
+                    html.Div(
+                        style={
+                            "display": "flex",
+                            "justifyContent": "space-between",
+                            "alignItems": "center",
+                            "marginBottom": "15px",
+                        },
+                        children=[
+                            html.Div("📡 GROUND STATION", style={**HEADER_STYLE}),
+                            html.Button("−", id="minimize-telemetry", n_clicks=0, style={**BUTTON_GHOST}),
+                        ],
+                    ),
+                    html.Hr(style={**DIVIDER_STYLE}),
+                    html.Div(
+                        id="telemetry-content",
+                        children=[
+                            html.Label("TARGET ASSET", style={**SUBHEADER_STYLE}),
+                            # Options follow the filter selection (chat_callbacks.py)
+                            dcc.Dropdown(
+                                id="pass-satellite",
+                                placeholder="Select a satellite",
+                                style={**DROPDOWN_STYLE, "marginBottom": "18px"},
+                            ),
+                            html.Label("OBSERVER LAT / LNG", style={**SUBHEADER_STYLE}),
+                            html.Div([
+                                dcc.Input(id="observer-lat", type="number", min=-90, max=90, step=0.0001,
+                                          value=Config.OBSERVER_LAT, debounce=True, style={**INPUT_FIELD}),
+                                dcc.Input(id="observer-lng", type="number", min=-180, max=180, step=0.0001,
+                                          value=Config.OBSERVER_LNG, debounce=True, style={**INPUT_FIELD}),
+                            ], style={"display": "flex", "gap": "8px"}),
+                            create_pass_prediction_panel(),
+                        ],
+                    ),
+                ],
+            ),
         ],
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,92 @@
+"""Level of detail for the 3D globe: hemisphere culling, per-cell density limits and zoom-based track sampling"""
+import numpy as np
+from config.settings import Config
+from utils.frames import R_EARTH_KM
+from utils.orbit_utlis import adaptive_orbit_sampling
+
+
+def normalize_camera(camera):
+    """
+    Camera reported by the browser ({lat, lng, altitude} as in globe.gl's
+    pointOfView, altitude in globe radii) snapped to a coarse grid, so
+    small camera moves reuse cached frames. None when no camera is known.
+    """
+    if not camera or camera.get('altitude') is None:
+        return None
+    snap = Config.LOD_CAMERA_SNAP_DEG
+    return (
+        round(float(camera.get('lat', 0.0)) / snap) * snap,
+        round(float(camera.get('lng', 0.0)) / snap) * snap,
+        round(max(float(camera['altitude']), 0.05), 1),
+    )
+
+
+def zoom_level(altitude):
+    """1.0 at the default globe view, growing as the camera moves in"""
+    return Config.LOD_REFERENCE_ALTITUDE / max(altitude, 1e-3)
+
+
+def _unit(lat, lng):
+    lat_r, lng_r = np.radians(lat), np.radians(lng)
+    return np.stack([np.cos(lat_r) * np.cos(lng_r), np.cos(lat_r) * np.sin(lng_r), np.sin(lat_r)], axis=-1)
+
+
+def visible_mask(lat, lng, alt_km, camera):
+    """
+    Satellites not hidden behind the Earth for a camera (lat, lng, altitude).
+    A point is hidden when it lies behind the limb plane of the camera and
+    inside the Earth's silhouette; LOD_HORIZON_MARGIN widens the visible
+    side so objects about to rise stay in the payload.
+    """
+    cam_lat, cam_lng, altitude = camera
+    cam = _unit(cam_lat, cam_lng)
+    d = 1.0 + altitude  # camera distance in Earth radii
+    p = _unit(lat, lng) * (1.0 + np.asarray(alt_km, dtype=float) / R_EARTH_KM)[..., None]
+    along = p @ cam
+    off_axis = np.linalg.norm(p - along[..., None] * cam, axis=-1)
+    return (along >= 1.0 / d - Config.LOD_HORIZON_MARGIN) | (off_axis >= 1.0)
+
+
+def thin_by_cell(lat, lng, zoom, max_per_cell=None):
+    """
+    Spatial bucketing: lat/lng cells shrink as zoom grows, and only the first
+    max_per_cell satellites (in input order) of each cell are kept.
+
+    Returns:
+        Sorted indices of the kept satellites
+    """
+    max_per_cell = max_per_cell or Config.LOD_MAX_PER_CELL
+    cell_deg = Config.LOD_CELL_DEG / max(zoom, 1.0)
+    n_cols = int(np.ceil(360.0 / cell_deg))
+    cells = (np.floor((np.asarray(lat) + 90.0) / cell_deg).astype(np.int64) * n_cols
+             + np.floor((np.asarray(lng) + 180.0) / cell_deg).astype(np.int64))
+
+    order = np.argsort(cells, kind='stable')
+    sorted_cells = cells[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(cells)]))
+    rank = np.arange(len(cells)) - group_start
+    return np.sort(order[rank < max_per_cell])
+
+
+def select_visible(lat, lng, alt_km, camera):
+    """
+    LOD pipeline for one frame: cull the far hemisphere, then thin dense
+    cells at the camera's zoom. Returns indices into the inputs (all of
+    them when no camera has been reported yet).
+    """
+    if camera is None:
+        return np.arange(len(lat))
+    idx = np.flatnonzero(visible_mask(lat, lng, alt_km, camera))
+    keep = thin_by_cell(np.asarray(lat)[idx], np.asarray(lng)[idx], zoom_level(camera[2]))
+    return idx[keep]
+
+
+def track_stride(camera, step_s, horizon_min):
+    """
+    Timeline samples to skip for the camera's zoom: the global view gets
+    coarser tracks, zoomed-in views the full timeline resolution.
+    """
+    zoom = zoom_level(camera[2]) if camera is not None else 1.0
+    interval_s = adaptive_orbit_sampling(horizon_min, zoom)
+    return max(1, int(round(interval_s / step_s)))
@@ -1,9 +1,17 @@
 import plotly.graph_objects as go
 import pandas as pd
-import math
+import numpy as np
 from datetime import datetime, timezone
-from sgp4.api import Satrec, WGS72
 from sgp4.conveniences import jday
+from utils.propagation import BatchPropagator
+from utils.tle_cache import get_satrec
+from utils.frames import teme_to_geodetic
+from utils.ground_tracks import ground_tracks, flatten_tracks
+from utils.response_cache import get_response_cache, normalize_filters
+from utils.position_service import get_position_service
+from utils.timeline import interpolate_timeline
+
+MAX_GROUND_TRACKS = 300
 
 def get_current_position(line1, line2, time_offset_min=0):
     """
@@ -11,7 +19,7 @@ def get_current_position(line1, line2, time_offset_min=0):
     Added 'time_offset_min' to project future positions for launch lines.
     """
     try:
-        satellite = Satrec.twoline2rv(line1, line2)
+        satellite = get_satrec(line1, line2)
         # Apply the time offset for trajectory projection
         now = datetime.now(timezone.utc) + pd.Timedelta(minutes=time_offset_min)
         jd, fr = jday(now.year, now.month, now.day, now.hour, now.minute, now.second)
@@ -19,23 +27,22 @@ def get_current_position(line1, line2, time_offset_min=0):
         e, r, v = satellite.sgp4(jd, fr)
         if e != 0: return None, None 
 
-        x, y, z = r
-        r_mag = math.sqrt(x**2 + y**2 + z**2)
-        
-        lat = math.degrees(math.asin(z / r_mag))
-        
-        t_diff = (now - datetime(2000, 1, 1, 12, 0, 0, tzinfo=timezone.utc)).total_seconds()
-        gmst_deg = (280.46061837 + 360.98564736629 * (t_diff / 86400.0)) % 360
-        ra = math.degrees(math.atan2(y, x))
-        lon = (ra - gmst_deg) % 360
-        if lon > 180: lon -= 360
+        lat, lon, _ = teme_to_geodetic(np.array(r), jd, fr)
         
-        return lat, lon
+        return float(lat), float(lon)
     except Exception:
         return None, None
 
 def gen_map(db, selected_agency='All', selected_orbit='All', search_query='', selected_types=None):
-    """3D Satellite Map with TLE Propagation and Launch Lines."""
+    """
+    3D Satellite Map with TLE Propagation and Launch Lines.
+    Identical filters within one cache time bucket share one figure (do not mutate it).
+    """
+    filters = normalize_filters(selected_agency, selected_orbit, search_query, selected_types)
+    return get_response_cache().get_or_compute(
+        'gen_map', filters, lambda: _gen_map(db, selected_agency, selected_orbit, search_query, selected_types))
+
+def _gen_map(db, selected_agency='All', selected_orbit='All', search_query='', selected_types=None):
     geo_layout = dict(
     projection_type='orthographic',
     showland=True,
@@ -53,61 +60,46 @@ def gen_map(db, selected_agency='All', selected_orbit='All', search_query='', se
 )
 
     try:
-        df = db.get_data()
-        if df is None or df.empty:
+        catalog = db.get_catalog()
+        if catalog is None or not len(catalog) or not catalog.has_tles:
             return go.Figure().update_layout(geo=geo_layout, paper_bgcolor='#000000')
 
-        # 1. Calculate Current Positions
-        lats, lons = [], []
-        if 'TLE_LINE1' in df.columns and 'TLE_LINE2' in df.columns:
-            for index, row in df.iterrows():
-                lat, lon = get_current_position(row['TLE_LINE1'], row['TLE_LINE2'])
-                lats.append(lat)
-                lons.append(lon)
-            
-            df['calc_lat'] = lats
-            df['calc_lon'] = lons
-            df = df.dropna(subset=['calc_lat', 'calc_lon'])
-        else:
-            return go.Figure().update_layout(geo=geo_layout, paper_bgcolor='#000000')
+        # 1. Filter to catalog rows (index arrays, no DataFrame copy)
+        rows = catalog.select(selected_agency, selected_orbit, selected_types)
+        if search_query:
+            needle = search_query.lower()
+            rows = rows[np.array([needle in name.lower() for name in catalog.names[rows]], dtype=bool)]
 
-        # [Filtering logic remains the same...]
-        # (Assuming your filters for agency, orbit, etc., stay here)
-        name_col = next((c for c in df.columns if 'name' in c.lower()), df.columns[0])
+        # 2. Current positions from the shared snapshot (its rows follow catalog rows)
+        snapshot = get_position_service(db).snapshot()
+        rows = rows[rows < len(snapshot.ids)]
+        lats, lons, _ = interpolate_timeline(snapshot.timeline)
+        ok = np.isfinite(lats[rows]) & np.isfinite(lons[rows])
+        rows = rows[ok]
+        names = catalog.names[rows]
 
-        # 2. Initialize Figure
+        # 3. Initialize Figure
         fig = go.Figure()
 
-        # 3. ADD LAUNCH LINES (Ground Tracks)
-        # We'll plot paths for the first 15 satellites to maintain performance
-        for index, row in df.head(3).iterrows():
-            path_lats, path_lons = [], []
-            # Calculate 20 points for the next 90 minutes
-            for minutes in range(0, 91, 5): 
-                p_lat, p_lon = get_current_position(row['TLE_LINE1'], row['TLE_LINE2'], time_offset_min=minutes)
-                if p_lat is not None:
-                    path_lats.append(p_lat)
-                    path_lons.append(p_lon)
-            
-            # Add the line trace
-            fig.add_trace(go.Scattergeo(
-                lon=path_lons,
-                lat=path_lats,
-                mode='lines',
-                line=dict(width=1.5, color='#00f3ff'),
-                opacity=0.3, # Faded "vector" look
-                hoverinfo='none'
-            ))
-
-        # 4. ADD SATELLITE MARKERS (The glowing nodes)
-# Inside gen_map, find the name column dynamically
-
+        # 4. ADD LAUNCH LINES (Ground Tracks)
+        # Whole (satellites x timesteps) grid in one propagation pass, one trace
+        tracked = rows[:MAX_GROUND_TRACKS]
+        track_lats, track_lons = flatten_tracks(ground_tracks(
+            BatchPropagator(catalog.line1[tracked], catalog.line2[tracked]), duration_min=90, step_min=5))
+        fig.add_trace(go.Scattergeo(
+            lon=track_lons,
+            lat=track_lats,
+            mode='lines',
+            line=dict(width=1.5, color='#00f3ff'),
+            opacity=0.3, # Faded "vector" look
+            hoverinfo='none'
+        ))
 
-# ADD SATELLITE MARKERS
-            fig.add_trace(go.Scattergeo(
-                lon = df['calc_lon'],
-                lat = df['calc_lat'],
-                hovertext = df[name_col], # This ensures the name pops up
+        # 5. ADD SATELLITE MARKERS (The glowing nodes)
+        fig.add_trace(go.Scattergeo(
+            lon = lons[rows],
+            lat = lats[rows],
+            hovertext = names,        # This ensures the name pops up
             hoverinfo = 'text',       # Tells Plotly to only show the text we provided
             mode = 'markers',
             marker = dict(
@@ -115,8 +107,8 @@ def gen_map(db, selected_agency='All', selected_orbit='All', search_query='', se
                 color = '#00f3ff', 
                 symbol = 'circle',
                 line = dict(width=1, color='white')
-                )
-            ))
+            )
+        ))
 
         fig.update_layout(
             geo=geo_layout,
@@ -1,12 +1,14 @@
 import plotly.graph_objects as go
 import numpy as np
-import requests
+import pandas as pd
 from dash import Input, Output, dcc, html
 import random
+from config.settings import Config
+from utils.wireframe import world_wireframe
+from utils.response_cache import get_response_cache, normalize_filters
 
 # Core Geometry
 R_EARTH = 6371
-GEOJSON_URL = "https://raw.githubusercontent.com/johan/world.geo.json/master/countries.geo.json"
 
 SPACEPORTS = {
     "NASA": {"lat": 28.57, "lon": -80.64, "color": "#00f3ff", "pad": "Kennedy Space Center"},
@@ -22,6 +24,68 @@ def lat_lon_to_xyz(lat, lon, radius):
     phi = np.radians(90 - lat); theta = np.radians(lon)
     return (radius * np.sin(phi) * np.cos(theta), radius * np.sin(phi) * np.sin(theta), radius * np.cos(phi))
 
+def mission_beam_traces(df):
+    """
+    Batched beam rendering: every beam of a color shares one line trace
+    (segments separated by NaN gaps) and all tips share one marker trace whose
+    hover text rides in customdata. Trace count no longer grows with the
+    number of satellites.
+    """
+    n = len(df)
+    if n == 0:
+        return []
+    names = df.get("Name of Satellite, Alternate Names", pd.Series(["Asset"] * n)).fillna("Asset").astype(str).to_numpy()
+    owners = df.get("Owner", pd.Series(["International"] * n)).fillna("International").astype(str).str.upper().to_numpy()
+    geo = df.get("Class of Orbit", pd.Series([""] * n)).astype(str).str.upper().str.contains("GEO").to_numpy()
+
+    port_keys = list(SPACEPORTS.keys())
+    sites = [SPACEPORTS[next((k for k in SPACEPORTS if k.upper() in owner), port_keys[i % (len(port_keys)-1)])]
+             for i, owner in enumerate(owners)]
+
+    i = np.arange(n)
+    j_lat = np.array([s["lat"] for s in sites]) + np.sin(i) * 3.8
+    j_lon = np.array([s["lon"] for s in sites]) + np.cos(i) * 3.8
+    h = np.where(geo, 45000, 15000)
+    sx, sy, sz = lat_lon_to_xyz(j_lat, j_lon, R_EARTH)
+    ex, ey, ez = lat_lon_to_xyz(j_lat, j_lon, R_EARTH + h)
+
+    traces = []
+    colors = np.array([s["color"] for s in sites])
+    for color in dict.fromkeys(colors):
+        k = np.flatnonzero(colors == color)
+        # start, end, gap per beam
+        x = np.column_stack([sx[k], ex[k], np.full(len(k), np.nan)]).ravel()
+        y = np.column_stack([sy[k], ey[k], np.full(len(k), np.nan)]).ravel()
+        z = np.column_stack([sz[k], ez[k], np.full(len(k), np.nan)]).ravel()
+        traces.append(go.Scatter3d(x=x, y=y, z=z, mode='lines', line=dict(color=str(color), width=5),
+                                   hoverinfo='skip', showlegend=False))
+
+    # --- BIG DATA TOOLTIP FIX ---
+    # We use <br> for spacing and <b> for emphasis
+    hover_intel = [
+        f"<span style='font-size: 14px; color: #ffffff;'><b>MISSION:</b> {name}</span><br>"
+        f"<span style='font-size: 12px; color: #00f3ff;'><b>AGENCY:</b> {owner}</span><br>"
+        f"<span style='font-size: 12px; color: #00f3ff;'><b>PAD:</b> {site['pad']}</span>"
+        for name, owner, site in zip(names, owners, sites)
+    ]
+    # Both beam ends stay hoverable, as with one trace per beam; only the tip is drawn
+    traces.append(go.Scatter3d(
+        x=np.column_stack([sx, ex]).ravel(), y=np.column_stack([sy, ey]).ravel(), z=np.column_stack([sz, ez]).ravel(),
+        mode='markers',
+        marker=dict(size=np.tile([0, 8], n), color='white'),
+        customdata=np.repeat(hover_intel, 2),
+        hovertemplate="%{customdata}<extra></extra>",
+        # This makes the box expand to fit the text
+        hoverlabel=dict(
+            bgcolor="rgba(0,0,0,0.9)",
+            bordercolor="#00f3ff",
+            font=dict(size=13, color="#00f3ff", family="Consolas"),
+            namelength=-1 # Stretches the box to full text length
+        ),
+        showlegend=False
+    ))
+    return traces
+
 def register(app, db):
     @app.callback(
         Output("globe-viz", "children"),
@@ -30,75 +94,34 @@ def register(app, db):
         Input("satellite-types", "value")
     )
     def update_big_label_globe(n, selected_agency, selected_types):
-        df = db.get_data() #
-        if df is None or df.empty: return []
+        # Figure JSON is shared by every request with the same filters in the same time bucket
+        figure = get_response_cache().get_or_compute(
+            "update_big_label_globe", normalize_filters(selected_agency, selected_types),
+            lambda: build_big_label_globe(selected_agency, selected_types), serialize=True)
+        if figure is None: return []
+        return dcc.Graph(figure=figure, style={"height": "100vh", "width": "100vw"}, config={'displayModeBar': False})
 
-        filtered_df = df.copy()
-        
-        # Filtering logic
-        if selected_agency and selected_agency != "All":
-            filtered_df = filtered_df[filtered_df['Owner'].astype(str).str.contains(selected_agency, case=False, na=False)]
-        
-        if selected_types:
-            pattern = '|'.join(selected_types)
-            filtered_df = filtered_df[filtered_df['Purpose'].str.contains(pattern, case=False, na=False)]
+    def build_big_label_globe(selected_agency, selected_types):
+        catalog = db.get_catalog()
+        if catalog is None or len(catalog) == 0: return None
+
+        # Filtering logic (index selection on the shared catalog, no frame copy)
+        filtered_df = catalog.view(catalog.select(selected_agency, types=selected_types, fuzzy_types=True))
 
         fig = go.Figure()
         
-        # --- ROBUST WIREFRAME ---
-        try:
-            geo = requests.get(GEOJSON_URL, timeout=5).json()
-            gx, gy, gz = [], [], []
-            for feat in geo['features']:
-                poly_list = feat['geometry']['coordinates'] if feat['geometry']['type'] == 'Polygon' else [p[0] for p in feat['geometry']['coordinates']]
-                for ring in poly_list:
-                    lats, lons = np.array([p[1] for p in ring]), np.array([p[0] for p in ring])
-                    tx, ty, tz = lat_lon_to_xyz(lats, lons, R_EARTH * 1.01)
-                    gx.extend(tx); gx.append(None); gy.extend(ty); gy.append(None); gz.extend(tz); gz.append(None)
+        # --- ROBUST WIREFRAME --- (projected once per LOD, shared across requests)
+        gx, gy, gz = world_wireframe(R_EARTH * 1.01, Config.WIREFRAME_LOD)
+        if len(gx):
             fig.add_trace(go.Scatter3d(x=gx, y=gy, z=gz, mode='lines', line=dict(color='#00ffcc', width=1.5), hoverinfo='skip'))
-        except: pass
-
-        # --- 300 MISSION BEAMS ---
-        port_keys = list(SPACEPORTS.keys())
-        for i, (_, row) in enumerate(filtered_df.head(300).iterrows()):
-            name = row.get("Name of Satellite, Alternate Names", "Asset")
-            owner = str(row.get("Owner", "International")).upper()
-            site_key = next((k for k in SPACEPORTS if k.upper() in owner), port_keys[i % (len(port_keys)-1)])
-            site = SPACEPORTS[site_key]
-            
-            j_lat, j_lon = site["lat"] + (np.sin(i) * 3.8), site["lon"] + (np.cos(i) * 3.8)
-            h = 45000 if "GEO" in str(row.get("Class of Orbit", "")).upper() else 15000 
-            
-            sx, sy, sz = lat_lon_to_xyz(j_lat, j_lon, R_EARTH)
-            ex, ey, ez = lat_lon_to_xyz(j_lat, j_lon, R_EARTH + h)
-
-            # --- BIG DATA TOOLTIP FIX ---
-            # We use <br> for spacing and <b> for emphasis
-            hover_intel = (
-                f"<span style='font-size: 14px; color: #ffffff;'><b>MISSION:</b> {name}</span><br>"
-                f"<span style='font-size: 12px; color: #00f3ff;'><b>AGENCY:</b> {owner}</span><br>"
-                f"<span style='font-size: 12px; color: #00f3ff;'><b>PAD:</b> {site['pad']}</span>"
-            )
 
-            fig.add_trace(go.Scatter3d(
-                x=[sx, ex], y=[sy, ey], z=[sz, ez], mode='lines+markers',
-                marker=dict(size=[0, 8], color=['white', 'white']), 
-                line=dict(color=site["color"], width=5), 
-                name=hover_intel,
-                hoverinfo='name',
-                # This makes the box expand to fit the text
-                hoverlabel=dict(
-                    bgcolor="rgba(0,0,0,0.9)",
-                    bordercolor="#00f3ff",
-                    font=dict(size=13, color="#00f3ff", family="Consolas"),
-                    namelength=-1 # Stretches the box to full text length
-                ),
-                showlegend=False
-            ))
+        # --- 300 MISSION BEAMS --- (one line trace per beam color + one marker trace)
+        for trace in mission_beam_traces(filtered_df.head(300)):
+            fig.add_trace(trace)
 
         fig.update_layout(
             template="plotly_dark", margin=dict(l=0,r=0,t=0,b=0),
             scene=dict(xaxis=dict(visible=False), yaxis=dict(visible=False), zaxis=dict(visible=False), bgcolor='black',
                        camera=dict(eye=dict(x=1.6, y=1.6, z=1.6)))
         )
-        return dcc.Graph(figure=fig, style={"height": "100vh", "width": "100vw"}, config={'displayModeBar': False})
\ No newline at end of file
+        return fig
\ No newline at end of file
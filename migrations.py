@@ -0,0 +1,132 @@
+"""Versioned schema migrations and connection tuning for the launches DB"""
+import logging
+
+# (version, description, statements); applied in order, tracked in PRAGMA user_version.
+# Never edit a shipped entry - append a new version instead.
+MIGRATIONS = [
+    (1, "secondary indexes for launch filters and joins", [
+        "CREATE INDEX IF NOT EXISTS idx_launches_upcoming_orbit ON launches(upcoming, orbit)",
+        "CREATE INDEX IF NOT EXISTS idx_launches_agency ON launches(agency_id)",
+        "CREATE INDEX IF NOT EXISTS idx_launches_pad ON launches(pad_id)",
+    ]),
+    (2, "covering index for per-agency stats aggregates", [
+        "CREATE INDEX IF NOT EXISTS idx_launches_stats ON launches(upcoming, agency_id, status)",
+    ]),
+    # launches_fts rows share the launch rowid, so don't VACUUM (it may renumber rowids)
+    (3, "FTS5 launch search index kept in sync by triggers", [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS launches_fts USING fts5(
+            name, rocket, agency, desc, loc, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')""",
+        """INSERT INTO launches_fts(rowid, name, rocket, agency, desc, loc)
+            SELECT l.rowid, l.name, l.rocket, a.name, l.desc, p.loc
+            FROM launches l LEFT JOIN agencies a ON l.agency_id = a.id LEFT JOIN pads p ON l.pad_id = p.id""",
+        """CREATE TRIGGER IF NOT EXISTS launches_fts_ai AFTER INSERT ON launches BEGIN
+            INSERT INTO launches_fts(rowid, name, rocket, agency, desc, loc) VALUES (new.rowid, new.name, new.rocket,
+                (SELECT name FROM agencies WHERE id = new.agency_id), new.desc,
+                (SELECT loc FROM pads WHERE id = new.pad_id));
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS launches_fts_au AFTER UPDATE ON launches BEGIN
+            DELETE FROM launches_fts WHERE rowid = old.rowid;
+            INSERT INTO launches_fts(rowid, name, rocket, agency, desc, loc) VALUES (new.rowid, new.name, new.rocket,
+                (SELECT name FROM agencies WHERE id = new.agency_id), new.desc,
+                (SELECT loc FROM pads WHERE id = new.pad_id));
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS launches_fts_ad AFTER DELETE ON launches BEGIN
+            DELETE FROM launches_fts WHERE rowid = old.rowid;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS agencies_fts_au AFTER UPDATE OF name ON agencies
+            WHEN old.name IS NOT new.name BEGIN
+            UPDATE launches_fts SET agency = new.name
+            WHERE rowid IN (SELECT rowid FROM launches WHERE agency_id = new.id);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS pads_fts_au AFTER UPDATE OF loc ON pads
+            WHEN old.loc IS NOT new.loc BEGIN
+            UPDATE launches_fts SET loc = new.loc
+            WHERE rowid IN (SELECT rowid FROM launches WHERE pad_id = new.id);
+        END""",
+    ]),
+    (4, "summary tables for DB.stats(), maintained incrementally by triggers", [
+        """CREATE TABLE IF NOT EXISTS stats_orbit (
+            upcoming INT, orbit TEXT, n INT, PRIMARY KEY (upcoming, orbit))""",
+        """CREATE TABLE IF NOT EXISTS stats_agency (
+            upcoming INT, agency_id INT, n INT, s INT, PRIMARY KEY (upcoming, agency_id))""",
+        "CREATE TABLE IF NOT EXISTS stats_meta (key TEXT PRIMARY KEY, value INT)",
+        "INSERT OR IGNORE INTO stats_meta VALUES ('version', 0)",
+        """INSERT INTO stats_orbit SELECT upcoming, COALESCE(orbit, 'Unknown'), COUNT(*)
+            FROM launches GROUP BY 1, 2""",
+        """INSERT INTO stats_agency SELECT upcoming, agency_id, COUNT(*),
+            SUM(CASE WHEN status LIKE '%Success%' THEN 1 ELSE 0 END)
+            FROM launches GROUP BY 1, 2""",
+        """CREATE TRIGGER IF NOT EXISTS launches_stats_ai AFTER INSERT ON launches BEGIN
+            INSERT INTO stats_orbit VALUES (new.upcoming, COALESCE(new.orbit, 'Unknown'), 1)
+                ON CONFLICT(upcoming, orbit) DO UPDATE SET n = n + 1;
+            INSERT INTO stats_agency VALUES (new.upcoming, new.agency_id, 1, new.status LIKE '%Success%')
+                ON CONFLICT(upcoming, agency_id) DO UPDATE SET n = n + 1, s = s + excluded.s;
+            UPDATE stats_meta SET value = value + 1 WHERE key = 'version';
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS launches_stats_ad AFTER DELETE ON launches BEGIN
+            UPDATE stats_orbit SET n = n - 1
+                WHERE upcoming = old.upcoming AND orbit = COALESCE(old.orbit, 'Unknown');
+            UPDATE stats_agency SET n = n - 1, s = s - (old.status LIKE '%Success%')
+                WHERE upcoming = old.upcoming AND agency_id = old.agency_id;
+            UPDATE stats_meta SET value = value + 1 WHERE key = 'version';
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS launches_stats_au AFTER UPDATE OF upcoming, orbit, agency_id, status ON launches
+            WHEN old.upcoming IS NOT new.upcoming OR old.orbit IS NOT new.orbit
+                OR old.agency_id IS NOT new.agency_id OR old.status IS NOT new.status BEGIN
+            UPDATE stats_orbit SET n = n - 1
+                WHERE upcoming = old.upcoming AND orbit = COALESCE(old.orbit, 'Unknown');
+            UPDATE stats_agency SET n = n - 1, s = s - (old.status LIKE '%Success%')
+                WHERE upcoming = old.upcoming AND agency_id = old.agency_id;
+            INSERT INTO stats_orbit VALUES (new.upcoming, COALESCE(new.orbit, 'Unknown'), 1)
+                ON CONFLICT(upcoming, orbit) DO UPDATE SET n = n + 1;
+            INSERT INTO stats_agency VALUES (new.upcoming, new.agency_id, 1, new.status LIKE '%Success%')
+                ON CONFLICT(upcoming, agency_id) DO UPDATE SET n = n + 1, s = s + excluded.s;
+            UPDATE stats_meta SET value = value + 1 WHERE key = 'version';
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS agencies_stats_au AFTER UPDATE OF name ON agencies
+            WHEN old.name IS NOT new.name BEGIN
+            UPDATE stats_meta SET value = value + 1 WHERE key = 'version';
+        END""",
+    ]),
+]
+
+PRAGMAS = [
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",  # ~16 MB page cache
+    "PRAGMA mmap_size = 134217728",
+    "PRAGMA busy_timeout = 5000",
+]
+
+
+def configure_connection(conn, path=None, readonly=False):
+    """
+    WAL journaling (so readers don't block the ingest writer) plus tuned
+    pragmas. In-memory databases cannot use WAL and keep their default;
+    read-only connections inherit the journal mode from the file.
+    """
+    if path != ":memory:" and not readonly:
+        conn.execute("PRAGMA journal_mode = WAL")
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn):
+    """Run every migration newer than the stored schema version; returns the new version"""
+    version = schema_version(conn)
+    for target, description, statements in MIGRATIONS:
+        if target <= version:
+            continue
+        with conn:
+            for sql in statements:
+                conn.execute(sql)
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+        logging.debug(f"Applied DB migration {target}: {description}")
+        version = target
+    if version:
+        conn.execute("PRAGMA optimize")
+    return version
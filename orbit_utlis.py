@@ -154,11 +154,11 @@ def adaptive_orbit_sampling(total_duration_minutes, zoom_level=1.0):
     # Base interval for global view
     base_interval = 45  # seconds
     
-    # Increase resolution when zoomed in
-    if zoom_level > 2.0:
-        return base_interval // 2  # 22.5 seconds
-    elif zoom_level > 4.0:
+    # Increase resolution when zoomed in (tightest threshold first)
+    if zoom_level > 4.0:
         return base_interval // 4  # 11.25 seconds
+    elif zoom_level > 2.0:
+        return base_interval // 2  # 22.5 seconds
     else:
         return base_interval
 
@@ -0,0 +1,336 @@
+"""Vectorized pass prediction for a ground observer: coarse visibility screening, fine sampling, root refinement"""
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from sgp4.api import SatrecArray
+from config.settings import Config
+from utils.frames import geodetic_to_ecef, teme_to_ecef
+from utils.propagation import julian_dates
+
+# rise/set are None when they fall outside the computed span; culmination and
+# max_elevation then describe the highest point inside it
+Pass = namedtuple('Pass', ['rise', 'culmination', 'set', 'max_elevation'])
+
+OMEGA_EARTH = 7.292115e-5  # Earth rotation, rad/s
+GOLDEN = (np.sqrt(5.0) - 1) / 2
+SCREEN_MARGIN = np.radians(1.0)  # Covers the geocentric vs geodetic horizon difference
+PEAK_MARGIN_DEG = 5.0  # Sampled maxima this far below the threshold are refined too (grazing passes)
+
+
+def normalize_observer(observer=None):
+    """(lat, lng, alt_km) rounded to ~10 m, so equal sites share cache entries"""
+    lat, lng, alt_km = observer or (Config.OBSERVER_LAT, Config.OBSERVER_LNG, Config.OBSERVER_ALT_KM)
+    return round(float(lat), 4), round(float(lng), 4), round(float(alt_km), 3)
+
+
+class _Sky:
+    """Observer geometry; times are seconds after start"""
+
+    def __init__(self, observer, start):
+        lat, lng, alt_km = observer
+        self.site = geodetic_to_ecef(lat, lng, alt_km)
+        lat_r, lng_r = np.radians(lat), np.radians(lng)
+        self.up = np.array([np.cos(lat_r) * np.cos(lng_r), np.cos(lat_r) * np.sin(lng_r), np.sin(lat_r)])
+        jd, fr = julian_dates([start])
+        self.jd0, self.fr0 = float(jd[0]), float(fr[0])
+
+    def fr(self, t_s):
+        return self.fr0 + np.asarray(t_s, dtype=float) / 86400.0
+
+    def elevation(self, r_teme, t_s):
+        """Elevation (degrees) of TEME positions (..., 3) at times t_s (broadcast against r's leading axes)"""
+        rho = teme_to_ecef(r_teme, self.jd0, self.fr(t_s)) - self.site
+        el = np.degrees(np.arcsin((rho @ self.up) / np.linalg.norm(rho, axis=-1)))
+        return np.where(np.isnan(el), -90.0, el)
+
+
+def _screen(sky, satrecs, span_s, min_elevation):
+    """
+    Coarse pass over all satellites at once: one SatrecArray call at
+    PASS_COARSE_STEP_S, then a bound on how fast each satellite's direction
+    can move marks the intervals where it could rise above min_elevation.
+
+    Returns:
+        cand: (N, K) candidate intervals, step_s, rate: (N,) bound in rad/s
+    """
+    step_s = Config.PASS_COARSE_STEP_S
+    t = np.arange(int(np.ceil(span_s / step_s)) + 1) * float(step_s)
+    e, r, _ = SatrecArray(satrecs).sgp4(np.full(len(t), sky.jd0), sky.fr(t))
+    r[e != 0] = np.nan
+    r = teme_to_ecef(r, sky.jd0, sky.fr(t))
+
+    site_r = np.linalg.norm(sky.site)
+    cos_psi = (r @ (sky.site / site_r)) / np.linalg.norm(r, axis=-1)
+    psi = np.arccos(np.clip(cos_psi, -1.0, 1.0))  # Geocentric angle satellite-observer
+
+    # Largest visible angle (at apogee) and fastest angular motion (at perigee)
+    ecc = np.array([s.ecco for s in satrecs])
+    r_max = np.array([s.a * s.radiusearthkm for s in satrecs]) * (1 + ecc) * 1.01
+    el_min = np.radians(min_elevation)
+    reach = np.arccos(np.clip(site_r * np.cos(el_min) / r_max, -1.0, 1.0)) - el_min + SCREEN_MARGIN
+    mean_motion = np.array([s.no_kozai for s in satrecs]) / 60.0
+    rate = 1.1 * mean_motion * (1 + ecc) ** 2 / (1 - ecc ** 2) ** 1.5 + OMEGA_EARTH
+
+    # Within an interval psi can dip at most rate * step / 2 below its endpoint mean
+    closest = (psi[:, :-1] + psi[:, 1:]) / 2 - rate[:, None] * step_s / 2
+    return closest <= reach[:, None], step_s, rate
+
+
+class _Track:
+    """
+    Fine samples (TEME position and velocity) over each run of candidate
+    intervals ("segment"), flat and satellite-major. Between samples the
+    position is cubic Hermite interpolated, so refinement needs no further
+    SGP4 calls (error is centimetres at a few degrees of motion per step).
+    """
+
+    def __init__(self, sky, satrecs, cand, step_s, fine_step):
+        edges = np.diff(np.pad(cand.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+        run_sat, s = np.nonzero(edges == 1)
+        _, e = np.nonzero(edges == -1)
+        n = (np.ceil((e - s) * step_s / fine_step[run_sat]) + 1).astype(np.int64)
+
+        self.seg = np.repeat(np.arange(len(n)), n)
+        self.sat = run_sat[self.seg]
+        pos = np.arange(len(self.seg)) - np.repeat(np.cumsum(n) - n, n)
+        self.t = np.repeat(s * float(step_s), n) + pos * np.repeat((e - s) * float(step_s) / (n - 1), n)
+        self.at_start = (pos == 0) & (s[self.seg] == 0)
+        self.at_end = (pos == n[self.seg] - 1) & (e[self.seg] == cand.shape[1])
+
+        self.r = np.full((len(self.t), 3), np.nan)
+        self.v = np.full((len(self.t), 3), np.nan)
+        fr = sky.fr(self.t)
+        bounds = np.flatnonzero(np.r_[True, self.sat[1:] != self.sat[:-1], True])
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            err, self.r[a:b], self.v[a:b] = satrecs[self.sat[a]].sgp4_array(np.full(b - a, sky.jd0), fr[a:b])
+            self.r[a:b][err != 0] = np.nan
+        self.sky = sky
+        self.el = sky.elevation(self.r, self.t)
+
+    def __len__(self):
+        return len(self.t)
+
+    def elevation_at(self, base, x):
+        """Elevation at times x, each within one interval of sample base"""
+        t = self.t
+        j = base + (x >= t[np.minimum(base + 1, len(t) - 1)]) - (x < t[base])
+        j = np.clip(j, 0, len(t) - 2)
+        h = (t[j + 1] - t[j])[:, None]
+        s = ((x - t[j]) / (t[j + 1] - t[j]))[:, None]
+        s2, s3 = s * s, s * s * s
+        r = ((2 * s3 - 3 * s2 + 1) * self.r[j] + (s3 - 2 * s2 + s) * h * self.v[j]
+             + (3 * s2 - 2 * s3) * self.r[j + 1] + (s3 - s2) * h * self.v[j + 1])
+        return self.sky.elevation(r, x)
+
+
+def _golden_max(f, a, b, tol):
+    """Vectorized golden-section search for maxima of f(i, x) over brackets [a, b]"""
+    everyone = np.arange(len(a))
+    c, d = b - GOLDEN * (b - a), a + GOLDEN * (b - a)
+    fc, fd = f(everyone, c), f(everyone, d)
+    while True:
+        open_ = (b - a) > tol
+        if not open_.any():
+            break
+        left = open_ & (fc >= fd)  # Maximum in [a, d]
+        right = open_ & ~left
+        b = np.where(left, d, b)
+        a = np.where(right, c, a)
+        d, fd = np.where(left, c, d), np.where(left, fc, fd)
+        c, fc = np.where(right, d, c), np.where(right, fd, fc)
+        probe = np.where(left, b - GOLDEN * (b - a), a + GOLDEN * (b - a))
+        fprobe = np.full(len(a), np.nan)
+        fprobe[open_] = f(everyone[open_], probe[open_])
+        c, fc = np.where(left, probe, c), np.where(left, fprobe, fc)
+        d, fd = np.where(right, probe, d), np.where(right, fprobe, fd)
+    best = fc >= fd
+    return np.where(best, c, d), np.where(best, fc, fd)
+
+
+def _bisect(f, a, b, rising, level, tol):
+    """Vectorized bisection of f(i, x) == level over brackets [a, b]; rising marks upward crossings"""
+    everyone = np.arange(len(a))
+    while True:
+        open_ = (b - a) > tol
+        if not open_.any():
+            break
+        mid = (a + b) / 2
+        above = np.zeros(len(a), dtype=bool)
+        above[open_] = f(everyone[open_], mid[open_]) >= level
+        # A rise lies before the first point above, a set after the last one
+        go_left = open_ & (above == rising)
+        b = np.where(go_left, mid, b)
+        a = np.where(open_ & ~go_left, mid, a)
+    return (a + b) / 2
+
+
+def _passes(satrecs, observer, start, span_s, min_elevation):
+    """
+    Passes of every satellite in [start, start + span_s].
+
+    Returns:
+        One list of Pass per satellite, in time order
+    """
+    sky = _Sky(observer, start)
+    cand, step_s, rate = _screen(sky, satrecs, span_s, min_elevation)
+    out = [[] for _ in satrecs]
+    if not cand.any():
+        return out
+    track = _Track(sky, satrecs, cand, step_s, np.clip(np.radians(Config.PASS_FINE_STEP_DEG) / rate, 1.0, step_s))
+    seg, t, el, m = track.seg, track.t, track.el, len(track)
+
+    # Elevation maxima; those on the span edges are refined over the one interval inside it
+    prev_same = np.r_[False, seg[1:] == seg[:-1]]
+    next_same = np.r_[seg[:-1] == seg[1:], False]
+    el_prev = np.where(prev_same, np.r_[-np.inf, el[:-1]], -np.inf)
+    el_next = np.where(next_same, np.r_[el[1:], -np.inf], -np.inf)
+    is_max = (el >= el_prev) & (el > el_next) & (el > min_elevation - PEAK_MARGIN_DEG)
+    interior = is_max & prev_same & next_same
+    edge = is_max & (track.at_start | track.at_end)
+    peaks = np.flatnonzero(interior | edge)
+
+    lo = np.where(prev_same[peaks], peaks - 1, peaks)
+    hi = np.where(next_same[peaks], peaks + 1, peaks)
+    t_peak, el_peak = _golden_max(lambda i, x: track.elevation_at(lo[i], x), t[lo], t[hi], Config.PASS_TOLERANCE_S)
+    sampled = el[peaks] > el_peak  # Maximum on the span edge itself
+    t_peak[sampled], el_peak[sampled] = t[peaks][sampled], el[peaks][sampled]
+    keep = el_peak >= min_elevation
+    peaks, t_peak, el_peak = peaks[keep], t_peak[keep], el_peak[keep]
+
+    # Brackets around the horizon crossings on each side of a peak
+    below = el < min_elevation
+    idx = np.arange(m)
+    prev_below = np.maximum.accumulate(np.where(below, idx, -1))
+    next_below = np.minimum.accumulate(np.where(below, idx, m)[::-1])[::-1]
+    j_rise = np.where(peaks > 0, prev_below[np.maximum(peaks - 1, 0)], -1)
+    j_set = np.where(peaks < m - 1, next_below[np.minimum(peaks + 1, m - 1)], m)
+    has_rise = (j_rise >= 0) & (seg[np.maximum(j_rise, 0)] == seg[peaks])
+    has_set = (j_set < m) & (seg[np.minimum(j_set, m - 1)] == seg[peaks])
+
+    # Grazing passes (no sample above the threshold) bracket against the peak itself
+    r_next = np.minimum(j_rise + 1, m - 1)
+    r_hi = np.where(el[r_next] >= min_elevation, t[r_next], t_peak)
+    s_prev = np.maximum(j_set - 1, 0)
+    s_lo = np.where(el[s_prev] >= min_elevation, t[s_prev], t_peak)
+
+    base = np.r_[j_rise[has_rise], s_prev[has_set]]
+    roots = _bisect(lambda i, x: track.elevation_at(base[i], x),
+                    np.r_[t[j_rise[has_rise]], s_lo[has_set]], np.r_[r_hi[has_rise], t[j_set[has_set]]],
+                    np.r_[np.ones(has_rise.sum(), bool), np.zeros(has_set.sum(), bool)],
+                    min_elevation, Config.PASS_TOLERANCE_S)
+    t_rise = np.full(len(peaks), np.nan)
+    t_set = np.full(len(peaks), np.nan)
+    t_rise[has_rise], t_set[has_set] = roots[:has_rise.sum()], roots[has_rise.sum():]
+
+    def when(seconds):
+        return None if np.isnan(seconds) else start + timedelta(seconds=float(seconds))
+
+    # A pass with several local maxima is reported once, at its highest
+    pass_id = np.where(has_rise, j_rise, -1 - seg[peaks])
+    for p in range(len(peaks)):
+        if p and pass_id[p] == pass_id[p - 1]:
+            continue
+        same = np.flatnonzero(pass_id == pass_id[p])
+        best = same[np.argmax(el_peak[same])]
+        out[track.sat[peaks[p]]].append(
+            Pass(when(t_rise[best]), when(t_peak[best]), when(t_set[best]), float(el_peak[best])))
+    return out
+
+
+class PassPredictor:
+    """
+    Pass predictions cached per (observer, satellite, TLE epoch, minimum
+    elevation). Each entry covers the span it was computed over; a request
+    inside that span is served from cache, everything else is computed in
+    one batch. Least recently used entries are evicted past maxsize.
+    """
+
+    def __init__(self, maxsize=20000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> (covered_from, covered_to, [Pass])
+        self._lock = threading.Lock()
+
+    def predict(self, propagator, rows=None, observer=None, start=None, hours=None, min_elevation=None):
+        """
+        Passes over the observer between start and start + hours.
+
+        Args:
+            propagator: BatchPropagator holding the parsed TLEs
+            rows: propagator rows to predict (default: all)
+            observer: (lat, lng, alt_km), default Config.OBSERVER_*
+
+        Returns:
+            {satellite id: [Pass, ...]} for the requested rows with a valid TLE
+        """
+        observer = normalize_observer(observer)
+        start = (start or datetime.now(timezone.utc)).replace(microsecond=0)
+        end = start + timedelta(hours=hours or Config.PASS_WINDOW_H)
+        min_elevation = Config.PASS_MIN_ELEVATION_DEG if min_elevation is None else min_elevation
+        rows = np.arange(len(propagator)) if rows is None else np.asarray(rows)
+
+        result, missing = {}, []
+        with self._lock:
+            for row in rows.tolist():
+                satrec = propagator.satrecs[row]
+                if satrec is None:
+                    continue
+                key = (observer, propagator.ids[row], satrec.jdsatepoch + satrec.jdsatepochF, min_elevation)
+                entry = self._data.get(key)
+                if entry is not None and entry[0] <= start and end <= entry[1]:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    result[propagator.ids[row]] = entry[2]
+                else:
+                    self.misses += 1
+                    missing.append((row, key))
+
+        if missing:
+            covered_to = end + timedelta(hours=Config.PASS_CACHE_SLACK_H)
+            computed = _passes([propagator.satrecs[row] for row, _ in missing], observer, start,
+                               (covered_to - start).total_seconds(), min_elevation)
+            with self._lock:
+                for (row, key), passes in zip(missing, computed):
+                    self._data[key] = (start, covered_to, passes)
+                    self._data.move_to_end(key)
+                    result[propagator.ids[row]] = passes
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+        # Cached spans may be wider than the request
+        return {sat_id: [p for p in passes
+                         if (p.set or p.culmination) >= start and (p.rise or p.culmination) <= end]
+                for sat_id, passes in result.items()}
+
+    def next_pass(self, propagator, row, observer=None, start=None, hours=None, min_elevation=None):
+        """First pass of one satellite that has not ended yet, or None"""
+        passes = self.predict(propagator, [row], observer, start, hours, min_elevation)
+        found = passes.get(propagator.ids[row])
+        return found[0] if found else None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+
+# Process-wide predictor shared by the telemetry panel and callbacks
+_pass_predictor = PassPredictor(maxsize=Config.PASS_CACHE_SIZE)
+
+
+def get_pass_predictor():
+    return _pass_predictor
@@ -0,0 +1,156 @@
+"""Process-wide satellite position snapshots refreshed by a background thread"""
+import logging
+import threading
+import time
+import uuid
+from collections import namedtuple
+from config.settings import Config
+from utils.propagation import BatchPropagator
+from data.api_client import API
+from utils.timeline import build_timeline
+from utils.spatial_index import SpatialIndex
+
+# Rows follow the catalog's rows, so callers index the timeline by catalog row
+PositionSnapshot = namedtuple('PositionSnapshot', ['ids', 'timeline', 'spatial', 'computed_at', 'duration_s'])
+
+
+class PositionService:
+    """
+    Propagates the whole catalog on a fixed cadence in a daemon thread.
+    Readers get the latest immutable PositionSnapshot and never pay for
+    propagation themselves (except once on cold start, if the thread has
+    not finished its first pass yet). Every tle_refresh_s the same thread
+    pulls stale TLEs into db.tles, so the next snapshot uses newer epochs.
+    With several worker processes on one database only the holder of the
+    store's refresh lease fetches; the others pick up what it wrote.
+    """
+
+    def __init__(self, db, interval_s=None, step_s=None, horizon_min=None, tle_refresh_s=None):
+        self.db = db
+        self.interval_s = interval_s or Config.POSITION_REFRESH_S
+        self.tle_refresh_s = tle_refresh_s or Config.TLE_REFRESH_S
+        self.step_s = step_s or Config.TIMELINE_STEP_S
+        self.horizon_min = horizon_min or Config.TIMELINE_HORIZON_MIN
+
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._tles_checked = None  # time.monotonic() of the last TLE refresh
+        self._holder = uuid.uuid4().hex  # Identity for the TLE refresh lease
+
+        self.refreshes = 0
+        self.errors = 0
+
+    def start(self):
+        """Start the refresher thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='position-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh_tles()
+            except Exception as e:
+                logging.warning(f"TLE refresh failed: {e}")
+            try:
+                self.refresh()
+            except Exception as e:
+                self.errors += 1
+                logging.warning(f"Position refresh failed: {e}")
+            self._stop.wait(self.interval_s)
+
+    def refresh_tles(self, fetch=None):
+        """
+        Fetch stale catalog TLEs (at most once per tle_refresh_s) through
+        fetch(ids), by default one CelesTrak TLE_CATALOG_GROUP request.
+        Without the refresh lease, only reloads TLEs the holder stored.
+
+        Returns:
+            (fetched, written) counts, or None when not due or not the holder
+        """
+        now = time.monotonic()
+        if self._tles_checked is not None and now - self._tles_checked < self.tle_refresh_s:
+            return None
+        self._tles_checked = now
+        if not self.db.tles.claim_refresh(self._holder, lease_s=2 * self.tle_refresh_s):
+            self.db.reload_tles()
+            return None
+        if fetch is None:
+            def fetch(ids):
+                return API.fetch_tles(ids, groups=dict.fromkeys(ids, Config.TLE_CATALOG_GROUP))
+        return self.db.refresh_tles(fetch)
+
+    def refresh(self):
+        """Propagate the current catalog and publish a new snapshot"""
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        started = time.perf_counter()
+        catalog = self.db.get_catalog()
+        if catalog is None or not catalog.has_tles:
+            ids, propagator = [], BatchPropagator([], [])
+        else:
+            # TLEs were parsed once when the catalog was built
+            ids, propagator = catalog.ids.tolist(), catalog.propagator
+
+        timeline = build_timeline(propagator, step_s=self.step_s, horizon_min=self.horizon_min)
+        for key in ('lat', 'lng', 'alt_km'):
+            timeline[key].flags.writeable = False
+
+        snapshot = PositionSnapshot(
+            ids=tuple(ids),
+            timeline=timeline,
+            # Region / proximity queries over the positions at t0
+            spatial=SpatialIndex(ids, timeline['lat'][:, 0], timeline['lng'][:, 0], timeline['alt_km'][:, 0]),
+            computed_at=time.time(),
+            duration_s=time.perf_counter() - started,
+        )
+        # Single reference swap, so readers see either the old or the new snapshot
+        self._snapshot = snapshot
+        self.refreshes += 1
+        return snapshot
+
+    def snapshot(self):
+        """Latest snapshot; computed synchronously only if none exists yet"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._refresh_lock:
+            return self._snapshot or self._refresh_locked()
+
+    def metrics(self):
+        """Refresh count, last refresh duration and snapshot staleness"""
+        snapshot = self._snapshot
+        return {
+            'refreshes': self.refreshes,
+            'errors': self.errors,
+            'satellites': len(snapshot.ids) if snapshot else 0,
+            'last_refresh_s': snapshot.duration_s if snapshot else None,
+            'staleness_s': time.time() - snapshot.computed_at if snapshot else None,
+            'running': self._thread is not None and self._thread.is_alive(),
+        }
+
+
+# Global service instance (will be initialized with db)
+_position_service = None
+_position_service_lock = threading.Lock()
+
+
+def get_position_service(db):
+    """Get or create the shared position service (callback threads may race on first use)"""
+    global _position_service
+    if _position_service is None:
+        with _position_service_lock:
+            if _position_service is None:
+                _position_service = PositionService(db)
+    return _position_service
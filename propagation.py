@@ -0,0 +1,100 @@
+"""Vectorized SGP4 propagation for the whole satellite catalog"""
+import numpy as np
+from datetime import datetime, timezone, timedelta
+from sgp4.api import SatrecArray, jday
+from utils.tle_cache import get_satrec
+from utils.frames import teme_to_geodetic
+
+
+def julian_dates(times):
+    """Convert an iterable of UTC datetimes into (jd, fr) NumPy arrays"""
+    jd, fr = [], []
+    for t in times:
+        j, f = jday(t.year, t.month, t.day, t.hour, t.minute, t.second + t.microsecond * 1e-6)
+        jd.append(j)
+        fr.append(f)
+    return np.array(jd, dtype=np.float64), np.array(fr, dtype=np.float64)
+
+
+def epochs_from_now(offsets_min=(0,), now=None):
+    """Build (jd, fr) arrays for minute offsets relative to now (UTC)"""
+    now = now or datetime.now(timezone.utc)
+    return julian_dates(now + timedelta(minutes=float(m)) for m in offsets_min)
+
+
+class BatchPropagator:
+    """
+    Parses a set of TLEs once into a SatrecArray and propagates every
+    satellite at every requested epoch in a single call.
+    """
+
+    def __init__(self, line1s, line2s, ids=None):
+        line1s, line2s = list(line1s), list(line2s)
+        self.ids = list(ids) if ids is not None else list(range(len(line1s)))
+        self.valid = np.zeros(len(line1s), dtype=bool)
+        self.satrecs = [None] * len(line1s)  # Parsed record per row, None where the TLE is invalid
+
+        satrecs = []
+        for i, (l1, l2) in enumerate(zip(line1s, line2s)):
+            try:
+                satrec = get_satrec(l1, l2)
+            except Exception:
+                continue
+            # twoline2rv flags unparseable lines through satrec.error instead of raising
+            if satrec.error != 0 or not satrec.no_kozai > 0:
+                continue
+            satrecs.append(satrec)
+            self.satrecs[i] = satrec
+            self.valid[i] = True
+
+        self._index = np.flatnonzero(self.valid)
+        self._array = SatrecArray(satrecs) if satrecs else None
+
+    @classmethod
+    def from_dataframe(cls, df, id_col=None):
+        """Build a propagator from a catalog DataFrame with TLE_LINE1/TLE_LINE2 columns"""
+        ids = df[id_col].tolist() if id_col and id_col in df.columns else None
+        return cls(df['TLE_LINE1'], df['TLE_LINE2'], ids=ids)
+
+    def __len__(self):
+        return len(self.valid)
+
+    def propagate(self, jd, fr):
+        """
+        Run SGP4 for all satellites x all epochs.
+
+        Returns:
+            e: (N, T) error codes (-1 where the TLE failed to parse)
+            r, v: (N, T, 3) TEME position (km) and velocity (km/s), NaN on error
+        """
+        jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+        fr = np.atleast_1d(np.asarray(fr, dtype=np.float64))
+        n, t = len(self.valid), len(jd)
+
+        e = np.full((n, t), -1, dtype=np.int8)
+        r = np.full((n, t, 3), np.nan)
+        v = np.full((n, t, 3), np.nan)
+        if self._array is None or t == 0:
+            return e, r, v
+
+        e_ok, r_ok, v_ok = self._array.sgp4(jd, fr)
+        e[self._index], r[self._index], v[self._index] = e_ok, r_ok, v_ok
+
+        failed = e != 0
+        r[failed] = np.nan
+        v[failed] = np.nan
+        return e, r, v
+
+    def positions(self, jd=None, fr=None, ellipsoid=True):
+        """
+        Lat/lon (degrees) and altitude (km) for every satellite at every epoch.
+        Defaults to a single epoch at the current time. Entries that failed to
+        parse or propagate are NaN. ellipsoid=False trades WGS84 accuracy for a
+        cheaper spherical conversion.
+        """
+        if jd is None:
+            jd, fr = epochs_from_now()
+        jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+        fr = np.atleast_1d(np.asarray(fr, dtype=np.float64))
+        _, r, _ = self.propagate(jd, fr)
+        return teme_to_geodetic(r, jd, fr, ellipsoid=ellipsoid)
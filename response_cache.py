@@ -0,0 +1,144 @@
+"""Bounded LRU cache of callback responses keyed by (callback, filters, time bucket)"""
+import json
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from plotly.utils import PlotlyJSONEncoder
+from config.settings import Config
+
+
+def normalize_filters(*filters):
+    """
+    Hashable, order-insensitive form of callback filter values: 'All', ''
+    and None collapse to None, strings are stripped and lists become sorted
+    tuples, so equivalent selections share one cache entry.
+    """
+    out = []
+    for value in filters:
+        if isinstance(value, str):
+            value = value.strip()
+            value = None if value in ('', 'All') else value
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            value = tuple(sorted(str(v) for v in value)) or None
+        out.append(value)
+    return tuple(out)
+
+
+def _nbytes(value):
+    """Approximate size of an unserialized response: the numpy arrays it holds (one level of nesting)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return 0
+    return sum(v.nbytes for v in value if isinstance(v, np.ndarray))
+
+
+class ResponseCache:
+    """
+    Maps (callback name, normalized filters, time bucket) to a computed
+    response. Entries are evicted least recently used first once maxsize
+    entries or max_bytes are exceeded. Serialized entries count their JSON
+    length, others the numpy arrays they hold (e.g. position frames).
+
+    serialize=True stores the response as JSON and hands every hit a fresh
+    plain-JSON copy (figures come back as dicts, with no Plotly objects
+    rebuilt); otherwise the stored object itself is returned and callers
+    must not mutate it.
+    """
+
+    def __init__(self, maxsize=256, max_bytes=64 * 1024 * 1024, bucket_s=60):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.bucket_s = bucket_s
+        self.hits = 0
+        self.misses = 0
+        self.by_name = {}  # name -> [hits, misses]
+        self.bytes = 0
+        self._data = OrderedDict()  # key -> (serialized, value, nbytes)
+        self._lock = threading.Lock()
+
+    def _count(self, name, hit):
+        counts = self.by_name.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def get_or_compute(self, name, filters, compute, serialize=False, bucket_s=None, now=None):
+        """
+        Cached response for name/filters in the current time bucket, calling
+        compute() only on a miss. filters should already be normalized.
+        """
+        bucket_s = bucket_s or self.bucket_s
+        bucket = int((now if now is not None else time.time()) // bucket_s)
+        key = (name, filters, bucket)
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                self._count(name, True)
+            else:
+                self._count(name, False)
+        if entry is not None:
+            serialized, value, _ = entry
+            return json.loads(value) if serialized else value
+
+        value = compute()
+        stored = json.dumps(value, cls=PlotlyJSONEncoder) if serialize else value
+        nbytes = len(stored) if serialize else _nbytes(value)
+        if nbytes > self.max_bytes:
+            # Would flush the whole cache; serve uncached
+            return json.loads(stored) if serialize else value
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self._data[key] = (serialize, stored, nbytes)
+            self.bytes += nbytes
+            while self._data and (len(self._data) > self.maxsize or self.bytes > self.max_bytes):
+                _, (_, _, evicted) = self._data.popitem(last=False)
+                self.bytes -= evicted
+        return json.loads(stored) if serialize else value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.hits = self.misses = 0
+            self.by_name.clear()
+
+    def stats(self):
+        """Hit/miss counters (overall and per callback) and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'by_name': {name: {'hits': h, 'misses': m, 'hit_rate': h / (h + m)}
+                            for name, (h, m) in self.by_name.items()},
+            }
+
+
+# Process-wide cache shared by the globe and map callbacks
+_response_cache = ResponseCache(maxsize=Config.RESPONSE_CACHE_SIZE,
+                                max_bytes=Config.RESPONSE_CACHE_MAX_BYTES,
+                                bucket_s=Config.RESPONSE_CACHE_BUCKET_S)
+
+
+def get_response_cache():
+    return _response_cache
+
+
+def response_cache_stats():
+    return _response_cache.stats()
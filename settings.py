@@ -1,36 +1,91 @@
 """Configuration and constants for Astro Mission Control"""
+import os
 
 class Config:
     """Application configuration"""
     LAUNCH_DB = ":memory:"
     API = "https://ll.thespacedevs.com/2.2.0/launch/previous/?limit=100"
     UPCOMING_API = "https://ll.thespacedevs.com/2.2.0/launch/upcoming/?limit=20"
+    
+    # Full-history backfill (walks the `next` cursor, see data/backfill.py)
+    BACKFILL_API = "https://ll.thespacedevs.com/2.2.0/launch/previous/?limit=100&ordering=net"
+    BACKFILL_MIN_INTERVAL_S = 240  # Pause between pages: LL2's free tier allows 15 requests/hour
+    BACKFILL_BACKOFF_S = 60  # First retry wait when throttled without Retry-After; doubles per attempt
+    BACKFILL_MAX_RETRIES = 6
+    BACKFILL_ON_START = False  # Run the backfill in a background thread when the app starts
     GEOJSON = "https://raw.githubusercontent.com/johan/world.geo.json/master/countries.geo.json"
+    WORLD_OUTLINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'world_outline.npz')  # Bundled outline rings; regenerate with python -m utils.wireframe
+    WIREFRAME_LOD_TOLERANCES = {'high': 0.0, 'medium': 0.1, 'low': 0.5}  # Douglas-Peucker tolerance, degrees
+    WIREFRAME_LOD = 'medium'
     R = 6371  # Earth radius in km
     SCALE = 4  # Visual scale for orbits
     
+    # Globe position timeline (server samples, browser interpolates)
+    TIMELINE_ENABLED = True
+    TIMELINE_STEP_S = 30
+    TIMELINE_HORIZON_MIN = 15
+    POSITION_REFRESH_S = 60  # Background catalog propagation cadence
+    GLOBE_MAX_SATELLITES = None  # Optional payload cap; filtering itself is index-based
+    GLOBE_TRANSPORT = 'delta'  # 'delta' (varint-packed deltas) or 'columnar' (base64 typed-array buffers)
+    GLOBE_COLUMNAR_DTYPE = 'int16'  # Columnar sample type: 'int16' (quantized) or 'float32'
+
+    # Globe level of detail (driven by the camera the browser reports)
+    LOD_ENABLED = True
+    LOD_REFERENCE_ALTITUDE = 2.5  # Camera altitude (globe radii) of the default view, zoom 1.0
+    LOD_CAMERA_SNAP_DEG = 5  # Camera lat/lng rounding, so nearby views share cached frames
+    LOD_HORIZON_MARGIN = 0.1  # Extra band past the limb kept in the payload
+    LOD_CELL_DEG = 10  # Bucket size at zoom 1.0; shrinks as the camera zooms in
+    LOD_MAX_PER_CELL = 8
+
+    SPATIAL_CELL_KM = 500  # Grid cell of the per-snapshot satellite spatial index
+    CHAT_NEAR_RADIUS_KM = 2000  # Default ground distance (sub-satellite point) for the chatbot's "what's near" answers
+
+    # Pass prediction (NEXT PASS panel)
+    OBSERVER_LAT = 28.5729  # Default ground observer: Kennedy Space Center
+    OBSERVER_LNG = -80.6490
+    OBSERVER_ALT_KM = 0.0
+    PASS_WINDOW_H = 24
+    PASS_MIN_ELEVATION_DEG = 10
+    PASS_COARSE_STEP_S = 900  # Screening cadence; intervals that cannot reach the observer are skipped
+    PASS_FINE_STEP_DEG = 6  # Sampling of candidate intervals, in degrees of satellite motion
+    PASS_TOLERANCE_S = 1  # Rise/culmination/set time precision
+    PASS_CACHE_SLACK_H = 2  # Extra span computed so later windows reuse cached passes
+    PASS_CACHE_SIZE = 20000
+
+    # Callback response cache (identical filters within one time bucket share a result)
+    RESPONSE_CACHE_SIZE = 256
+    RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Bound on serialized (JSON) entries
+    RESPONSE_CACHE_BUCKET_S = 60
+    
+    # TLE fetching (CelesTrak); 'group' on a satellite lets it ride a bulk group query
+    TLE_FETCH_WORKERS = 8
+    TLE_MAX_AGE_H = 12  # Stored element sets older than this are refetched
+    TLE_REFRESH_S = 3600  # How often the position service looks for stale catalog TLEs
+    TLE_CATALOG_GROUP = 'active'  # CelesTrak group fetched in one request for catalog refreshes
+    TLE_FALLBACK_MAX = 25  # Per-CATNR queries per fetch for objects missing from their group
+    
     # Major satellites with accurate orbital data
     # Major satellites with accurate orbital data
     SATELLITES = {
         # Space Stations
-        'ISS': {'norad': 25544, 'alt': 420, 'inc': 51.6, 'type': 'Space Station', 'lat': 0, 'lon': 0},
-        'Tiangong': {'norad': 48274, 'alt': 390, 'inc': 41.5, 'type': 'Space Station', 'lat': 30, 'lon': 110},
+        'ISS': {'norad': 25544, 'alt': 420, 'inc': 51.6, 'type': 'Space Station', 'lat': 0, 'lon': 0, 'group': 'stations'},
+        'Tiangong': {'norad': 48274, 'alt': 390, 'inc': 41.5, 'type': 'Space Station', 'lat': 30, 'lon': 110, 'group': 'stations'},
         # Telescopes
-        'Hubble': {'norad': 20580, 'alt': 540, 'inc': 28.5, 'type': 'Telescope', 'lat': 20, 'lon': -80},
-        'Chandra': {'norad': 25867, 'alt': 133000, 'inc': 64.0, 'type': 'Telescope', 'lat': 40, 'lon': 50},
+        'Hubble': {'norad': 20580, 'alt': 540, 'inc': 28.5, 'type': 'Telescope', 'lat': 20, 'lon': -80, 'group': 'science'},
+        'Chandra': {'norad': 25867, 'alt': 133000, 'inc': 64.0, 'type': 'Telescope', 'lat': 40, 'lon': 50, 'group': 'science'},
         # Navigation
-        'GPS IIF-2': {'norad': 37753, 'alt': 20200, 'inc': 55.0, 'type': 'Navigation', 'lat': 45, 'lon': 0},
-        'Galileo-11': {'norad': 41174, 'alt': 23222, 'inc': 56.0, 'type': 'Navigation', 'lat': 50, 'lon': 30},
+        'GPS IIF-2': {'norad': 37753, 'alt': 20200, 'inc': 55.0, 'type': 'Navigation', 'lat': 45, 'lon': 0, 'group': 'gps-ops'},
+        'Galileo-11': {'norad': 41174, 'alt': 23222, 'inc': 56.0, 'type': 'Navigation', 'lat': 50, 'lon': 30, 'group': 'galileo'},
         # Communication
         'Starlink-1007': {'norad': 44713, 'alt': 550, 'inc': 53.0, 'type': 'Communication', 'lat': 53, 'lon': -120},
         'Starlink-1020': {'norad': 44714, 'alt': 550, 'inc': 53.0, 'type': 'Communication', 'lat': 53, 'lon': 120},
-        'Iridium-180': {'norad': 43926, 'alt': 780, 'inc': 86.4, 'type': 'Communication', 'lat': 70, 'lon': 0},
+        'Iridium-180': {'norad': 43926, 'alt': 780, 'inc': 86.4, 'type': 'Communication', 'lat': 70, 'lon': 0, 'group': 'iridium-NEXT'},
         # Earth Observation
-        'Landsat 9': {'norad': 49260, 'alt': 705, 'inc': 98.2, 'type': 'Earth Observation', 'lat': -30, 'lon': -100},
-        'Sentinel-1A': {'norad': 39634, 'alt': 693, 'inc': 98.2, 'type': 'Earth Observation', 'lat': -40, 'lon': 10},
-        'Terra': {'norad': 25994, 'alt': 705, 'inc': 98.2, 'type': 'Earth Observation', 'lat': -50, 'lon': 150},
-        'Aqua': {'norad': 27424, 'alt': 705, 'inc': 98.2, 'type': 'Earth Observation', 'lat': -35, 'lon': -150},
+        'Landsat 9': {'norad': 49260, 'alt': 705, 'inc': 98.2, 'type': 'Earth Observation', 'lat': -30, 'lon': -100, 'group': 'resource'},
+        'Sentinel-1A': {'norad': 39634, 'alt': 693, 'inc': 98.2, 'type': 'Earth Observation', 'lat': -40, 'lon': 10, 'group': 'resource'},
+        'Terra': {'norad': 25994, 'alt': 705, 'inc': 98.2, 'type': 'Earth Observation', 'lat': -50, 'lon': 150, 'group': 'resource'},
+        'Aqua': {'norad': 27424, 'alt': 705, 'inc': 98.2, 'type': 'Earth Observation', 'lat': -35, 'lon': -150, 'group': 'resource'},
         # Weather
-        'GOES-16': {'norad': 41866, 'alt': 35786, 'inc': 0.1, 'type': 'Weather', 'lat': 0, 'lon': -75},
-        'NOAA-20': {'norad': 43013, 'alt': 824, 'inc': 98.7, 'type': 'Weather', 'lat': 60, 'lon': -90},
+        'GOES-16': {'norad': 41866, 'alt': 35786, 'inc': 0.1, 'type': 'Weather', 'lat': 0, 'lon': -75, 'group': 'goes'},
+        'NOAA-20': {'norad': 43013, 'alt': 824, 'inc': 98.7, 'type': 'Weather', 'lat': 60, 'lon': -90, 'group': 'weather'},
     }
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""Spatial index over satellite positions: bounding-box, radius and k-nearest queries"""
+import numpy as np
+from config.settings import Config
+from utils.frames import R_EARTH_KM
+
+
+def to_xyz(lat, lng, alt_km=0.0):
+    """Spherical Earth-fixed coordinates in km (the frame the globe renders in)"""
+    lat_r, lng_r = np.radians(lat), np.radians(lng)
+    r = R_EARTH_KM + np.asarray(alt_km, dtype=float)
+    return np.stack([r * np.cos(lat_r) * np.cos(lng_r),
+                     r * np.cos(lat_r) * np.sin(lng_r),
+                     r * np.sin(lat_r)], axis=-1)
+
+
+def ground_distance_km(lat1, lng1, lat2, lng2):
+    """Great-circle (haversine) distance between ground points on the spherical Earth"""
+    lat1, lng1, lat2, lng2 = (np.radians(a) for a in (lat1, lng1, lat2, lng2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * R_EARTH_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+class SpatialIndex:
+    """
+    Uniform 3D grid over Earth-fixed positions plus a latitude-sorted view
+    of the sub-satellite points. Built once per position snapshot; queries
+    only touch the grid cells (or latitude band) they need.
+    """
+
+    def __init__(self, ids, lat, lng, alt_km, cell_km=None):
+        lat, lng, alt_km = (np.asarray(a, dtype=float) for a in (lat, lng, alt_km))
+        ok = np.isfinite(lat) & np.isfinite(lng) & np.isfinite(alt_km)
+        self.rows = np.flatnonzero(ok)  # positions in the source arrays
+        self.ids = np.asarray(ids, dtype=object)[self.rows]
+        self.lat, self.lng, self.alt_km = lat[ok], lng[ok], alt_km[ok]
+        self.xyz = to_xyz(self.lat, self.lng, self.alt_km)
+        self.cell_km = cell_km or Config.SPATIAL_CELL_KM
+        self._max_r = float(np.linalg.norm(self.xyz, axis=1).max()) if len(self.xyz) else 0.0
+
+        # Grid: points sorted by packed cell key, with each occupied cell's slice
+        cells = np.floor(self.xyz / self.cell_km).astype(np.int64)
+        keys = self._pack(cells)
+        self._order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[self._order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) if len(keys) else np.array([], int)
+        ends = np.r_[starts[1:], len(keys)]
+        self._cells = dict(zip(sorted_keys[starts].tolist(), zip(starts.tolist(), ends.tolist())))
+
+        # Latitude-sorted sub-satellite points for bounding boxes
+        self._by_lat = np.argsort(self.lat, kind='stable')
+        self._lat_sorted = self.lat[self._by_lat]
+
+    @staticmethod
+    def _pack(cells):
+        # 21 bits per axis, offset so negative cell numbers stay positive
+        c = cells + (1 << 20)
+        return (c[..., 0] << 42) | (c[..., 1] << 21) | c[..., 2]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _candidates(self, center, radius_km):
+        """Indices of points in grid cells overlapping a sphere"""
+        lo = np.floor((center - radius_km) / self.cell_km).astype(np.int64)
+        hi = np.floor((center + radius_km) / self.cell_km).astype(np.int64)
+        if np.prod(hi - lo + 1) > max(len(self._cells), 1):
+            return np.arange(len(self))  # wider than the occupied grid: scan everything
+        axes = np.meshgrid(*(np.arange(a, b + 1) for a, b in zip(lo, hi)), indexing='ij')
+        keys = self._pack(np.stack([a.ravel() for a in axes], axis=-1))
+        spans = [self._cells[k] for k in keys.tolist() if k in self._cells]
+        if not spans:
+            return np.array([], dtype=np.int64)
+        return np.concatenate([self._order[a:b] for a, b in spans])
+
+    def radius(self, lat, lng, radius_km, alt_km=0.0):
+        """
+        Satellites within radius_km (straight-line) of a point.
+
+        Returns:
+            (indices, distances_km) sorted by distance
+        """
+        center = to_xyz(lat, lng, alt_km)
+        idx = self._candidates(center, radius_km)
+        dist = np.linalg.norm(self.xyz[idx] - center, axis=1)
+        keep = dist <= radius_km
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind='stable')
+        return idx[order], dist[order]
+
+    def nearest(self, lat, lng, k=1, alt_km=0.0):
+        """
+        k nearest satellites to a point, searching growing shells of grid
+        cells until k hits are confirmed.
+
+        Returns:
+            (indices, distances_km) sorted by distance
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return np.array([], dtype=np.int64), np.array([])
+        # No point can be further away than this
+        limit = np.linalg.norm(to_xyz(lat, lng, alt_km)) + self._max_r
+        radius_km = self.cell_km
+        while True:
+            idx, dist = self.radius(lat, lng, min(radius_km, limit), alt_km)
+            if len(idx) >= k or radius_km >= limit:
+                return idx[:k], dist[:k]
+            radius_km *= 2
+
+    def ground_radius(self, lat, lng, radius_km):
+        """
+        Satellites whose sub-satellite point lies within radius_km
+        (great-circle, along the ground) of a point, at any altitude.
+        Only the latitude band the circle spans is scanned.
+
+        Returns:
+            (indices, ground_distances_km) sorted by distance
+        """
+        dlat = np.degrees(radius_km / R_EARTH_KM)
+        a = np.searchsorted(self._lat_sorted, lat - dlat, side='left')
+        b = np.searchsorted(self._lat_sorted, lat + dlat, side='right')
+        band = self._by_lat[a:b]
+        dist = ground_distance_km(lat, lng, self.lat[band], self.lng[band])
+        keep = dist <= radius_km
+        idx, dist = band[keep], dist[keep]
+        order = np.argsort(dist, kind='stable')
+        return idx[order], dist[order]
+
+    def ground_nearest(self, lat, lng, k=1):
+        """
+        k satellites with the closest sub-satellite points, widening the
+        search circle until k hits are found.
+
+        Returns:
+            (indices, ground_distances_km) sorted by distance
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return np.array([], dtype=np.int64), np.array([])
+        limit = np.pi * R_EARTH_KM  # Antipode
+        radius_km = self.cell_km
+        while True:
+            idx, dist = self.ground_radius(lat, lng, min(radius_km, limit))
+            if len(idx) >= k or radius_km >= limit:
+                return idx[:k], dist[:k]
+            radius_km *= 2
+
+    def bbox(self, lat_min, lat_max, lng_min, lng_max):
+        """
+        Satellites whose sub-satellite point lies in a lat/lng box. A box with
+        lng_min > lng_max wraps across the antimeridian.
+        """
+        a = np.searchsorted(self._lat_sorted, lat_min, side='left')
+        b = np.searchsorted(self._lat_sorted, lat_max, side='right')
+        band = self._by_lat[a:b]
+        lng = self.lng[band]
+        if lng_min <= lng_max:
+            keep = (lng >= lng_min) & (lng <= lng_max)
+        else:
+            keep = (lng >= lng_min) | (lng <= lng_max)
+        return np.sort(band[keep])
@@ -179,8 +179,27 @@ def create_satellite_telemetry_panel(satellite_data=None):
     )
 
 
-def create_pass_prediction_panel():
-    """Create panel showing when satellite will be overhead"""
+def create_pass_rows(next_pass=None):
+    """NEXT PASS rows for a utils.pass_predictor.Pass ('---' where unknown)"""
+    def clock(when):
+        return when.strftime('%H:%M:%S') if when else '---'
+
+    if next_pass is None:
+        max_elevation = duration = '---'
+    else:
+        max_elevation = f"{next_pass.max_elevation:.0f}"
+        duration = (f"{(next_pass.set - next_pass.rise).total_seconds() / 60:.1f}"
+                    if next_pass.rise and next_pass.set else '---')
+    return [
+        create_telemetry_row('RISE TIME', clock(next_pass and next_pass.rise), 'UTC', COLORS['amber']),
+        create_telemetry_row('MAX ELEVATION', max_elevation, '°', COLORS['cyan']),
+        create_telemetry_row('SET TIME', clock(next_pass and next_pass.set), 'UTC', COLORS['amber']),
+        create_telemetry_row('DURATION', duration, 'min', COLORS['cyan']),
+    ]
+
+
+def create_pass_prediction_panel(next_pass=None):
+    """Create panel showing when satellite will be overhead (see PassPredictor.next_pass)"""
     return html.Div(
         style={
             'padding': '20px',
@@ -194,12 +213,7 @@ def create_pass_prediction_panel():
             
             html.Div(
                 id='next-pass-info',
-                children=[
-                    create_telemetry_row('RISE TIME', '22:45:30', 'UTC', COLORS['amber']),
-                    create_telemetry_row('MAX ELEVATION', '45', '°', COLORS['cyan']),
-                    create_telemetry_row('SET TIME', '22:53:12', 'UTC', COLORS['amber']),
-                    create_telemetry_row('DURATION', '7.7', 'min', COLORS['cyan']),
-                ]
+                children=create_pass_rows(next_pass)
             )
         ]
     )
@@ -0,0 +1,151 @@
+"""Launch-history backfill against a local Launch Library fixture server"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+import requests
+
+from config.settings import Config
+from data.backfill import backfill, load_checkpoint, main, start_backfill
+from data.database import DB
+
+
+def launch(i):
+    return {
+        'id': f'L{i:04d}', 'name': f'Falcon {i}', 'net': f'2020-01-01T00:00:{i:02d}Z' if i < 60 else f'2021-{i:04d}',
+        'launch_service_provider': {'id': i % 7, 'name': f'Agency {i % 7}'},
+        'pad': {'id': i % 5, 'name': 'Pad', 'location': {'name': 'Site'}},
+        'mission': {'orbit': {'abbrev': 'LEO'}, 'description': 'Test mission'},
+        'rocket': {'configuration': {'name': 'Falcon 9'}},
+        'status': {'name': 'Launch Successful'},
+    }
+
+
+class LaunchLibrary:
+    """Paginated /launch/ endpoint with net ordering, net__gte, one scripted 429 and optional HTML pages"""
+
+    def __init__(self, n):
+        self.launches = [launch(i) for i in range(n)]
+        self.requests = []
+        self.throttle_at = {2}  # Request numbers answered with 429
+        self.html_at = set()  # Request numbers answered with a 200 HTML page
+
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                fixture.requests.append(self.path)
+                if len(fixture.requests) in fixture.throttle_at:
+                    self.send_response(429)
+                    self.send_header('Retry-After', '0')
+                    self.end_headers()
+                    return
+                if len(fixture.requests) in fixture.html_at:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html')
+                    self.end_headers()
+                    self.wfile.write(b'<html><body>Bad gateway</body></html>')
+                    return
+                q = parse_qs(urlparse(self.path).query)
+                limit, offset = int(q['limit'][0]), int(q.get('offset', ['0'])[0])
+                rows = sorted(fixture.launches, key=lambda l: l['net'])
+                if 'net__gte' in q:
+                    rows = [l for l in rows if l['net'] >= q['net__gte'][0]]
+                extra = ''.join(f'&net__gte={v}' for v in q.get('net__gte', []))
+                nxt = (f'{fixture.base}?limit={limit}&offset={offset + limit}{extra}'
+                       if offset + limit < len(rows) else None)
+                body = json.dumps({'count': len(rows), 'next': nxt, 'results': rows[offset:offset + limit]}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base = f'http://127.0.0.1:{self.server.server_port}/launch/'
+        self.url = f'{self.base}?limit=10'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+
+
+@pytest.fixture
+def ll2():
+    server = LaunchLibrary(35)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'BACKFILL_MIN_INTERVAL_S', 0)
+    return DB(str(tmp_path / 'launches.db'))
+
+
+def count(db):
+    return db.conn.execute("SELECT COUNT(*) FROM launches").fetchone()[0]
+
+
+def test_full_walk_survives_throttling(db, ll2):
+    waits = []
+    result = backfill(db, url=ll2.url, session=requests.Session(), sleep=waits.append)
+    assert result == {'pages': 4, 'inserted': 35, 'updated': 0, 'rejected': 0, 'done': True}
+    assert waits == [0.0]  # Retry-After honored once
+    assert count(db) == 35
+
+
+def test_html_page_is_retried(db, ll2, monkeypatch):
+    monkeypatch.setattr(Config, 'BACKFILL_BACKOFF_S', 1)
+    ll2.throttle_at = set()
+    ll2.html_at = {3}
+    waits = []
+    result = backfill(db, url=ll2.url, session=requests.Session(), sleep=waits.append)
+    assert result['done'] and result['inserted'] == 35
+    assert waits == [1]
+
+
+def test_html_pages_stop_the_thread_with_a_backfill_error(db, ll2, monkeypatch, caplog):
+    monkeypatch.setattr(Config, 'BACKFILL_BACKOFF_S', 0)
+    monkeypatch.setattr(Config, 'BACKFILL_MAX_RETRIES', 1)
+    ll2.html_at = set(range(1, 10))
+    start_backfill(db, url=ll2.url, session=requests.Session()).join(timeout=10)
+    assert 'Backfill stopped' in caplog.text
+    assert count(db) == 0
+
+
+def test_interrupted_walk_resumes_from_checkpoint(db, ll2):
+    first = backfill(db, url=ll2.url, session=requests.Session(), max_pages=2, sleep=lambda s: None)
+    assert first['pages'] == 2 and not first['done']
+    with db.pool.write() as conn:
+        assert load_checkpoint(conn)['next_url'].endswith('offset=20')
+
+    second = backfill(db, url=ll2.url, session=requests.Session(), sleep=lambda s: None)
+    assert second['pages'] == 2 and second['inserted'] == 15 and second['done']
+    assert count(db) == 35
+
+
+def test_finished_walk_catches_up_from_newest_launch(db, ll2):
+    backfill(db, url=ll2.url, session=requests.Session(), sleep=lambda s: None)
+    ll2.launches += [launch(i) for i in range(35, 38)]
+    ll2.requests.clear()
+
+    result = backfill(db, url=ll2.url, session=requests.Session(), sleep=lambda s: None)
+    assert 'net__gte=2020-01-01T00%3A00%3A34Z' in ll2.requests[0]
+    assert result['inserted'] == 3 and result['updated'] == 1 and result['done']
+    assert count(db) == 38
+
+
+def test_command_line(tmp_path, ll2, monkeypatch, capsys):
+    monkeypatch.setattr(Config, 'BACKFILL_BACKOFF_S', 0)
+    monkeypatch.setattr(Config, 'BACKFILL_MIN_INTERVAL_S', 240)
+    ll2.throttle_at = set()
+    path = str(tmp_path / 'cli.db')
+    assert main(['--db', path, '--url', ll2.url, '--interval', '0']) == 0
+    assert Config.BACKFILL_MIN_INTERVAL_S == 240  # --interval applies to this run only
+    assert 'inserted=35' in capsys.readouterr().out
+    assert DB(path).conn.execute("SELECT COUNT(*) FROM launches").fetchone()[0] == 35
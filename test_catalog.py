@@ -0,0 +1,40 @@
+"""Catalog row identity when display names repeat, and loading the binary export"""
+import numpy as np
+import pandas as pd
+
+from data.catalog import SatelliteCatalog, NAME_COL
+from data.catalog_store import export_catalog, load_catalog
+
+L1 = '1 {:05d}U 98067A   26027.65966300  .00011148  00000+0  21554-3 0  9996'
+L2 = '2 {:05d}  51.6319 275.1786 0011156  36.3768 323.7976 15.48229162549971'
+
+
+def test_ids_come_from_norad_numbers():
+    df = pd.DataFrame({
+        NAME_COL: ['STARLINK', 'STARLINK', 'NO TLE'],
+        'TLE_LINE1': [L1.format(44713), L1.format(44714), None],
+        'TLE_LINE2': [L2.format(44713), L2.format(44714), None],
+    })
+    catalog = SatelliteCatalog.from_dataframe(df)
+    assert catalog.ids.tolist() == ['44713', '44714', 'NO TLE']
+    assert catalog.propagator.ids == ['44713', '44714', 'NO TLE']
+    assert catalog.propagator.valid.tolist() == [True, True, False]
+    assert catalog.propagator.satrecs[2] is None
+
+
+def test_exported_lines_stay_memory_mapped(tmp_path):
+    df = pd.DataFrame({
+        NAME_COL: ['STARLINK', 'STARLINK'],
+        'TLE_LINE1': [L1.format(44713), L1.format(44714)],
+        'TLE_LINE2': [L2.format(44713), L2.format(44714)],
+    })
+    path = str(tmp_path / 'satellites.cat')
+    export_catalog(SatelliteCatalog.from_dataframe(df), path)
+    catalog = load_catalog(path)
+
+    assert isinstance(catalog.line1.raw, np.memmap)
+    assert catalog.line1[1] == L1.format(44714)
+    assert list(catalog.line2) == df['TLE_LINE2'].tolist()
+    assert catalog.norads.tolist() == [44713, 44714]
+    assert catalog.propagator.ids == ['44713', '44714']
+    assert catalog.df['TLE_LINE1'].tolist() == df['TLE_LINE1'].tolist()
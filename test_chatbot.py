@@ -0,0 +1,54 @@
+"""Chatbot "near" answers compare ground points, whatever the altitude"""
+import types
+
+import pytest
+
+from utils import chatbot
+from utils.chatbot import SpaceChatbot
+from utils.spatial_index import SpatialIndex
+
+
+class NoCatalog:
+    def get_catalog(self):
+        return None  # Names fall back to the snapshot IDs
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    spatial = SpatialIndex(
+        ['GEO-SAT', 'LEO-SAT', 'FAR-LEO'],
+        [0.0, 30.0, -40.0],        # lat
+        [-75.0, -78.0, 100.0],     # lng
+        [35786.0, 550.0, 550.0])   # alt_km
+    snapshot = types.SimpleNamespace(spatial=spatial)
+    monkeypatch.setattr(chatbot, 'get_position_service', lambda db: types.SimpleNamespace(snapshot=lambda: snapshot))
+    return SpaceChatbot(NoCatalog())
+
+
+def test_near_includes_geo_satellite_overhead(bot):
+    # Ground point (0, -75) is ~3200 km from (28.5, -80.6); the GEO satellite is 36,000 km up
+    reply = bot.process('/near 28.5 -80.6 3500')
+    assert '**2 satellites**' in reply
+    assert reply.index('LEO-SAT') < reply.index('GEO-SAT')
+    assert 'FAR-LEO' not in reply
+
+
+def test_near_default_radius_is_ground_distance(bot):
+    reply = bot.process('/near 0.5 -75')
+    assert 'GEO-SAT — ground point 56 km away, 35786 km up' in reply
+
+
+def test_near_falls_back_to_closest_ground_points(bot):
+    reply = bot.process('/near -80 0 100')
+    assert 'Nothing overhead' in reply
+    assert reply.splitlines()[1].startswith('• FAR-LEO')
+
+
+def test_near_usage_explains_semantics(bot):
+    assert 'measured along the Earth' in bot.process('/near')
+
+
+@pytest.mark.parametrize('text', ['satellites over 0.5,-75', 'satellites over 0.5, -75', 'satellites over 0.5 -75'])
+def test_free_text_coordinates(bot, text):
+    assert bot.parse_coords(text) == (0.5, -75.0)
+    assert 'GEO-SAT' in bot.process(text)
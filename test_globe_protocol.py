@@ -0,0 +1,138 @@
+"""Globe position updates decoded the way the clientside callback decodes them"""
+import base64
+
+import numpy as np
+import pytest
+
+from utils.globe_protocol import (
+    ALT_SCALE, LATLNG_SCALE, DeltaEncoder, build_manifest, delta2, encode_columnar,
+    pack_varints, unpack_varints,
+)
+
+TYPES = {'int16': '<i2', 'int32': '<i4', 'float32': '<f4'}
+
+
+def typed(b64, dtype):
+    return np.frombuffer(base64.b64decode(b64), dtype=TYPES[dtype])
+
+
+def decode(update):
+    """{manifest row: (lat, lng, alt) arrays}, mirroring the browser's decoder"""
+    T = update['T']
+    lat_scale, alt_scale = update['scale']
+    if update.get('format') == 'columnar':
+        rows = typed(update['i'], 'int32')
+        cols = [typed(update[f], update['dtype']) / s for f, s in
+                (('lat', lat_scale), ('lng', lat_scale), ('alt', alt_scale))]
+    else:
+        rows = update['i']
+        cols = []
+        for f, s in (('lat', lat_scale), ('lng', lat_scale), ('alt', alt_scale)):
+            d = np.array(unpack_varints(update[f]), dtype=np.int64).reshape(len(rows), T)
+            if T > 1:
+                d[:, 1:] = np.cumsum(d[:, 1:], axis=1)  # First differences
+            cols.append(np.cumsum(d, axis=1).ravel() / s)
+        cols[1] = (cols[1] % 360 + 540) % 360 - 180
+    return {int(r): tuple(c[k * T:(k + 1) * T] for c in cols) for k, r in enumerate(rows)}
+
+
+@pytest.fixture
+def tracks():
+    rng = np.random.default_rng(7)
+    t = np.arange(6)
+    lat = rng.uniform(-60, 60, (4, 1)) + 0.5 * t
+    lng = rng.uniform(-180, 180, (4, 1)) + 3.0 * t
+    lng[0] = 178.0 + 1.5 * t  # Crosses the antimeridian
+    lng = (lng + 180.0) % 360.0 - 180.0
+    alt = rng.uniform(0.02, 0.5, (4, 1)) + 0.001 * t
+    return np.arange(4), lat, lng, alt
+
+
+def assert_decoded(decoded, rows, lat, lng, alt):
+    assert sorted(decoded) == sorted(rows.tolist())
+    for k, r in enumerate(rows.tolist()):
+        d_lat, d_lng, d_alt = decoded[r]
+        assert np.allclose(d_lat, lat[k], atol=0.5 / LATLNG_SCALE)
+        assert np.allclose((d_lng - lng[k] + 180) % 360 - 180, 0, atol=0.5 / LATLNG_SCALE)
+        assert np.allclose(d_alt, alt[k], atol=0.5 / ALT_SCALE)
+
+
+def test_varint_round_trip():
+    values = [0, 1, -1, 15, 16, -16, -17, 31, 32, 1000, -1000, 2 ** 31, -2 ** 31, 2 ** 40, -2 ** 40]
+    text = pack_varints(values)
+    assert unpack_varints(text) == values
+    assert len(pack_varints([0, 1, -1, 15, -16])) == 5  # Small deltas take one char each
+    assert pack_varints([]) == ''
+
+
+def test_second_order_delta_is_undone_by_two_running_sums():
+    q = np.array([[5, 9, 14, 20, 27], [0, -3, -3, 4, 100]], dtype=np.int64)
+    d = delta2(q)
+    d[:, 1:] = np.cumsum(d[:, 1:], axis=1)
+    assert (np.cumsum(d, axis=1) == q).all()
+
+
+def test_full_update_round_trip(tracks):
+    rows, lat, lng, alt = tracks
+    update = DeltaEncoder().encode('k', 100.0, rows, lat, lng, alt, t0=0, step_ms=30000)
+    assert update['full'] and update['T'] == 6
+    assert_decoded(decode(update), rows, lat, lng, alt)
+
+
+def test_delta_update_sends_only_changed_rows(tracks):
+    rows, lat, lng, alt = tracks
+    encoder = DeltaEncoder()
+    encoder.encode('k', 100.0, rows, lat, lng, alt)
+
+    lat2 = lat.copy()
+    lat2[2] += 1.0
+    update = encoder.encode('k', 160.0, rows, lat2, lng, alt, since={'key': 'k', 'view': None, 'computed_at': 100.0})
+    assert not update['full']
+    assert update['i'] == [2]
+    assert_decoded(decode(update), rows[[2]], lat2[[2]], lng[[2]], alt[[2]])
+
+    # Unknown client state (or another manifest) gets everything again
+    update = encoder.encode('k', 220.0, rows, lat2, lng, alt, since={'key': 'k', 'view': None, 'computed_at': 1.0})
+    assert update['full'] and update['i'] == rows.tolist()
+
+
+def test_delta_after_camera_change(tracks):
+    rows, lat, lng, alt = tracks
+    encoder = DeltaEncoder()
+    before = (10.0, 20.0, 1.0)
+    encoder.encode('k', 100.0, rows, lat, lng, alt, view=before)
+    synced = {'key': 'k', 'view': list(before), 'computed_at': 100.0}  # As echoed back through JSON
+
+    # The new camera keeps the same satellites in view: only the moved one is sent
+    lng2 = lng.copy()
+    lng2[1] += 2.0
+    update = encoder.encode('k', 100.0, rows, lat, lng2, alt, since=synced, view=(30.0, 20.0, 1.0))
+    assert not update['full'] and update['i'] == [1]
+    assert update['view'] == (30.0, 20.0, 1.0)
+
+    # A camera that selects other rows needs a full update
+    update = encoder.encode('k', 100.0, rows[:2], lat[:2], lng[:2], alt[:2], since=synced, view=(80.0, 0.0, 1.0))
+    assert update['full'] and update['i'] == [0, 1]
+
+
+@pytest.mark.parametrize('dtype', ['int16', 'float32'])
+def test_columnar_round_trip(tracks, dtype):
+    rows, lat, lng, alt = tracks
+    update = DeltaEncoder().encode('k', 100.0, rows + 7, lat, lng, alt, transport='columnar', dtype=dtype)
+    assert update['format'] == 'columnar' and update['dtype'] == dtype and update['full']
+    assert typed(update['lat'], dtype).size == lat.size
+    assert_decoded(decode(update), rows + 7, lat, lng, alt)
+
+
+def test_columnar_body_keeps_longitude_in_range():
+    body = encode_columnar(np.array([3]), np.array([[0.0]]), np.array([[190.0]]), np.array([[0.1]]))
+    assert typed(body['lng'], 'int16')[0] == -170 * LATLNG_SCALE
+    assert typed(body['i'], 'int32').tolist() == [3]
+
+
+def test_columnar_manifest_codes_categories():
+    manifest = build_manifest('k', ['1', '2', '3'], ['A', 'B', 'C'], ['SpaceX', 'NASA', 'SpaceX'],
+                              ['Comms', 'Science', 'Comms'], ['#0f0', '#f00', '#0f0'], columnar=True)
+    owners = manifest['owners']
+    codes = typed(owners['codes'], owners['dtype'])
+    assert [owners['labels'][c] for c in codes] == ['SpaceX', 'NASA', 'SpaceX']
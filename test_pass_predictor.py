@@ -0,0 +1,75 @@
+"""Pass predictions against a dense one-second reference propagation"""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sgp4.api import Satrec
+
+from utils.frames import geodetic_to_ecef, teme_to_ecef
+from utils.pass_predictor import PassPredictor
+from utils.propagation import BatchPropagator, julian_dates
+
+L1 = '1 25544U 98067A   26027.65966300  .00011148  00000+0  21554-3 0  9996'
+L2 = '2 25544  51.6319 275.1786 0011156  36.3768 323.7976 15.48229162549971'
+KSC = (28.5729, -80.6490, 0.0)
+START = datetime(2026, 1, 28, tzinfo=timezone.utc)
+MIN_ELEVATION = 10
+
+
+def reference_passes(start, hours):
+    """(rise, culmination, set, max elevation) sampled every second; rise/set None when outside the span"""
+    when = [start + timedelta(seconds=s) for s in range(int(hours * 3600) + 1)]
+    jd, fr = julian_dates(when)
+    _, r, _ = Satrec.twoline2rv(L1, L2).sgp4_array(jd, fr)
+    lat, lng, alt = KSC
+    rho = teme_to_ecef(r, jd, fr) - geodetic_to_ecef(lat, lng, alt)
+    lat_r, lng_r = np.radians(lat), np.radians(lng)
+    up = np.array([np.cos(lat_r) * np.cos(lng_r), np.cos(lat_r) * np.sin(lng_r), np.sin(lat_r)])
+    el = np.degrees(np.arcsin((rho @ up) / np.linalg.norm(rho, axis=-1)))
+
+    above = np.r_[False, el >= MIN_ELEVATION, False]
+    rises = np.flatnonzero(~above[:-1] & above[1:])
+    sets = np.flatnonzero(above[:-1] & ~above[1:]) - 1
+    return [(when[a] if a > 0 else None, when[a + np.argmax(el[a:b + 1])],
+             when[b] if b < len(el) - 1 else None, el[a:b + 1].max())
+            for a, b in zip(rises, sets)]
+
+
+def assert_close(got, want, seconds=2):
+    if want is None:
+        assert got is None
+    else:
+        assert abs((got - want).total_seconds()) <= seconds
+
+
+@pytest.fixture
+def propagator():
+    return BatchPropagator([L1], [L2], ids=['ISS'])
+
+
+def test_passes_match_reference(propagator):
+    expected = reference_passes(START, 24)
+    passes = PassPredictor().predict(propagator, observer=KSC, start=START, hours=24,
+                                     min_elevation=MIN_ELEVATION)['ISS']
+    assert len(passes) == len(expected) == 3
+    for p, (rise, culmination, set_, max_elevation) in zip(passes, expected):
+        assert_close(p.rise, rise)
+        assert_close(p.culmination, culmination)
+        assert_close(p.set, set_)
+        assert p.max_elevation == pytest.approx(max_elevation, abs=0.05)
+
+
+def test_pass_in_progress_at_start(propagator):
+    # Starts 34 s before a 46 degree culmination
+    start = datetime(2026, 1, 28, 1, 44, 32, tzinfo=timezone.utc)
+    (rise, culmination, set_, max_elevation), *_ = reference_passes(start, 2)
+    assert rise is None
+
+    p = PassPredictor().next_pass(propagator, 0, observer=KSC, start=start, hours=2,
+                                  min_elevation=MIN_ELEVATION)
+    assert p.rise is None
+    assert_close(p.culmination, culmination)
+    assert (p.culmination - start).total_seconds() > 30
+    assert_close(p.set, set_)
+    assert p.max_elevation == pytest.approx(max_elevation, abs=0.05)
+    assert p.max_elevation > 46
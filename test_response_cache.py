@@ -0,0 +1,23 @@
+"""Response cache size accounting for array-valued entries"""
+import numpy as np
+
+from utils.response_cache import ResponseCache
+
+
+def frame(n):
+    return {'key': 'k', 'rows': np.arange(n), 'lat': np.zeros((n, 30)), 'lng': np.zeros((n, 30))}
+
+
+def test_unserialized_arrays_count_against_max_bytes():
+    one = frame(1000)
+    size = sum(v.nbytes for v in one.values() if isinstance(v, np.ndarray))
+    cache = ResponseCache(maxsize=256, max_bytes=3 * size)
+    for i in range(5):
+        cache.get_or_compute('frames', (i,), lambda: frame(1000), now=0)
+    stats = cache.stats()
+    assert stats['size'] == 3 and stats['bytes'] == 3 * size
+
+    # Served, but not cached, when one frame alone is over the limit
+    big = frame(10000)
+    assert cache.get_or_compute('frames', ('big',), lambda: big, now=0) is big
+    assert cache.stats()['size'] == 3
@@ -0,0 +1,98 @@
+"""Refreshed element sets reach the catalog the globe propagates from"""
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from data.api_client import API
+from data.database import DB
+from utils.position_service import PositionService
+from utils.propagation import epochs_from_now
+
+WHEN = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def checksum(line):
+    return str(sum(int(c) if c.isdigit() else c == '-' for c in line[:68]) % 10)
+
+
+def later_epoch(line1, days):
+    """line1 with its epoch moved forward (same elements, so a different position at WHEN)"""
+    epoch = f"{float(line1[20:32]) + days:012.8f}"
+    line = line1[:20] + epoch + line1[32:68]
+    return line + checksum(line)
+
+
+def position(db, row):
+    lat, lng, alt = db.get_catalog().propagator.positions(*epochs_from_now([0], now=WHEN))
+    return np.array([lat[row, 0], lng[row, 0], alt[row, 0]])
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DB(str(tmp_path / 'launches.db'))
+    assert db.get_catalog().has_tles
+    return db
+
+
+def test_newer_epoch_changes_propagated_position(db, tmp_path):
+    catalog = db.get_catalog()
+    row = 0
+    norad = int(catalog.norads[row])
+    line1, line2 = catalog.line1[row], catalog.line2[row]
+    before = position(db, row)
+
+    newer = later_epoch(line1, 0.25)
+    asked = []
+
+    def fetch(ids):
+        asked.append(len(ids))
+        return {norad: ('REFRESHED', newer, line2)}
+
+    service = PositionService(db, tle_refresh_s=3600)
+    assert service.refresh_tles(fetch) == (1, 1)
+    assert db.get_catalog().line1[row] == newer
+    assert not np.allclose(position(db, row), before)
+    assert service.refresh_tles(fetch) is None  # Not due again yet
+    assert asked == [len(catalog.norads)]
+
+    # Everything was just fetched, so nothing is stale
+    assert db.refresh_tles(fetch) == (0, 0)
+
+    # The newer set is read back from disk on the next start, over the CSV seed
+    reopened = DB(str(tmp_path / 'launches.db'))
+    assert reopened.get_catalog().line1[row] == newer
+
+
+def test_older_epoch_is_ignored(db):
+    catalog = db.get_catalog()
+    norad = int(catalog.norads[0])
+    line1, line2 = catalog.line1[0], catalog.line2[0]
+    assert db.refresh_tles(lambda ids: {norad: ('OLD', later_epoch(line1, -1), line2)}) == (1, 0)
+    assert db.get_catalog().line1[0] == line1
+
+
+def test_one_process_refreshes_the_others_reload(db, tmp_path):
+    worker = DB(str(tmp_path / 'launches.db'))  # Second process on the same file
+    row = 0
+    norad = int(db.get_catalog().norads[row])
+    line1, line2 = db.get_catalog().line1[row], db.get_catalog().line2[row]
+    newer = later_epoch(line1, 0.25)
+    asked = []
+
+    def fetch(ids):
+        asked.append(len(ids))
+        return {norad: ('REFRESHED', newer, line2)}
+
+    assert PositionService(db).refresh_tles(fetch) == (1, 1)
+    assert PositionService(worker).refresh_tles(fetch) is None  # Lease is held
+    assert len(asked) == 1
+    assert worker.get_catalog().line1[row] == newer
+
+
+def test_group_misses_fall_back_to_a_capped_number_of_single_queries(monkeypatch):
+    singles = []
+    monkeypatch.setattr(API, 'fetch_tle_group', classmethod(lambda cls, group: {}))
+    monkeypatch.setattr(API, 'fetch_tle', classmethod(lambda cls, n: singles.append(n)))
+    API.fetch_tles(range(1000), groups=dict.fromkeys(range(1000), 'active'), max_fallback=10)
+    assert sorted(singles) == list(range(10))
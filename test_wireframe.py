@@ -0,0 +1,54 @@
+"""World wireframe loading from the bundled outline"""
+import numpy as np
+import pytest
+
+from config.settings import Config
+from data.api_client import API
+from utils import wireframe
+
+WORLD = {'features': [
+    {'geometry': {'type': 'Polygon', 'coordinates': [[[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]]}},
+    {'geometry': {'type': 'MultiPolygon', 'coordinates': [
+        [[[20, 20], [30, 20], [30, 30], [20, 20]]],
+        [[[-40, -10], [-35, -10], [-35, -5], [-40, -10]]],
+    ]}},
+]}
+
+
+class OfflineSession:
+    def get(self, url, timeout=None):
+        raise AssertionError(f"network used: {url}")
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(API, 'get_session', staticmethod(lambda: OfflineSession()))
+    monkeypatch.setattr(wireframe, '_rings', None)
+    monkeypatch.setattr(wireframe, '_wireframes', {})
+
+
+def test_bundled_outline_loads_without_network():
+    x, y, z = wireframe.world_wireframe(100, 'low')
+    assert np.isfinite(x).sum() > 1000
+    finite = np.isfinite(x)
+    assert np.allclose(np.sqrt(x[finite] ** 2 + y[finite] ** 2 + z[finite] ** 2), 100)
+    assert wireframe.world_wireframe(100, 'low')[0] is x
+
+
+def test_export_round_trip(tmp_path, monkeypatch):
+    path = tmp_path / 'outline.npz'
+    assert wireframe.export_world_outline(WORLD, path) == (3, 13)
+    monkeypatch.setattr(Config, 'WORLD_OUTLINE_PATH', str(path))
+
+    rings = wireframe.load_world_rings()
+    assert [len(r) for r in rings] == [5, 4, 4]
+    assert np.allclose(rings[1][1], [30, 20])
+
+    x, _, _ = wireframe.world_wireframe(100, 'high')
+    assert len(x) == 13 + 3  # NaN gap after every ring
+
+
+def test_missing_outline_gives_empty_wireframe(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'WORLD_OUTLINE_PATH', str(tmp_path / 'missing.npz'))
+    x, _, _ = wireframe.world_wireframe(100, 'low')
+    assert len(x) == 0
@@ -0,0 +1,49 @@
+"""Precomputed position timelines for client-side interpolation"""
+import numpy as np
+from datetime import datetime, timezone
+from utils.propagation import epochs_from_now
+
+
+def build_timeline(propagator, step_s=30, horizon_min=15, start=None):
+    """
+    Sample every satellite at a fixed cadence over a short horizon.
+
+    Returns:
+        Dict with t0 (epoch ms), step_ms and (N, T) arrays lat, lng, alt_km
+    """
+    start = start or datetime.now(timezone.utc)
+    offsets_min = np.arange(0, horizon_min * 60 + step_s / 2, step_s) / 60.0
+    lat, lng, alt_km = propagator.positions(*epochs_from_now(offsets_min, now=start))
+    return {
+        't0': int(start.timestamp() * 1000),
+        'step_ms': int(step_s * 1000),
+        'ids': list(propagator.ids),
+        'lat': lat,
+        'lng': lng,
+        'alt_km': alt_km,
+    }
+
+
+def interpolate_timeline(timeline, when=None):
+    """
+    Linearly interpolate every satellite's position at a given time (clamped
+    to the timeline window). Longitude is interpolated across the antimeridian.
+    Mirrors the clientside interpolation used by the globe.
+
+    Returns:
+        (N,) arrays lat, lng, alt_km
+    """
+    when = when or datetime.now(timezone.utc)
+    n_steps = timeline['lat'].shape[1]
+    f = (when.timestamp() * 1000 - timeline['t0']) / timeline['step_ms']
+    f = min(max(f, 0.0), n_steps - 1)
+    i = int(f)
+    j = min(i + 1, n_steps - 1)
+    w = f - i
+
+    lat = timeline['lat'][:, i] + w * (timeline['lat'][:, j] - timeline['lat'][:, i])
+    alt = timeline['alt_km'][:, i] + w * (timeline['alt_km'][:, j] - timeline['alt_km'][:, i])
+    d_lng = (timeline['lng'][:, j] - timeline['lng'][:, i] + 180.0) % 360.0 - 180.0
+    lng = (timeline['lng'][:, i] + w * d_lng + 180.0) % 360.0 - 180.0
+    return lat, lng, alt
+
@@ -0,0 +1,74 @@
+"""Bounded LRU cache of parsed TLE records (Satrec objects)"""
+import hashlib
+import threading
+from collections import OrderedDict
+from sgp4.api import Satrec
+
+
+def tle_key(line1, line2):
+    """Cache key: hash of both TLE lines, so a new element set is a new entry"""
+    return hashlib.sha1(f"{line1.strip()}\n{line2.strip()}".encode()).hexdigest()
+
+
+class TLECache:
+    """
+    Maps TLE line pairs to parsed Satrec records.
+    Least recently used entries are evicted once maxsize is reached.
+    """
+
+    def __init__(self, maxsize=20000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, line1, line2):
+        """Return the Satrec for a TLE, parsing it only on a cache miss"""
+        key = tle_key(line1, line2)
+        with self._lock:
+            sat = self._data.get(key)
+            if sat is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return sat
+            self.misses += 1
+
+        sat = Satrec.twoline2rv(line1, line2)
+
+        with self._lock:
+            self._data[key] = sat
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return sat
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+
+# Process-wide cache shared by every position path
+_tle_cache = TLECache()
+
+
+def get_satrec(line1, line2):
+    """Parsed Satrec for a TLE pair via the shared cache"""
+    return _tle_cache.get(str(line1), str(line2))
+
+
+def tle_cache_stats():
+    return _tle_cache.stats()
@@ -0,0 +1,145 @@
+"""Persistent TLE table with epoch-aware incremental refresh"""
+import logging
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone, timedelta
+
+
+def tle_epoch(line1):
+    """Element-set epoch (unix seconds, UTC) from TLE line 1 columns 19-32"""
+    field = line1[18:32].strip()
+    yy, doy = int(field[:2]), float(field[2:])
+    year = 2000 + yy if yy < 57 else 1900 + yy
+    epoch = datetime(year, 1, 1, tzinfo=timezone.utc) + timedelta(days=doy - 1)
+    return epoch.timestamp()
+
+
+def tle_norad(line1):
+    return int(line1[2:7])
+
+
+class TLEStore:
+    """
+    Element sets kept in SQLite alongside the launch tables.
+    A row is only rewritten when a strictly newer epoch arrives, and
+    refresh() only refetches objects not seen recently: neither their
+    stored epoch nor their last fetch attempt (tle_checks) is younger
+    than max_age_h. Objects with no newer element set upstream are
+    therefore asked for once per max_age_h, not on every refresh.
+    """
+
+    def __init__(self, conn, lock=None):
+        self.conn = conn
+        self.lock = lock or nullcontext()
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS tles (
+            norad INT PRIMARY KEY, name TEXT, line1 TEXT, line2 TEXT,
+            epoch REAL, updated REAL)""")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS tle_checks (norad INT PRIMARY KEY, checked REAL)")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS tle_lease (
+            id INT PRIMARY KEY CHECK (id = 0), holder TEXT, expires REAL)""")
+        self.conn.commit()
+
+    def upsert(self, tles):
+        """
+        Store {norad: (name, line1, line2)}; rows whose epoch did not move
+        forward are left untouched.
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        now = time.time()
+        rows = []
+        for norad, (name, l1, l2) in tles.items():
+            try:
+                rows.append((int(norad), name, l1, l2, tle_epoch(l1), now))
+            except (ValueError, IndexError):
+                logging.debug(f"Skipping malformed TLE for {norad}")
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.executemany("""INSERT INTO tles VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(norad) DO UPDATE SET name = excluded.name, line1 = excluded.line1,
+                    line2 = excluded.line2, epoch = excluded.epoch, updated = excluded.updated
+                WHERE excluded.epoch > tles.epoch""", rows)
+            self.conn.commit()
+            return self.conn.total_changes - before
+
+    def get(self, norad_ids=None):
+        """Stored TLEs as {norad: (name, line1, line2)}, optionally for a subset"""
+        if norad_ids is None:
+            with self.lock:
+                rows = self.conn.execute("SELECT norad, name, line1, line2 FROM tles").fetchall()
+        else:
+            ids = [int(n) for n in norad_ids]
+            if not ids:
+                return {}
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT norad, name, line1, line2 FROM tles WHERE norad IN ({','.join('?' * len(ids))})",
+                    ids).fetchall()
+        return {r[0]: (r[1], r[2], r[3]) for r in rows}
+
+    def last_updated(self):
+        """Time of the newest write (unix seconds), or None for an empty store"""
+        with self.lock:
+            return self.conn.execute("SELECT MAX(updated) FROM tles").fetchone()[0]
+
+    def claim_refresh(self, holder, lease_s):
+        """
+        Take or renew the refresh lease for lease_s seconds, so only one
+        process sharing the database fetches upstream. Fails while another
+        holder's lease has not expired.
+
+        Returns:
+            True when holder has the lease
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute("""INSERT INTO tle_lease VALUES (0, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET holder = excluded.holder, expires = excluded.expires
+                WHERE tle_lease.holder = excluded.holder OR tle_lease.expires < ?""",
+                (holder, now + lease_s, now))
+            self.conn.commit()
+            return self.conn.execute("SELECT holder FROM tle_lease").fetchone()[0] == holder
+
+    def epochs(self):
+        with self.lock:
+            return dict(self.conn.execute("SELECT norad, epoch FROM tles").fetchall())
+
+    def last_seen(self):
+        """{norad: latest of stored epoch and last fetch attempt} (unix seconds)"""
+        with self.lock:
+            rows = self.conn.execute("""SELECT norad, MAX(epoch) FROM (
+                SELECT norad, epoch FROM tles UNION ALL SELECT norad, checked FROM tle_checks)
+                GROUP BY norad""").fetchall()
+        return dict(rows)
+
+    def mark_checked(self, norad_ids, when=None):
+        """Record a fetch attempt for these IDs, whether or not anything new came back"""
+        when = time.time() if when is None else when
+        with self.lock:
+            self.conn.executemany("""INSERT INTO tle_checks VALUES (?, ?)
+                ON CONFLICT(norad) DO UPDATE SET checked = excluded.checked""",
+                [(int(n), when) for n in norad_ids])
+            self.conn.commit()
+
+    def stale_ids(self, norad_ids, max_age_h=12):
+        """IDs not seen (fetched, or carrying an epoch) within max_age_h"""
+        cutoff = time.time() - max_age_h * 3600
+        seen = self.last_seen()
+        return [int(n) for n in norad_ids if (seen.get(int(n)) or 0) < cutoff]
+
+    def refresh(self, norad_ids, fetch, max_age_h=12):
+        """
+        Pull only stale objects through fetch(ids) -> {norad: (name, l1, l2)}
+        and write back the ones with a newer epoch.
+
+        Returns:
+            (fetched, written) counts
+        """
+        stale = self.stale_ids(norad_ids, max_age_h)
+        if not stale:
+            return 0, 0
+        fetched = fetch(stale)
+        written = self.upsert(fetched)
+        self.mark_checked(stale)
+        return len(fetched), written
@@ -0,0 +1,163 @@
+"""World coastline/border wireframe, loaded once and pre-projected to XYZ at several levels of detail"""
+import argparse
+import json
+import logging
+import threading
+import numpy as np
+from config.settings import Config
+
+
+def load_world_rings(path=None):
+    """
+    Country outline rings, (lon, lat) arrays of shape (K, 2), from the
+    outline bundled with the app (Config.WORLD_OUTLINE_PATH). Regenerate
+    that file with export_world_outline(); nothing is fetched at runtime.
+    """
+    path = path or Config.WORLD_OUTLINE_PATH
+    try:
+        with np.load(path) as data:
+            lonlat, offsets = data['lonlat'].astype(np.float64), data['offsets']
+    except (OSError, KeyError, ValueError) as e:
+        logging.warning(f"Could not read world outline {path}: {e}")
+        return []
+    return np.split(lonlat, offsets[1:-1])
+
+
+def export_world_outline(geo, path=None):
+    """Store the outline rings of a GeoJSON FeatureCollection in the bundled format"""
+    path = path or Config.WORLD_OUTLINE_PATH
+    rings = geojson_rings(geo)
+    if not rings:
+        raise ValueError("GeoJSON has no polygon outlines")
+    offsets = np.cumsum([0] + [len(r) for r in rings], dtype=np.int32)
+    lonlat = np.concatenate(rings).astype(np.float32)
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, lonlat=lonlat, offsets=offsets)
+    return len(rings), len(lonlat)
+
+
+def geojson_rings(geo):
+    """(lon, lat) arrays of shape (K, 2) for every outline ring (outer rings only for MultiPolygons)"""
+    rings = []
+    for feat in geo.get('features', []):
+        geom = feat.get('geometry') or {}
+        if geom.get('type') == 'Polygon':
+            polys = geom['coordinates']
+        elif geom.get('type') == 'MultiPolygon':
+            polys = [p[0] for p in geom['coordinates']]
+        else:
+            continue
+        for ring in polys:
+            pts = np.asarray(ring, dtype=np.float64)
+            if pts.ndim == 2 and len(pts) >= 2:
+                rings.append(pts[:, :2])
+    return rings
+
+
+def douglas_peucker(points, tolerance):
+    """
+    Boolean keep-mask simplifying a polyline so no dropped point is further
+    than tolerance (in the points' units) from the simplified line.
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    if tolerance <= 0 or n < 3:
+        keep[:] = True
+        return keep
+
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        seg = points[start + 1:end] - a
+        ab = b - a
+        norm = np.hypot(*ab)
+        if norm == 0:
+            dist = np.hypot(seg[:, 0], seg[:, 1])
+        else:
+            dist = np.abs(ab[0] * seg[:, 1] - ab[1] * seg[:, 0]) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = start + 1 + i
+            keep[mid] = True
+            stack.append((start, mid))
+            stack.append((mid, end))
+    return keep
+
+
+def lat_lon_to_xyz(lat, lon, radius):
+    phi = np.radians(90 - lat)
+    theta = np.radians(lon)
+    return (radius * np.sin(phi) * np.cos(theta), radius * np.sin(phi) * np.sin(theta), radius * np.cos(phi))
+
+
+# Outlines and projected wireframes, computed on first use
+_rings = None
+_wireframes = {}
+_lock = threading.Lock()
+
+
+def _world_rings():
+    global _rings
+    if _rings is None:
+        _rings = tuple(load_world_rings())
+    return _rings
+
+
+def world_wireframe(radius, lod='medium'):
+    """
+    Wireframe trace arrays (x, y, z) for the globe: every simplified ring
+    back to back, separated by NaN gaps. Computed once per (radius, lod)
+    and returned as read-only arrays shared by all callers.
+
+    lod is a key of Config.WIREFRAME_LOD_TOLERANCES (degrees).
+    """
+    key = (radius, lod)
+    cached = _wireframes.get(key)
+    if cached is not None:
+        return cached
+
+    rings = _world_rings()
+    tolerance = Config.WIREFRAME_LOD_TOLERANCES[lod]
+    parts = []
+    gap = np.full((1, 2), np.nan)
+    for ring in rings:
+        parts.append(ring[douglas_peucker(ring, tolerance)])
+        parts.append(gap)
+    pts = np.concatenate(parts) if parts else np.empty((0, 2))
+
+    xyz = np.stack(lat_lon_to_xyz(pts[:, 1], pts[:, 0], radius))
+    xyz.flags.writeable = False
+    result = xyz[0], xyz[1], xyz[2]
+    with _lock:
+        _wireframes[key] = result
+    return result
+
+
+def main(argv=None):
+    """Command line: python -m utils.wireframe [--geojson FILE] [--out PATH] (regenerates the bundled outline)"""
+    parser = argparse.ArgumentParser(description="Regenerate the bundled world outline from GeoJSON")
+    parser.add_argument('--geojson', default=None, help="Local GeoJSON file (default: fetch Config.GEOJSON)")
+    parser.add_argument('--out', default=None, help="Output file (default: Config.WORLD_OUTLINE_PATH)")
+    args = parser.parse_args(argv)
+
+    if args.geojson:
+        with open(args.geojson, encoding='utf-8') as f:
+            geo = json.load(f)
+    else:
+        from data.api_client import API
+        geo = API.geo()
+    try:
+        rings, points = export_world_outline(geo, args.out)
+    except ValueError as e:
+        logging.error(e)
+        return 1
+    print(f"rings={rings} points={points}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())